@@ -0,0 +1,88 @@
+"""Alert engine benchmark: thousands of rules over hundreds of symbols, bar by bar.
+
+    python benchmarks/bench_alerts.py --tickers 500 --bars 400
+
+Builds a grid of MA-cross, sigma-move and volume-surge rules that all watch every symbol,
+warms the engine up on random-walk bars and times each further bar. The baseline
+re-evaluates a sample of the rules with pandas rolling windows over the recent history
+(the last row of each, i.e. what a per-bar recomputation costs) and is extrapolated.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.alerts import AlertEngine, MACross, VolumeSurge, ZScoreSpike  # noqa: E402
+
+
+def rule_grid():
+    rules = [MACross(fast, slow) for fast in range(5, 105, 5) for slow in range(50, 310, 10) if fast < slow]
+    thresholds = np.round(np.arange(3.0, 6.0, 0.1), 1)
+    rules += [ZScoreSpike(window, float(t)) for window in range(5, 105, 5) for t in thresholds]
+    rules += [VolumeSurge(window, float(t)) for window in range(5, 105, 5) for t in thresholds]
+    return rules
+
+
+def random_bars(tickers, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (bars, tickers)), axis=0))
+    volumes = rng.lognormal(13, 0.5, (bars, tickers))
+    return closes, volumes
+
+
+def pandas_rule(rule, closes, volumes):
+    # The rule's condition on the newest bar, recomputed from the history with pandas
+    if rule.kind == 'ma_cross':
+        gap = closes.rolling(rule.fast).mean() - closes.rolling(rule.slow).mean()
+        return np.sign(gap.iloc[-1]) * np.sign(gap.iloc[-2]) < 0
+    if rule.kind == 'zscore':
+        change = closes.pct_change()
+        window = change.iloc[-rule.window - 1:-1]
+        return ((change.iloc[-1] - window.mean()) / window.std()).abs() >= rule.threshold
+    average = volumes.iloc[-rule.window - 1:-1].mean()
+    return volumes.iloc[-1] >= rule.multiple * average
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=400, help='bars after the warm-up')
+    parser.add_argument('--sample', type=int, default=60, help='rules timed for the pandas baseline')
+    args = parser.parse_args()
+
+    rules = rule_grid()
+    tickers = [f'T{i:03d}' for i in range(args.tickers)]
+    warmup = 310
+    closes, volumes = random_bars(args.tickers, warmup + args.bars)
+    engine = AlertEngine(tickers, rules)
+    print(f'{len(rules):,} rules x {len(tickers)} symbols = {len(rules) * len(tickers):,} checks per bar')
+
+    for i in range(warmup):
+        engine.update(closes[i], volumes[i])
+    times, fired = [], 0
+    for i in range(warmup, warmup + args.bars):
+        t0 = time.perf_counter()
+        fired += len(engine.update(closes[i], volumes[i]))
+        times.append(time.perf_counter() - t0)
+    times = np.array(times) * 1000
+    print(f'alert engine     {np.median(times):8.2f} ms/bar (p99 {np.percentile(times, 99):.2f} ms), '
+          f'{fired / args.bars:.0f} alerts/bar')
+
+    history = pd.DataFrame(closes[:warmup + 1], columns=tickers)
+    history_volumes = pd.DataFrame(volumes[:warmup + 1], columns=tickers)
+    sample = rules[::max(len(rules) // args.sample, 1)]
+    t0 = time.perf_counter()
+    for rule in sample:
+        pandas_rule(rule, history, history_volumes)
+    per_bar = (time.perf_counter() - t0) / len(sample) * len(rules) * 1000
+    print(f'pandas per rule  {per_bar:8.2f} ms/bar (extrapolated from {len(sample)} rules, '
+          f'{per_bar / np.median(times):.0f}x slower)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Backtest benchmark: MA-crossover parameter sweeps over many tickers.
+
+    python benchmarks/bench_backtest.py --tickers 8 --years 12 --workers 4
+
+Sweeps every fast < slow pair of the window grid over each ticker's daily closes, first
+with a pandas rolling()/loop baseline on a sample of pairs (extrapolated), then with
+``backtest.sweep`` per ticker in this process and ``backtest.sweep_many`` on a process pool.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.backtest import sweep, sweep_many, window_pairs  # noqa: E402
+from market_dashboard.data_sources import SyntheticSource  # noqa: E402
+
+
+def pandas_pair(close, fast, slow):
+    # One crossover the straightforward way: rolling means, shifted signal, cumprod equity
+    position = (close.rolling(fast).mean() > close.rolling(slow).mean()).astype(float).shift(1).fillna(0)
+    returns = position * close.pct_change().fillna(0)
+    equity = (1 + returns).cumprod()
+    return equity.iloc[-1] - 1, returns.mean() / returns.std() * np.sqrt(252), (equity / equity.cummax() - 1).min()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=8)
+    parser.add_argument('--years', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--sample', type=int, default=50, help='pairs timed for the pandas baseline')
+    args = parser.parse_args()
+
+    fast_windows, slow_windows = range(5, 105, 2), range(20, 320, 5)
+    pairs = window_pairs(fast_windows, slow_windows)
+    source = SyntheticSource()
+    start = f'{2024 - args.years}-01-01'
+    closes = {f'T{i:03d}': source.history(f'T{i:03d}', start, '2024-01-01')['Close'] for i in range(args.tickers)}
+    bars = len(next(iter(closes.values())))
+    total = len(pairs) * args.tickers
+    print(f'{args.tickers} tickers x {bars} daily bars x {len(pairs)} (fast, slow) pairs = {total:,} backtests')
+
+    close = next(iter(closes.values()))
+    sample = pairs[::max(len(pairs) // args.sample, 1)][:args.sample]
+    t0 = time.perf_counter()
+    for fast, slow in sample:
+        pandas_pair(close, fast, slow)
+    t_pandas = (time.perf_counter() - t0) / len(sample) * total
+    print(f'pandas loop (extrapolated)  {t_pandas:8.2f} s')
+
+    t0 = time.perf_counter()
+    for c in closes.values():
+        sweep(c, fast_windows, slow_windows)
+    t_serial = time.perf_counter() - t0
+    print(f'sweep, one process          {t_serial:8.2f} s   {t_pandas / t_serial:6.1f}x')
+
+    t0 = time.perf_counter()
+    result = sweep_many(closes, fast_windows, slow_windows, max_workers=args.workers)
+    t_pool = time.perf_counter() - t0
+    print(f'sweep_many, process pool    {t_pool:8.2f} s   {t_pandas / t_pool:6.1f}x   '
+          f'({total / t_pool:,.0f} backtests/s)')
+
+    best = result.loc[result.groupby('ticker')['sharpe'].idxmax(), ['ticker', 'fast', 'slow', 'sharpe']]
+    print(best.head().to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Bar store benchmark: memory held by many concurrent sessions viewing the same tickers.
+
+    python benchmarks/bench_bar_store.py --sessions 100 --tickers AAPL MSFT BTC-USD ETH-USD
+
+Every simulated session fetches each ticker for one of the sidebar time frames (cycling
+through them) and keeps the frames, as the session memo does. Four ways of serving them
+are measured, each from a fresh cache over the same warm directory: private
+``OHLCVCache.history`` copies, read-only ``BarStore.history`` views, and the INR page
+(stocks converted with ``pipeline.convert_currency``, crypto as views) with the converted
+frames built per session or once per process. The process-wide total adds up the
+sessions' frames (traced with tracemalloc, including the shared converted frames), the
+caches' in-memory frames and the store's shared arrays.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.bar_store import BarStore  # noqa: E402
+from market_dashboard.data_sources import SyntheticSource, is_crypto  # noqa: E402
+from market_dashboard.fx import FXRates  # noqa: E402
+from market_dashboard.indicators import IndicatorEngine  # noqa: E402
+from market_dashboard.memo import MemoCache  # noqa: E402
+from market_dashboard.ohlcv_cache import OHLCVCache  # noqa: E402
+from market_dashboard.pipeline import TIME_FRAMES, convert_currency, frame_range  # noqa: E402
+
+MODES = ['private copies', 'bar store views', 'INR per session', 'INR shared']
+
+
+def open_sessions(fetch, sessions, tickers, frames):
+    # Returns the frames all sessions hold, the traced bytes they allocated and the seconds taken
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    held = [[fetch(t, frames[i % len(frames)]) for t in tickers] for i in range(sessions)]
+    seconds = time.perf_counter() - t0
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, allocated, seconds
+
+
+def fetcher(mode, cache, store, fx_rates):
+    # How a session gets one ticker's frame for a time frame in `mode`
+    if mode == 'private copies':
+        return lambda ticker, frame: cache.history(ticker, *frame_range(frame))
+    if mode == 'bar store views':
+        return lambda ticker, frame: store.history(ticker, *frame_range(frame))
+    shared = MemoCache(max_entries=1024, max_bytes=2**31)
+
+    def fetch(ticker, frame):
+        if is_crypto(ticker):
+            return store.history(ticker, *frame_range(frame))
+        convert = lambda: convert_currency(store, fx_rates, ticker, *frame_range(frame), 'INR')  # noqa: E731
+        return convert() if mode == 'INR per session' else shared.get_or_compute(('convert', ticker, frame), convert)
+    return fetch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--tickers', nargs='+', default=['AAPL', 'MSFT', 'BTC-USD', 'ETH-USD'])
+    parser.add_argument('--frames', nargs='+', default=TIME_FRAMES[3:], choices=TIME_FRAMES)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_bar_store_')
+    warm = OHLCVCache(SyntheticSource(), os.path.join(root, 'bars'), IndicatorEngine())
+    rows = sum(len(warm.history(t, *frame_range('max'))) for t in args.tickers)
+    FXRates(OHLCVCache(SyntheticSource(), os.path.join(root, 'fx'))).rates('USD', 'INR', *frame_range('max'))
+    print(f'{args.sessions} sessions x {len(args.tickers)} tickers ({rows:,} daily bars in all), '
+          f'time frames {", ".join(args.frames)}')
+
+    results = {}
+    for mode in MODES:
+        cache = OHLCVCache(SyntheticSource(), os.path.join(root, 'bars'), IndicatorEngine())
+        store = BarStore(cache)
+        fx_rates = FXRates(OHLCVCache(SyntheticSource(), os.path.join(root, 'fx')))
+        fetch = fetcher(mode, cache, store, fx_rates)
+        # Load every ticker and the rates first, so the sessions measure only the frames they hold
+        for ticker in args.tickers:
+            (cache.history if mode == 'private copies' else store.history)(ticker, *frame_range('max'))
+        fx_rates.rates('USD', 'INR', *frame_range('max'))
+        held, allocated, seconds = open_sessions(fetch, args.sessions, args.tickers, args.frames)
+        caches = cache.nbytes() + fx_rates.cache.nbytes()
+        total = results[mode] = allocated + caches + store.nbytes()
+        print(f'{mode:16s} frames {allocated / 2**20:7.2f} MiB ({allocated / args.sessions / 2**10:6.1f} KiB/session)'
+              f'   caches {caches / 2**20:5.2f} MiB   store {store.nbytes() / 2**20:5.2f} MiB'
+              f'   process {total / 2**20:7.2f} MiB   {seconds / args.sessions / len(args.tickers) * 1e6:7.1f} us/fetch')
+        del held
+    print(f'process-wide bar memory: USD {results["private copies"] / results["bar store views"]:.0f}x smaller with '
+          f'the store, INR {results["INR per session"] / results["INR shared"]:.0f}x smaller with shared conversions')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Wall-clock comparison of a serial Ticker.history loop against batch_fetch.
+
+Uses SyntheticSource behind a fixed per-request delay to stand in for Yahoo's
+round-trip latency, so it runs offline:
+
+    python benchmarks/bench_batch_fetch.py --tickers 200 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.batch_fetch import fetch_many  # noqa: E402
+from market_dashboard.data_sources import SyntheticSource  # noqa: E402
+
+
+class SlowSource(SyntheticSource):
+    # Each request pays `latency` seconds; a bulk request also pays a little per ticker
+    def __init__(self, latency, per_ticker=0.002, bulk_size=1):
+        super().__init__()
+        self.latency = latency
+        self.per_ticker = per_ticker
+        self.bulk_size = bulk_size
+
+    def history(self, ticker, start, end, interval='1d'):
+        time.sleep(self.latency)
+        return super().history(ticker, start, end, interval)
+
+    def history_many(self, tickers, start, end, interval='1d'):
+        time.sleep(self.latency + self.per_ticker * len(tickers))
+        return {t: SyntheticSource.history(self, t, start, end, interval) for t in tickers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--start', default='2015-01-01')
+    parser.add_argument('--end', default='2025-01-01')
+    args = parser.parse_args()
+
+    tickers = [f'SYM{i:03d}' for i in range(args.tickers)]
+
+    source = SlowSource(args.latency)
+    t0 = time.perf_counter()
+    for ticker in tickers:
+        source.history(ticker, args.start, args.end)
+    serial = time.perf_counter() - t0
+    print(f'serial loop          {serial:8.2f}s')
+
+    t0 = time.perf_counter()
+    wide = fetch_many(source, tickers, args.start, args.end, max_workers=args.workers)
+    threaded = time.perf_counter() - t0
+    print(f'thread pool          {threaded:8.2f}s  speedup {serial / threaded:5.1f}x')
+
+    bulk_source = SlowSource(args.latency, bulk_size=50)
+    t0 = time.perf_counter()
+    wide = fetch_many(bulk_source, tickers, args.start, args.end, max_workers=args.workers)
+    bulk = time.perf_counter() - t0
+    print(f'bulk + thread pool   {bulk:8.2f}s  speedup {serial / bulk:5.1f}x')
+    print(f'result frame: {wide.shape[0]} rows x {wide.shape[1]} columns, failed: {len(wide.attrs["failed"])}')
+
+
+if __name__ == '__main__':
+    main()
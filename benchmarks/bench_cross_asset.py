@@ -0,0 +1,80 @@
+"""Cross-asset benchmark: rolling correlations of a few hundred symbols.
+
+    python benchmarks/bench_cross_asset.py --symbols 300 --days 1000 --window 60
+
+Builds an aligned daily returns matrix of --symbols synthetic stocks and cryptos and times
+(1) every symbol's rolling correlation and beta against a benchmark, cumsum-based vs
+pandas ``rolling().corr()``, (2) the full correlation matrix of the last window, four
+matrix products vs ``DataFrame.corr()``, and (3) keeping that matrix current as bars
+arrive one day at a time with ``RollingMoments`` vs recomputing it with pandas.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.batch_fetch import to_wide  # noqa: E402
+from market_dashboard.cross_asset import (RollingMoments, aligned_returns, pairwise_moments,  # noqa: E402
+                                          rolling_vs_benchmark)
+from market_dashboard.data_sources import SyntheticSource  # noqa: E402
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--days', type=int, default=1000)
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--updates', type=int, default=20, help='new days fed one at a time in (3)')
+    args = parser.parse_args()
+
+    source = SyntheticSource()
+    end = pd.Timestamp('2024-01-01')
+    start = (end - pd.Timedelta(days=args.days)).strftime('%Y-%m-%d')
+    tickers = [f'C{i:03d}-USD' if i % 5 == 0 else f'T{i:03d}' for i in range(args.symbols)]
+    frames = {t: source.history(t, start, end.strftime('%Y-%m-%d')) for t in tickers}
+    returns = aligned_returns(to_wide(frames).xs('Close', axis=1, level='Field'))
+    print(f'{returns.shape[1]} symbols x {len(returns)} aligned daily returns, window {args.window}')
+
+    ours, rolling = timed(lambda: rolling_vs_benchmark(returns, tickers[1], args.window))
+    theirs, expected = timed(lambda: returns.rolling(args.window).corr(returns[tickers[1]]))
+    assert np.allclose(rolling['corr'], expected, equal_nan=True)
+    print(f'(1) rolling corr+beta vs benchmark  {ours * 1000:8.1f} ms   pandas {theirs * 1000:8.1f} ms '
+          f'({theirs / ours:.0f}x)')
+
+    last = returns.tail(args.window)
+    ours, (_, corr) = timed(lambda: pairwise_moments(last, args.window))
+    theirs, expected = timed(lambda: last.corr(min_periods=args.window))
+    assert np.allclose(corr, expected, equal_nan=True)
+    print(f'(2) {args.symbols}x{args.symbols} correlation matrix   {ours * 1000:8.1f} ms   pandas '
+          f'{theirs * 1000:8.1f} ms ({theirs / ours:.0f}x)')
+
+    history, new = returns.iloc[:-args.updates], returns.iloc[-args.updates:]
+    moments = RollingMoments(returns.columns, args.window)
+    moments.sync(history)
+    t0 = time.perf_counter()
+    for i in range(1, len(new) + 1):
+        moments.sync(new.iloc[:i])
+        moments.corr()
+    ours = (time.perf_counter() - t0) / len(new)
+    t0 = time.perf_counter()
+    for i in range(1, len(new) + 1):
+        returns.iloc[:len(history) + i].tail(args.window).corr(min_periods=args.window)
+    theirs = (time.perf_counter() - t0) / len(new)
+    assert np.allclose(moments.corr(), returns.tail(args.window).corr(min_periods=args.window), equal_nan=True)
+    print(f'(3) refresh on a new bar            {ours * 1000:8.1f} ms   pandas {theirs * 1000:8.1f} ms '
+          f'({theirs / ours:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
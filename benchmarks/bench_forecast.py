@@ -0,0 +1,64 @@
+"""Forecasting benchmark: batch training throughput and per-ticker inference latency.
+
+    python benchmarks/bench_forecast.py --tickers 500 --bars 2500
+
+Training fits every ticker of a synthetic watchlist once with one ``fit_many`` call and
+once with a per-ticker ``ARForecaster.fit`` loop. Inference loads each stored artifact
+(cold from disk, then from the store's memory) and forecasts the default horizon.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.data_sources import SyntheticSource  # noqa: E402
+from market_dashboard.forecast import FORECAST_HORIZON, ARForecaster, ModelStore, fit_many  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--lags', type=int, default=10)
+    parser.add_argument('--window', type=int, default=1000)
+    args = parser.parse_args()
+
+    source = SyntheticSource()
+    closes = {f'T{i:04d}': source.generate(f'T{i:04d}', args.bars, '1d', end='2024-01-01')['Close']
+              for i in range(args.tickers)}
+
+    t0 = time.perf_counter()
+    models = fit_many(closes, args.lags, window=args.window)
+    t_batch = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    looped = {t: ARForecaster(args.lags, window=args.window).fit(c) for t, c in closes.items()}
+    t_loop = time.perf_counter() - t0
+    assert all(np.allclose(models[t].coef, looped[t].coef) for t in closes)
+    print(f'train {args.tickers} tickers x {args.bars} bars: fit_many {t_batch * 1000:8.1f} ms '
+          f'({args.tickers / t_batch:8.0f} tickers/s)   per-ticker loop {t_loop * 1000:8.1f} ms '
+          f'({args.tickers / t_loop:8.0f} tickers/s)   speedup {t_loop / t_batch:4.1f}x')
+
+    store = ModelStore(tempfile.mkdtemp(prefix='bench_forecast_'))
+    for ticker, model in models.items():
+        store.save(ticker, model)
+
+    def serve(ticker):
+        t0 = time.perf_counter()
+        store.load(ticker).forecast(closes[ticker], FORECAST_HORIZON)
+        return time.perf_counter() - t0
+
+    cold = [serve(t) for t in closes]
+    warm = [serve(t) for t in closes]
+    print(f'serve {FORECAST_HORIZON}-bar forecast per ticker: cold load {statistics.median(cold) * 1e6:7.1f} us   '
+          f'warm {statistics.median(warm) * 1e6:7.1f} us   (median over {args.tickers})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Cold-start benchmark: import time of the dashboard entry point in fresh interpreters.
+
+    python benchmarks/bench_import.py --repeat 10
+
+Compares the eager header the old app2/app3/app4 scripts started with against importing
+the package and its Streamlit entry point, and lists which heavy modules each one loads.
+The bare entry point never renders a page: every page reads bars through the bar cache,
+which needs pandas. That case ('+ bar cache') is the end-to-end start-up cost, and the
+summary line compares it with the old header.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ['yfinance', 'pandas', 'numpy', 'pyarrow', 'plotly.graph_objects', 'plotly.subplots']
+
+CASES = {
+    'old app header': 'import yfinance, streamlit, plotly.graph_objects, pandas',
+    'import market_dashboard.app': 'import market_dashboard.app',
+    # What a rerun served from the bar cache needs on top: pandas, but still no yfinance
+    '+ bar cache': 'import market_dashboard.app; market_dashboard.pipeline.make_bar_cache()',
+}
+# The case every rendered page pays for
+PAGE_CASE = '+ bar cache'
+
+# Runs in the child: time the import, then report it with the heavy modules it loaded
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_case(code, repeat):
+    # Wall time of the import alone, in a new interpreter each time so nothing is cached in-process
+    times, loaded = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(code=code, heavy=HEAVY)], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result['seconds'])
+        loaded = result['loaded']
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = None
+    results = {}
+    for name, code in CASES.items():
+        seconds, loaded = run_case(code, args.repeat)
+        baseline = baseline or seconds
+        results[name] = seconds
+        print(f'{name:<30} {seconds * 1000:8.1f} ms  ({baseline / seconds:4.1f}x)   loads: {", ".join(loaded) or "-"}')
+    page = results[PAGE_CASE]
+    print(f'end to end (a page needs pandas): {page * 1000:.0f} ms vs {baseline * 1000:.0f} ms for the old header, '
+          f'{(1 - page / baseline) * 100:.0f}% less')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Intraday storage benchmark: day-partitioned store vs one cache file per ticker.
+
+    python benchmarks/bench_intraday.py --interval 1m --days 180 --query-days 5 --tickers 4
+
+Fills both stores with --days of synthetic intraday bars (more than Yahoo serves at once;
+the partitioned store keeps what it has collected), then times a query for the last
+--query-days days (a "5d @ 1m" view) as a fresh process would run it: the single-file
+cache has to load the whole file, the partitioned store reads the index and the
+partitions of those days. Also scans the whole range page by page.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.data_sources import SyntheticSource  # noqa: E402
+from market_dashboard.intraday import INTRADAY_LIMITS, IntradayStore  # noqa: E402
+from market_dashboard.ohlcv_cache import OHLCVCache  # noqa: E402
+
+
+def cold_query(make_store, ticker, start, end, interval, repeat=5):
+    # Best of `repeat` queries, each on a new store object with nothing in memory
+    times = []
+    for _ in range(repeat):
+        store = make_store()
+        t0 = time.perf_counter()
+        df = store.history(ticker, start, end, interval)
+        times.append(time.perf_counter() - t0)
+    return min(times), len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--query-days', type=int, default=5)
+    parser.add_argument('--tickers', type=int, default=4)
+    args = parser.parse_args()
+
+    today = pd.Timestamp.today().normalize()
+    start, query_start, end = [(today + pd.Timedelta(days=offset)).strftime('%Y-%m-%d')
+                               for offset in (1 - args.days, 1 - args.query_days, 1)]
+    tickers = [f'T{i:03d}' if i % 2 else f'C{i:03d}-USD' for i in range(args.tickers)]
+
+    # Pretend the upstream serves --days of history, as if the store had collected it over months
+    INTRADAY_LIMITS[args.interval] = (args.days, INTRADAY_LIMITS[args.interval][1])
+    source = SyntheticSource()
+    root = tempfile.mkdtemp(prefix='bench_intraday_')
+    stores = {
+        'day partitions': lambda: IntradayStore(source, os.path.join(root, 'partitioned')),
+        'one file/ticker': lambda: OHLCVCache(source, os.path.join(root, 'single')),
+    }
+    for make_store in stores.values():
+        store = make_store()
+        for ticker in tickers:
+            store.history(ticker, start, end, args.interval)
+    print(f'{len(tickers)} tickers x {args.days} days of {args.interval} bars; '
+          f'query: last {args.query_days} days from a cold process')
+
+    for name, make_store in stores.items():
+        results = [cold_query(make_store, t, query_start, end, args.interval) for t in tickers]
+        print(f'{name:16s} {statistics.median(t for t, _ in results) * 1000:8.2f} ms/query   '
+              f'({sum(n for _, n in results):,} bars returned)')
+
+    partitioned = stores['day partitions']()
+    t0 = time.perf_counter()
+    sizes = [len(page) for page in partitioned.pages(tickers[0], start, end, args.interval)]
+    print(f'paged scan of {tickers[0]}: {len(sizes)} pages in {time.perf_counter() - t0:.3f} s, '
+          f'at most {max(sizes):,} bars in memory')
+
+
+if __name__ == '__main__':
+    main()
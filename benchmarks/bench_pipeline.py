@@ -0,0 +1,152 @@
+"""Headless benchmark of a dashboard rerun: fetch -> stats -> indicators -> figure -> JSON.
+
+    python benchmarks/bench_pipeline.py --bars 1000 100000 1000000 10000000 --tickers 1 10 \
+        --output pipeline.json
+
+Runs the same stages as the dashboard without a Streamlit server, against an in-memory
+stub source and a bar cache in a temporary directory. For every (bars, tickers) case it
+records each stage's wall time (best of --repeat) and tracemalloc peak, and writes them
+to --output as JSON so runs of different versions can be diffed.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.charts import price_volume_figure  # noqa: E402
+from market_dashboard.data_sources import DataSource, SyntheticSource, slice_range  # noqa: E402
+from market_dashboard.indicators import IndicatorEngine  # noqa: E402
+from market_dashboard.ohlcv_cache import OHLCVCache  # noqa: E402
+from market_dashboard.stats import summary_stats  # noqa: E402
+
+INTERVAL = '1m'
+END = pd.Timestamp('2024-01-01')
+STAGES = ['fetch_cold', 'fetch_warm', 'stats', 'indicators', 'figure', 'serialize']
+
+
+class StubSource(DataSource):
+    # Pre-generated 1-minute bars served from memory, so fetch time is the cache's own cost
+    name = 'stub'
+    bulk_size = 50
+
+    def __init__(self, tickers, n_bars):
+        synthetic = SyntheticSource()
+        self.frames = {t: synthetic.generate(t, n_bars, INTERVAL, end=END) for t in tickers}
+
+    def history(self, ticker, start, end, interval='1d'):
+        return slice_range(self.frames[ticker.upper()], start, end)
+
+
+def run_stages(source, tickers, start, end, measure):
+    """Run one rerun's stages for every ticker; ``measure(stage, fn)`` wraps each stage."""
+    root = tempfile.mkdtemp(prefix='bench_pipeline_')
+    try:
+        cache = OHLCVCache(source, root=root, indicators=IndicatorEngine())
+        if len(tickers) == 1:
+            fetch = lambda: {tickers[0]: cache.history(tickers[0], start, end, INTERVAL)}  # noqa: E731
+        else:
+            fetch = lambda: cache.history_many(tickers, start, end, INTERVAL)  # noqa: E731
+        measure('fetch_cold', fetch)
+        frames = measure('fetch_warm', fetch)
+        measure('stats', lambda: [summary_stats(df['Close']) for df in frames.values()])
+        measure('indicators', lambda: [IndicatorEngine().compute(df['Close']) for df in frames.values()])
+        figures = measure('figure', lambda: [price_volume_figure(df, f'{t} benchmark') for t, df in frames.items()])
+        measure('serialize', lambda: [fig.to_json() for fig in figures])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def bench_case(n_bars, n_tickers, repeat):
+    tickers = [f'T{i:03d}' for i in range(n_tickers)]
+    source = StubSource(tickers, n_bars)
+    first = next(iter(source.frames.values())).index[0]
+    start, end = first.strftime('%Y-%m-%d'), (END + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+    seconds = {stage: [] for stage in STAGES}
+
+    def timed(stage, fn):
+        t0 = time.perf_counter()
+        result = fn()
+        seconds[stage].append(time.perf_counter() - t0)
+        return result
+
+    for _ in range(repeat):
+        run_stages(source, tickers, start, end, timed)
+
+    # Separate pass for memory: tracemalloc slows allocation-heavy code down
+    peaks = {}
+
+    def traced(stage, fn):
+        tracemalloc.start()
+        try:
+            return fn()
+        finally:
+            peaks[stage] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    run_stages(source, tickers, start, end, traced)
+
+    stages = {stage: {'seconds': min(seconds[stage]), 'peak_bytes': peaks[stage]} for stage in STAGES}
+    return {
+        'bars': n_bars,
+        'tickers': n_tickers,
+        'stages': stages,
+        'total_seconds': sum(s['seconds'] for s in stages.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bars', type=int, nargs='+', default=[1_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--max-total-bars', type=int, default=20_000_000,
+                        help='skip cases whose bars x tickers exceeds this (memory)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='pipeline_bench.json')
+    args = parser.parse_args()
+
+    results = []
+    for n_bars in args.bars:
+        for n_tickers in args.tickers:
+            if n_bars * n_tickers > args.max_total_bars:
+                print(f'{n_bars:>12,} bars x {n_tickers:>3} tickers: skipped (--max-total-bars)')
+                continue
+            case = bench_case(n_bars, n_tickers, args.repeat)
+            results.append(case)
+            cells = '  '.join(f"{stage} {s['seconds'] * 1000:9.1f} ms / {s['peak_bytes'] / 2**20:7.1f} MB"
+                              for stage, s in case['stages'].items())
+            print(f'{n_bars:>12,} bars x {n_tickers:>3} tickers: {cells}')
+
+    report = {
+        'benchmark': 'pipeline',
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'interval': INTERVAL,
+        'repeat': args.repeat,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plotly': plotly.__version__,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Resampling benchmark: vectorized OHLCV aggregation vs pandas resample, and memoized reuse.
+
+    python benchmarks/bench_resample.py --rows 2000000 --interval 5m
+
+Aggregates --rows synthetic 1m bars (a stock session per day) into --interval bars with
+``resample_ohlcv`` and with ``DataFrame.resample(...).agg``, checks they agree, then times
+a ``Resampler`` serving weekly bars twice: the first call aggregates, the second is a memo hit.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.bar_store import BarStore  # noqa: E402
+from market_dashboard.data_sources import INTRADAY_STEPS, SyntheticSource  # noqa: E402
+from market_dashboard.intraday import IntradayStore  # noqa: E402
+from market_dashboard.ohlcv_cache import OHLCVCache  # noqa: E402
+from market_dashboard.pipeline import frame_range  # noqa: E402
+from market_dashboard.resample import Resampler, resample_ohlcv  # noqa: E402
+
+
+def minute_bars(rows, seed=0):
+    # 390 one-minute bars per weekday session starting 9:30 New York time
+    days = pd.bdate_range('2000-01-03', periods=-(-rows // 390), tz='America/New_York') + pd.Timedelta(hours=9.5)
+    index = (days.repeat(390) + pd.to_timedelta(np.tile(np.arange(390), len(days)), unit='min'))[:rows]
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, rows)))
+    spread = np.abs(rng.normal(0, 5e-4, rows)) * close
+    return pd.DataFrame({'Open': np.roll(close, 1), 'High': close + spread, 'Low': close - spread,
+                         'Close': close, 'Volume': rng.integers(1, 10_000, rows).astype(np.float64)}, index=index)
+
+
+def with_pandas(df, interval):
+    # Buckets anchored at the session open, as resample_ohlcv labels intraday bars
+    rule = pd.Timedelta(INTRADAY_STEPS[interval])
+    return (df.resample(rule, origin='start_day', offset='9h30min')
+              .agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+              .dropna(subset=['Close']))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--interval', default='5m', choices=['2m', '5m', '15m', '30m', '1h'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = minute_bars(args.rows)
+    ours, out = best_of(lambda: resample_ohlcv(df, args.interval), args.repeat)
+    theirs, expected = best_of(lambda: with_pandas(df, args.interval), args.repeat)
+    pd.testing.assert_frame_equal(out, expected, check_freq=False, check_index_type=False)
+    print(f'{args.rows:,} 1m bars -> {len(out):,} {args.interval} bars')
+    print(f'resample_ohlcv   {ours * 1000:8.1f} ms')
+    print(f'pandas resample  {theirs * 1000:8.1f} ms   ({theirs / ours:.1f}x)')
+
+    cache = OHLCVCache(SyntheticSource(), tempfile.mkdtemp(prefix='bench_resample_'))
+    resampler = Resampler(BarStore(cache), IntradayStore(cache.source, tempfile.mkdtemp(prefix='bench_resample_')))
+    start, end = frame_range('max')
+    resampler.daily.history('AAPL', start, end)
+    first, weekly = best_of(lambda: resampler.history('AAPL', start, end, '1wk'), 1)
+    again, _ = best_of(lambda: resampler.history('AAPL', start, end, '1wk'), args.repeat)
+    print(f'max @ 1wk from cached daily bars: {len(weekly):,} bars in {first * 1000:.2f} ms, '
+          f'{again * 1e6:.0f} us when memoized')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Micro-benchmark: the apps' eight pandas reductions against stats.summary_stats.
+
+    python benchmarks/bench_stats.py --rows 10000000 --tickers 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard.stats import summary_stats, summary_stats_matrix  # noqa: E402
+
+
+def pandas_stats(close):
+    # The block app2/app3/app4 used to run on every rerun
+    return {
+        'max': close.max(),
+        'min': close.min(),
+        'mean': close.mean(),
+        'median': close.median(),
+        'p25': close.quantile(0.25),
+        'p75': close.quantile(0.75),
+        'std': close.std(),
+        'pct_change': close.pct_change().mean() * 100,
+    }
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--matrix-rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, args.rows))))
+
+    expected = pandas_stats(close)
+    got = summary_stats(close)
+    assert all(np.isclose(got[k], expected[k]) for k in expected), (got, expected)
+
+    t_pandas = best_of(lambda: pandas_stats(close), args.repeat)
+    t_numpy = best_of(lambda: summary_stats(close), args.repeat)
+    print(f'{args.rows:,} rows: pandas {t_pandas * 1000:8.1f} ms   summary_stats {t_numpy * 1000:8.1f} ms'
+          f'   speedup {t_pandas / t_numpy:4.1f}x')
+
+    # Watchlist: every ticker column at once vs a per-column pandas loop
+    wide = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (args.matrix_rows, args.tickers)), axis=0)))
+    t_loop = best_of(lambda: [pandas_stats(wide[c]) for c in wide.columns], args.repeat)
+    t_matrix = best_of(lambda: summary_stats_matrix(wide.to_numpy()), args.repeat)
+    print(f'{args.matrix_rows:,} x {args.tickers} matrix: pandas loop {t_loop * 1000:8.1f} ms'
+          f'   summary_stats_matrix {t_matrix * 1000:8.1f} ms   speedup {t_loop / t_matrix:4.1f}x')
+
+
+if __name__ == '__main__':
+    main()
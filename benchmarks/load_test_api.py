@@ -0,0 +1,107 @@
+"""API load test: many concurrent clients against the headless HTTP API, offline.
+
+    python benchmarks/load_test_api.py --requests 2000 --concurrency 64 --tickers 20
+
+Starts ``python -m market_dashboard.api`` on the synthetic data source (or targets --url),
+then sends a mix of stats, JSON series and Arrow series requests over --tickers symbols
+and a few time frames through one pooled client session, at most --concurrency in
+flight. Reports throughput, latency percentiles and the size of JSON vs Arrow bodies.
+The first pass runs against cold caches; the second is served from the shared memo.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+
+import aiohttp
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRAMES = ['1mo', '1y', 'max']
+
+
+def request_mix(tickers, n):
+    # Cycles over (endpoint, ticker, frame) so every pass asks for the same set of responses
+    paths = []
+    for ticker, frame in itertools.product(tickers, FRAMES):
+        paths += [f'/v1/stats/{ticker}?frame={frame}',
+                  f'/v1/series/{ticker}?frame={frame}',
+                  f'/v1/series/{ticker}?frame={frame}&format=arrow']
+    return [paths[i % len(paths)] for i in range(n)]
+
+
+async def run_pass(url, paths, concurrency):
+    latencies, statuses, sizes = [], {}, {'json': [], 'arrow': []}
+    queue = iter(paths)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def client():
+            for path in queue:
+                t0 = time.perf_counter()
+                async with session.get(url + path) as response:
+                    body = await response.read()
+                latencies.append(time.perf_counter() - t0)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+                if '/series/' in path:
+                    sizes['arrow' if 'format=arrow' in path else 'json'].append(len(body))
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        seconds = time.perf_counter() - t0
+    return seconds, np.array(latencies), statuses, sizes
+
+
+async def wait_ready(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url + '/health') as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                if time.monotonic() > deadline:
+                    raise
+            await asyncio.sleep(0.2)
+
+
+async def run(args):
+    paths = request_mix([f'T{i:03d}' if i % 4 else f'C{i:03d}-USD' for i in range(args.tickers)], args.requests)
+    await wait_ready(args.url)
+    print(f'{args.requests} requests, {args.concurrency} concurrent, {args.tickers} tickers x {len(FRAMES)} frames')
+    for name in ('cold', 'warm'):
+        seconds, latencies, statuses, sizes = await run_pass(args.url, paths, args.concurrency)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f'{name}: {len(latencies) / seconds:7.0f} req/s   p50 {p50:6.1f} ms   p95 {p95:6.1f} ms   '
+              f'p99 {p99:6.1f} ms   status {statuses}')
+    print(f'series body: JSON {np.mean(sizes["json"]) / 1024:.1f} KiB, Arrow {np.mean(sizes["arrow"]) / 1024:.1f} KiB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--url', help='an API server that is already running (default: start one)')
+    parser.add_argument('--port', type=int, default=8787)
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        args.url = f'http://127.0.0.1:{args.port}'
+        env = dict(os.environ, DATA_SOURCE='synthetic', PERF_LOG_LEVEL='WARNING')
+        server = subprocess.Popen([sys.executable, '-m', 'market_dashboard.api', '--port', str(args.port)],
+                                  cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+# Stock and crypto trend dashboard. The public names below are imported from their
+# submodules on first access, so `import market_dashboard` does not pull in pandas,
+# plotly or yfinance until something actually needs them.
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'OHLCVCache': 'ohlcv_cache',
+    'DataSource': 'data_sources',
+    'YFinanceSource': 'data_sources',
+    'SyntheticSource': 'data_sources',
+    'ReplaySource': 'data_sources',
+    'get_source': 'data_sources',
+    'fetch_many': 'batch_fetch',
+    'IndicatorEngine': 'indicators',
+    'FXRates': 'fx',
+    'MemoCache': 'memo',
+    'RunStats': 'instrumentation',
+    'summary_stats': 'stats',
+    'summary_table': 'stats',
+    'price_volume_figure': 'charts',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,23 @@
+import argparse
+import os
+import subprocess
+import sys
+
+
+def main(argv=None):
+    # `python -m market_dashboard [--mode stock|crypto|combined] [streamlit run options]`, or
+    # `--mode api [--port N]` for the headless HTTP API (see api.py)
+    parser = argparse.ArgumentParser(prog='python -m market_dashboard', description='Run the dashboard.')
+    parser.add_argument('--mode', choices=['stock', 'crypto', 'combined', 'api'], default='combined')
+    args, streamlit_args = parser.parse_known_args(argv)
+    if args.mode == 'api':
+        from .api import main as serve_api
+
+        return serve_api(streamlit_args)
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    cmd = [sys.executable, '-m', 'streamlit', 'run', app, *streamlit_args, '--', '--mode', args.mode]
+    return subprocess.call(cmd)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""Alert rules evaluated on every new bar of a watchlist, whether or not anyone is watching.
+
+    python -m market_dashboard.alerts AAPL MSFT BTC-USD --jsonl alerts.jsonl
+    python -m market_dashboard.alerts --rules rules.json --since 2024-01-01 --once
+
+Rules are checked for all symbols at once: each rule kind keeps one state array per
+symbol and evaluates as a (rules x symbols) array operation, so a bar costs the same
+handful of NumPy calls whether there are ten rules or thousands.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from .data_sources import is_crypto
+from .instrumentation import configure_logging, log_event
+from .pipeline import parse_tickers
+from .prefetch import MARKET_TZ, REFRESH_EVERY, is_trading
+
+# Symbols scanned when none are given (override with ALERT_TICKERS)
+DEFAULT_ALERT_TICKERS = parse_tickers(os.environ.get('ALERT_TICKERS', 'AAPL, MSFT, GOOGL, AMZN, NVDA, BTC-USD, ETH-USD'))
+
+
+class Rule:
+    """A condition checked on each new bar of the symbols it watches (every symbol by default)."""
+
+    kind = None
+
+    def __init__(self, tickers=None, name=None):
+        self.tickers = None if tickers is None else [t.upper() for t in tickers]
+        self.name = name or self.describe()
+
+    def describe(self):
+        return self.kind
+
+
+class MACross(Rule):
+    # The fast moving average crossing the slow one (golden cross up, death cross down)
+    kind = 'ma_cross'
+
+    def __init__(self, fast=50, slow=200, tickers=None, name=None):
+        self.fast, self.slow = fast, slow
+        super().__init__(tickers, name)
+
+    def describe(self):
+        return f'MA{self.fast}/MA{self.slow} cross'
+
+
+class ZScoreSpike(Rule):
+    # A bar's percent change at least `threshold` rolling standard deviations from the mean
+    # of the previous `window` changes
+    kind = 'zscore'
+
+    def __init__(self, window=20, threshold=3.0, tickers=None, name=None):
+        self.window, self.threshold = window, threshold
+        super().__init__(tickers, name)
+
+    def describe(self):
+        return f'{self.threshold:g} sigma move ({self.window} bars)'
+
+
+class VolumeSurge(Rule):
+    # A bar's volume at least `multiple` times the average of the previous `window` bars
+    kind = 'volume_surge'
+
+    def __init__(self, window=20, multiple=3.0, tickers=None, name=None):
+        self.window, self.multiple = window, multiple
+        super().__init__(tickers, name)
+
+    def describe(self):
+        return f'volume {self.multiple:g}x {self.window}-bar average'
+
+
+RULE_KINDS = {cls.kind: cls for cls in (MACross, ZScoreSpike, VolumeSurge)}
+
+DEFAULT_RULES = [
+    {'kind': 'ma_cross', 'fast': 50, 'slow': 200},
+    {'kind': 'zscore', 'window': 20, 'threshold': 3.0},
+    {'kind': 'volume_surge', 'window': 20, 'multiple': 3.0},
+]
+
+
+def make_rules(specs):
+    # Rules from dicts like {"kind": "zscore", "window": 20, "threshold": 3, "tickers": ["AAPL"]}
+    rules = []
+    for spec in specs:
+        spec = dict(spec)
+        kind = spec.pop('kind')
+        if kind not in RULE_KINDS:
+            raise ValueError(f'Unknown rule kind {kind!r}; expected one of {list(RULE_KINDS)}')
+        rules.append(RULE_KINDS[kind](**spec))
+    return rules
+
+
+class RollingColumns:
+    """Rolling sums of several windows over one value per symbol, O(1) per bar.
+
+    A ring buffer keeps the last ``size`` values of every symbol; symbols advance on
+    their own (a stock has no weekend bars, crypto does). Sums are rebuilt from the
+    buffer once per ``size`` pushes to stop float drift, as ``RollingWindow`` does.
+    """
+
+    def __init__(self, n, windows):
+        self.windows = sorted(set(windows))
+        self.size = max(self.windows, default=1)
+        self.ring = np.zeros((self.size, n))
+        self.count = np.zeros(n, dtype=np.int64)
+        self.sums = {w: np.zeros(n) for w in self.windows}
+        self.squares = {w: np.zeros(n) for w in self.windows}
+        self.since_resum = 0
+
+    def push(self, cols, values):
+        count = self.count[cols]
+        for w in self.windows:
+            # The value leaving a full window, zero while the window is still filling
+            leaving = np.where(count >= w, self.ring[(count - w) % self.size, cols], 0.0)
+            self.sums[w][cols] += values - leaving
+            self.squares[w][cols] += values * values - leaving * leaving
+        self.ring[count % self.size, cols] = values
+        self.count[cols] += 1
+        self.since_resum += 1
+        if self.since_resum >= self.size:
+            self._resum()
+
+    def _resum(self):
+        lags = np.arange(self.size)
+        rows = (self.count[None, :] - 1 - lags[:, None]) % self.size
+        values = np.take_along_axis(self.ring, rows, axis=0)
+        values = np.where(lags[:, None] < self.count[None, :], values, 0.0)
+        for w in self.windows:
+            self.sums[w] = values[:w].sum(axis=0)
+            self.squares[w] = (values[:w] ** 2).sum(axis=0)
+        self.since_resum = 0
+
+    def mean(self, w):
+        with np.errstate(invalid='ignore'):
+            return np.where(self.count >= w, self.sums[w] / w, np.nan)
+
+    def std(self, w):
+        # Sample standard deviation, as Series.rolling(w).std()
+        with np.errstate(invalid='ignore'):
+            var = (self.squares[w] - self.sums[w] ** 2 / w) / (w - 1)
+        return np.where(self.count >= max(w, 2), np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+
+class AlertEngine:
+    """Evaluates many rules over many symbols, one bar at a time.
+
+    ``update`` takes one close (and volume) per symbol, NaN for symbols without a new
+    bar, and returns the alerts that bar fired. Per-symbol state is a few rolling sums,
+    so nothing is recomputed over history; each rule kind is one array expression over
+    (rules x symbols).
+    """
+
+    def __init__(self, tickers, rules):
+        self.tickers = [t.upper() for t in tickers]
+        self.rules = list(rules)
+        n = len(self.tickers)
+        self._by_kind = {kind: [r for r in self.rules if r.kind == kind] for kind in RULE_KINDS}
+        self._masks = {kind: self._mask(rules) for kind, rules in self._by_kind.items()}
+        crosses = self._by_kind['ma_cross']
+        spikes = self._by_kind['zscore']
+        surges = self._by_kind['volume_surge']
+        self._fast = np.array([r.fast for r in crosses], dtype=np.int64)
+        self._slow = np.array([r.slow for r in crosses], dtype=np.int64)
+        self._spike_windows = np.array([r.window for r in spikes], dtype=np.int64)
+        self._thresholds = np.array([r.threshold for r in spikes], dtype=np.float64)[:, None]
+        self._surge_windows = np.array([r.window for r in surges], dtype=np.int64)
+        self._multiples = np.array([r.multiple for r in surges], dtype=np.float64)[:, None]
+
+        self.closes = RollingColumns(n, np.concatenate([self._fast, self._slow]))
+        self.returns = RollingColumns(n, self._spike_windows)
+        self.volumes = RollingColumns(n, self._surge_windows)
+        self.prev_close = np.full(n, np.nan)
+        # Sign of fast - slow at each cross rule's last valid bar
+        self.cross_sign = np.zeros((len(crosses), n))
+        self.counters = {'bars': 0, 'evaluations': 0, 'alerts': 0}
+
+    def _mask(self, rules):
+        # (rules x symbols): which symbols each rule watches
+        mask = np.ones((len(rules), len(self.tickers)), dtype=bool)
+        for i, rule in enumerate(rules):
+            if rule.tickers is not None:
+                mask[i] = np.isin(self.tickers, rule.tickers)
+        return mask
+
+    @staticmethod
+    def _stacked(stat, windows):
+        # One row per rule, computing each distinct window once
+        unique, rows = np.unique(windows, return_inverse=True)
+        if not len(unique):
+            return np.empty((0, 0))
+        return np.stack([stat(int(w)) for w in unique])[rows]
+
+    def update(self, closes, volumes=None, time=None):
+        closes = np.asarray(closes, dtype=np.float64)
+        volumes = np.zeros_like(closes) if volumes is None else np.nan_to_num(np.asarray(volumes, dtype=np.float64))
+        has_bar = ~np.isnan(closes)
+        cols = np.flatnonzero(has_bar)
+        if not len(cols):
+            return []
+        fired = []
+
+        # Spikes and surges compare this bar with the window before it, so they are
+        # evaluated before the bar enters the rolling sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change = closes / self.prev_close - 1
+        if len(self._spike_windows):
+            mean = self._stacked(self.returns.mean, self._spike_windows)
+            std = self._stacked(self.returns.std, self._spike_windows)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                z = (change - mean) / std
+            hits = (np.abs(z) >= self._thresholds) & self._masks['zscore'] & has_bar
+            fired += self._alerts('zscore', hits, z, time, lambda r, j, v: (
+                f'{self.tickers[j]} moved {change[j] * 100:+.2f}% ({v:+.1f} sigma over {r.window} bars)'))
+        if len(self._surge_windows):
+            average = self._stacked(self.volumes.mean, self._surge_windows)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                ratio = volumes / average
+            hits = (average > 0) & (ratio >= self._multiples) & self._masks['volume_surge'] & has_bar
+            fired += self._alerts('volume_surge', hits, ratio, time, lambda r, j, v: (
+                f'{self.tickers[j]} volume {volumes[j]:,.0f} is {v:.1f}x its {r.window}-bar average'))
+
+        valid_change = cols[~np.isnan(change[cols])]
+        self.returns.push(valid_change, change[valid_change])
+        self.volumes.push(cols, volumes[cols])
+        self.closes.push(cols, closes[cols])
+        self.prev_close[cols] = closes[cols]
+
+        if len(self._fast):
+            gap = self._stacked(self.closes.mean, self._fast) - self._stacked(self.closes.mean, self._slow)
+            sign = np.sign(np.nan_to_num(gap))
+            # A cross needs a sign on both sides; ties keep the previous sign
+            hits = (sign * self.cross_sign < 0) & self._masks['ma_cross'] & has_bar
+            self.cross_sign = np.where((sign != 0) & has_bar, sign, self.cross_sign)
+            fired += self._alerts('ma_cross', hits, sign, time, lambda r, j, v: (
+                f"{self.tickers[j]} {'golden' if v > 0 else 'death'} cross: MA{r.fast} {'above' if v > 0 else 'below'} MA{r.slow}"))
+
+        self.counters['bars'] += len(cols)
+        self.counters['evaluations'] += len(cols) * len(self.rules)
+        self.counters['alerts'] += len(fired)
+        return fired
+
+    def _alerts(self, kind, hits, values, time, message):
+        # Alert records for the (rule, symbol) pairs that fired; usually none
+        rules = self._by_kind[kind]
+        out = []
+        rows, cols = np.nonzero(hits)
+        for i, j, value in zip(rows.tolist(), cols.tolist(), values[rows, cols].tolist()):
+            rule, ticker = rules[i], self.tickers[j]
+            out.append({'time': None if time is None else str(time), 'ticker': ticker, 'rule': rule.name,
+                        'kind': kind, 'value': value, 'message': message(rule, j, value)})
+        return out
+
+
+class Notifier:
+    """Where alerts go. Subclasses implement ``send``, called with a list of alert dicts."""
+
+    def send(self, alerts):
+        raise NotImplementedError
+
+
+class StdoutNotifier(Notifier):
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def send(self, alerts):
+        stream = self.stream or sys.stdout
+        for alert in alerts:
+            stream.write(f"{alert['time']}  {alert['ticker']:10s} {alert['message']}\n")
+        stream.flush()
+
+
+class JsonlNotifier(Notifier):
+    # One JSON object per line, appended; safe to tail or load with pandas.read_json(lines=True)
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, alerts):
+        if not alerts:
+            return
+        with self._lock, open(self.path, 'a') as f:
+            f.writelines(json.dumps(alert) + '\n' for alert in alerts)
+
+
+def bar_closed(ticker, day, now):
+    # Whether the daily bar of `day` is final at `now`: its day is over, or its market has closed
+    today = now.astimezone(timezone.utc if is_crypto(ticker) else MARKET_TZ).date()
+    return day.date() < today or (day.date() == today and not is_trading(ticker, now))
+
+
+class AlertRunner:
+    """Feeds every new closed daily bar of a watchlist, from a bar cache, through an ``AlertEngine``.
+
+    The first run warms the rules up on enough history without notifying (or replays
+    from ``since``, notifying); later runs fetch only the tail and evaluate the bars
+    that closed since. Bars are fed in date order on one calendar, so a stock simply
+    has no bar on a weekend while crypto does.
+    """
+
+    def __init__(self, cache, engine, notifiers=(), every=REFRESH_EVERY, since=None):
+        self.cache = cache
+        self.engine = engine
+        self.notifiers = list(notifiers)
+        self.every = every
+        self.since = None if since is None else pd.Timestamp(since)
+        self.last = {}
+        self.counters = {'runs': 0, 'bars': 0, 'alerts': 0, 'seconds': 0.0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _warmup_days(self):
+        # Calendar days holding enough trading days for the longest window (~252 bars a year)
+        longest = max(self.engine.closes.size, self.engine.returns.size + 1, self.engine.volumes.size)
+        return int(longest * 365 / 252) + 14
+
+    def run_once(self, now=None):
+        """Evaluate the bars that closed since the last run; returns the alerts they fired."""
+        from .batch_fetch import to_wide
+
+        now = now or datetime.now(timezone.utc)
+        t0 = datetime.now(timezone.utc)
+        tickers = self.engine.tickers
+        first = not self.last
+        if first:
+            start = (self.since or pd.Timestamp(now.date())) - pd.Timedelta(days=self._warmup_days())
+        else:
+            start = min(self.last.values()) - pd.Timedelta(days=7)
+        end = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+        for ticker in tickers:
+            if is_trading(ticker, now):
+                self.cache.refresh(ticker)
+        wide = to_wide(self.cache.history_many(tickers, start.strftime('%Y-%m-%d'), end))
+        if wide.empty:
+            return []
+        closes = wide.xs('Close', axis=1, level='Field').reindex(columns=tickers)
+        volumes = wide.xs('Volume', axis=1, level='Field').reindex(columns=tickers)
+        # Only bars that are final and newer than the last one evaluated for their symbol
+        new = pd.DataFrame({t: [t not in self.last or day > self.last[t] for day in closes.index] for t in tickers},
+                           index=closes.index)
+        closed = pd.DataFrame({t: [bar_closed(t, day, now) for day in closes.index] for t in tickers},
+                              index=closes.index)
+        keep = (new & closed & closes.notna()).to_numpy()
+        close_values = np.where(keep, closes.to_numpy(dtype=np.float64), np.nan)
+        volume_values = volumes.to_numpy(dtype=np.float64)
+
+        alerts = []
+        for day, close_row, volume_row, kept in zip(closes.index, close_values, volume_values, keep):
+            if not kept.any():
+                continue
+            fired = self.engine.update(close_row, volume_row, day.date())
+            # During warm-up the rules only build state; a replay notifies from `since` on
+            if not first or (self.since is not None and day >= self.since):
+                alerts += fired
+            for j in np.flatnonzero(kept):
+                self.last[tickers[j]] = day
+            self.counters['bars'] += int(kept.sum())
+        for notifier in self.notifiers:
+            notifier.send(alerts)
+
+        seconds = (datetime.now(timezone.utc) - t0).total_seconds()
+        self.counters['runs'] += 1
+        self.counters['alerts'] += len(alerts)
+        self.counters['seconds'] += seconds
+        log_event('alerts', tickers=len(tickers), rules=len(self.engine.rules), alerts=len(alerts),
+                  seconds=round(seconds, 6))
+        return alerts
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as exc:
+                # A flaky upstream must not stop the scanner; the next run catches up
+                log_event('alerts_error', error=repr(exc))
+            self._stop.wait(self.every.total_seconds())
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='alerts', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main(argv=None):
+    from .pipeline import make_bar_cache
+
+    parser = argparse.ArgumentParser(description='Scan a watchlist for alerts on every new bar.')
+    parser.add_argument('tickers', nargs='*', default=DEFAULT_ALERT_TICKERS)
+    parser.add_argument('--rules', help='JSON file with a list of rules (default: MA cross, 3 sigma, 3x volume)')
+    parser.add_argument('--jsonl', help='also append alerts to this file')
+    parser.add_argument('--quiet', action='store_true', help='do not print alerts')
+    parser.add_argument('--since', help='replay and report bars from this date (YYYY-MM-DD)')
+    parser.add_argument('--every', type=int, default=int(REFRESH_EVERY.total_seconds()), help='seconds')
+    parser.add_argument('--once', action='store_true', help='scan once and exit')
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    specs = DEFAULT_RULES
+    if args.rules:
+        with open(args.rules) as f:
+            specs = json.load(f)
+    notifiers = [] if args.quiet else [StdoutNotifier()]
+    if args.jsonl:
+        notifiers.append(JsonlNotifier(args.jsonl))
+    engine = AlertEngine([t.upper() for t in args.tickers], make_rules(specs))
+    runner = AlertRunner(make_bar_cache(), engine, notifiers, every=timedelta(seconds=args.every), since=args.since)
+    if args.once:
+        runner.run_once()
+        return
+    try:
+        runner.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""Headless HTTP API serving the dashboards' numbers without Streamlit.
+
+    python -m market_dashboard.api --port 8080        # or: python -m market_dashboard --mode api
+    curl 'localhost:8080/v1/stats/AAPL?frame=1y&currency=INR'
+    curl 'localhost:8080/v1/series/BTC-USD?frame=max&columns=Close,MA50&format=arrow' -o btc.arrows
+
+Endpoints (all GET):
+
+    /health                     liveness and cache counters
+    /v1/stats/{ticker}          the eight summary statistics of the closes
+    /v1/series/{ticker}         bars with their indicator columns, downsampled to ?width points
+    /v1/watchlist?tickers=A,B   summary statistics of many tickers, one row each
+
+Query parameters: ``frame`` (a sidebar time frame, default 1y), ``interval`` (default 1d),
+``currency`` (default USD), ``columns`` and ``width`` for series. Series and watchlist
+answer JSON, or an Arrow IPC stream with ``?format=arrow`` or an ``Accept`` header of
+``application/vnd.apache.arrow.stream``.
+
+Requests share one bar cache, bar store and response memo per process, exactly as the
+Streamlit sessions do; the pandas work runs on a thread pool so the event loop keeps
+accepting connections, and concurrent requests for the same data wait on one computation.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from . import pipeline
+from .instrumentation import configure_logging, log_event
+from .memo import MemoCache
+
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+# Columns /v1/series returns unless ?columns= names others
+SERIES_COLUMNS = ['Close', 'MA50', 'MA200', 'Volume']
+# Seconds a fetched frame is served before the bar cache is asked for new bars again
+FETCH_TTL = 300
+MAX_WIDTH = 20000
+MAX_WATCHLIST = 200
+
+
+def _bad_request(message):
+    return web.HTTPBadRequest(text=json.dumps({'error': message}), content_type='application/json')
+
+
+def _finite(value):
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def to_arrow(df):
+    # One record batch in the IPC stream format; float32/int64 columns keep their width
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_json(df):
+    # {"columns": [...], "index": [ISO timestamps], "data": [[row], ...]}, NaN as null
+    return df.to_json(orient='split', date_format='iso', date_unit='s').encode()
+
+
+class Api:
+    """Shared state of one API process: the bar cache, bar store, FX rates and resampler,
+    a memo of frames and encoded responses, and the thread pool the pandas work runs on."""
+
+    def __init__(self, source=None, workers=8, max_entries=1024, max_bytes=256 * 2**20):
+        self.cache = pipeline.make_bar_cache(source)
+        self.bar_store = pipeline.make_bar_store(self.cache)
+        self.fx_rates = pipeline.make_fx_rates(source)
+        self.resampler = pipeline.make_resampler(self.bar_store, pipeline.make_intraday_store(source))
+        self.memo = MemoCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api')
+        self.counters = {'requests': 0, 'coalesced': 0}
+        self._inflight = {}
+
+    async def compute(self, key, fn, ttl=None):
+        """Memoized ``fn()`` run on the thread pool; callers asking for a key that is
+        already being computed wait for that computation instead of starting another."""
+        missing = object()
+        value = self.memo.get(key, missing)
+        if value is not missing:
+            return value
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, lambda: self.memo.put(key, fn(), ttl))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.counters['coalesced'] += 1
+        return await asyncio.shield(future)
+
+    def load(self, ticker, frame, interval, currency):
+        # The dashboards' fetch -> convert path: a view of the shared bar store, converted
+        # at each day's rate and with the indicators recomputed when not in USD
+        start, end = pipeline.interval_range(frame, interval)
+        if interval != '1d':
+            return pipeline.bar_page(self.resampler, self.fx_rates, ticker, start, end, interval, currency)
+        if currency == 'USD':
+            return self.bar_store.history(ticker, start, end, fetch_start=pipeline.MAX_START)
+        return pipeline.convert_currency(self.bar_store, self.fx_rates, ticker, start, end, currency)
+
+    async def frame(self, request):
+        from .fx import MissingRatesError
+
+        ticker, frame, interval, currency = _frame_params(request)
+        try:
+            df = await self.compute(('frame', ticker, frame, interval, currency),
+                                    lambda: self.load(ticker, frame, interval, currency), ttl=FETCH_TTL)
+        except MissingRatesError as exc:
+            # Never answer USD prices labelled as another currency
+            raise web.HTTPBadGateway(text=json.dumps({'error': str(exc)}), content_type='application/json') from None
+        if df.empty:
+            raise web.HTTPNotFound(text=json.dumps({'error': f'No data for {ticker}'}), content_type='application/json')
+        # Later stages are keyed on the data version, like the dashboards' session memo
+        return df, (ticker, frame, interval, currency) + pipeline.data_version(df)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _frame_params(request):
+    from .fx import CURRENCY_SYMBOLS
+
+    query = request.query
+    ticker = request.match_info['ticker'].strip().upper()
+    interval = query.get('interval', '1d')
+    frame = query.get('frame', '1y')
+    currency = query.get('currency', 'USD').upper()
+    if interval not in pipeline.INTERVALS:
+        raise _bad_request(f'interval must be one of {pipeline.INTERVALS}')
+    if frame not in pipeline.interval_frames(interval):
+        raise _bad_request(f'frame must be one of {pipeline.interval_frames(interval)} at interval {interval}')
+    if currency not in CURRENCY_SYMBOLS:
+        raise _bad_request(f'currency must be one of {list(CURRENCY_SYMBOLS)}')
+    return ticker, frame, interval, currency
+
+
+def _wants_arrow(request):
+    fmt = request.query.get('format')
+    if fmt not in (None, 'json', 'arrow'):
+        raise _bad_request('format must be json or arrow')
+    return fmt == 'arrow' or (fmt is None and ARROW_TYPE in request.headers.get('Accept', ''))
+
+
+def _encoded(body, arrow):
+    return web.Response(body=body, content_type=ARROW_TYPE if arrow else 'application/json')
+
+
+async def health(request):
+    api = request.app['api']
+    return web.json_response({'status': 'ok', **api.counters, 'memo': api.memo.stats(),
+                              'bar_cache': api.cache.counters, 'bar_cache_bytes': api.cache.nbytes(),
+                              'bar_store_bytes': api.bar_store.nbytes()})
+
+
+async def stats(request):
+    from .stats import summary_stats
+
+    api = request.app['api']
+    df, version = await api.frame(request)
+    values = await api.compute(('stats',) + version, lambda: summary_stats(df['Close']))
+    ticker, frame, interval, currency = version[:4]
+    return web.json_response({'ticker': ticker, 'frame': frame, 'interval': interval, 'currency': currency,
+                              'start': df.index[0].isoformat(), 'end': df.index[-1].isoformat(), 'bars': len(df),
+                              'stats': {k: _finite(v) for k, v in values.items()}})
+
+
+async def series(request):
+    from .downsample import downsample_frame
+
+    api = request.app['api']
+    arrow = _wants_arrow(request)
+    columns = [c for c in request.query.get('columns', ','.join(SERIES_COLUMNS)).split(',') if c]
+    try:
+        width = int(request.query.get('width', 1200))
+    except ValueError:
+        raise _bad_request('width must be an integer') from None
+    if not 3 <= width <= MAX_WIDTH:
+        raise _bad_request(f'width must be between 3 and {MAX_WIDTH}')
+    df, version = await api.frame(request)
+    unknown = [c for c in columns if c not in df.columns]
+    if unknown:
+        raise _bad_request(f'unknown columns {unknown}; available: {list(df.columns)}')
+
+    # The encoded body is memoized, so repeated requests skip downsampling and serialization
+    def encode():
+        points = downsample_frame(df[columns], columns, width)
+        return to_arrow(points) if arrow else to_json(points)
+
+    body = await api.compute(('series',) + version + (tuple(columns), width, arrow), encode)
+    return _encoded(body, arrow)
+
+
+async def watchlist(request):
+    from .stats import summary_table
+
+    api = request.app['api']
+    arrow = _wants_arrow(request)
+    tickers = pipeline.parse_tickers(request.query.get('tickers', ''))
+    frame = request.query.get('frame', '1y')
+    if not 0 < len(tickers) <= MAX_WATCHLIST:
+        raise _bad_request(f'tickers must name 1 to {MAX_WATCHLIST} symbols')
+    if frame not in pipeline.TIME_FRAMES:
+        raise _bad_request(f'frame must be one of {pipeline.TIME_FRAMES}')
+    start, end = pipeline.frame_range(frame)
+
+    def encode():
+        closes, missing = pipeline.watchlist_closes(api.cache, tickers, start, end)
+        table = summary_table(closes) if not closes.empty else closes
+        if arrow:
+            return to_arrow(table)
+        return json.dumps({'frame': frame, 'missing': missing,
+                           'rows': json.loads(table.to_json(orient='index'))}).encode()
+
+    body = await api.compute(('watchlist', tuple(tickers), frame, arrow), encode, ttl=FETCH_TTL)
+    return _encoded(body, arrow)
+
+
+@web.middleware
+async def timing(request, handler):
+    # One perf log line per request, like the dashboards' per-rerun lines
+    t0 = time.perf_counter()
+    request.app['api'].counters['requests'] += 1
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as exc:
+        status = exc.status
+        raise
+    finally:
+        log_event('api', path=request.path, status=status, seconds=round(time.perf_counter() - t0, 6))
+
+
+def make_app(api=None):
+    api = api or Api()
+    app = web.Application(middlewares=[timing])
+    app['api'] = api
+    app.router.add_get('/health', health)
+    app.router.add_get('/v1/stats/{ticker}', stats)
+    app.router.add_get('/v1/series/{ticker}', series)
+    app.router.add_get('/v1/watchlist', watchlist)
+
+    async def shutdown(app):
+        app['api'].close()
+
+    app.on_cleanup.append(shutdown)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m market_dashboard.api',
+                                     description='Serve dashboard statistics and series over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=8, help='threads for data loading and computation')
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    web.run_app(make_app(Api(workers=args.workers)), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,485 @@
+"""Streamlit entry point for the stock, crypto and combined dashboards.
+
+    streamlit run market_dashboard/app.py -- --mode stock|crypto|combined
+    python -m market_dashboard --mode crypto
+
+The mode can also be set with DASHBOARD_MODE; the default is the combined dashboard.
+"""
+import argparse
+import os
+import sys
+
+import streamlit as st
+
+if __package__ in (None, ''):
+    # Run as a script by `streamlit run`: make the package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_dashboard import pipeline  # noqa: E402
+from market_dashboard.instrumentation import RunStats, configure_logging  # noqa: E402
+
+MODES = ['stock', 'crypto', 'combined']
+TITLES = {'stock': 'Stock Trend Analysis', 'crypto': 'Cryptocurrency Trend Analysis'}
+DEFAULT_TICKERS = {'Stock': 'AAPL', 'Crypto': 'BTC-USD'}
+DEFAULT_WATCHLIST = 'AAPL, MSFT, GOOGL, AMZN, NVDA, BTC-USD, ETH-USD'
+# Rolling windows offered for the watchlist's correlations, in bars
+CORRELATION_WINDOWS = [20, 60, 120, 250]
+# Currency stock prices are shown in until the user picks another one
+DEFAULT_CURRENCY = 'INR'
+
+# Seconds before a memoized fetch is re-checked against the bar cache for new bars
+FETCH_TTL = 300
+
+# Custom CSS to style the app similar to TradingView
+CSS = """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700&display=swap');
+    body {
+        background-color: #0d1117;
+        color: #c9d1d9;
+        font-family: 'Roboto', sans-serif;
+    }
+    .main {
+        background-color: #0d1117;
+        color: #c9d1d9;
+        padding: 20px;
+    }
+    h1, h2, h3, h4, h5, h6 {
+        color: #58a6ff;
+        text-align: center;
+    }
+    .stTextInput label {
+        font-size: 1.2em;
+        color: #c9d1d9;
+    }
+    .stMarkdown p {
+        color: #c9d1d9;
+        text-align: center;
+    }
+    .stDataFrame, .stPlotlyChart {
+        background-color: #161b22;
+        color: #c9d1d9;
+    }
+    .title-wrapper {
+        background-color: #0d1117;
+        text-align: center;
+        padding: 20px;
+    }
+    .title-wrapper h1 {
+        color: #58a6ff;
+    }
+    .data-section, .stats-section, .plot-section {
+        padding: 20px;
+        background-color: #161b22;
+        margin: 20px 0;
+        border-radius: 10px;
+    }
+    .stats-box {
+        display: flex;
+        justify-content: space-between;
+        flex-wrap: wrap;
+        padding: 20px;
+        background-color: #21262d;
+        border-radius: 10px;
+        margin: 20px 0;
+    }
+    .stat {
+        flex: 1;
+        text-align: center;
+        color: #c9d1d9;
+        padding: 10px;
+        min-width: 200px;
+    }
+    .stat h3 {
+        color: #58a6ff;
+        margin-bottom: 10px;
+    }
+    .stat p {
+        font-size: 1.5em;
+        margin: 0;
+    }
+    </style>
+"""
+
+
+# One bar cache per server process, shared by every session and rerun.
+# DATA_SOURCE picks the upstream: yfinance (default), synthetic or replay:<dir>.
+# Cached frames carry MA50/MA200/EMA/RSI/Bollinger columns, updated incrementally
+@st.cache_resource
+def get_bar_cache():
+    return pipeline.make_bar_cache()
+
+
+# Compact float32/int64 arrays of the cached bars, shared by every session: the fetch
+# stage hands out read-only views of them instead of a private float64 copy per session
+@st.cache_resource
+def get_bar_store():
+    return pipeline.make_bar_store(get_bar_cache())
+
+
+@st.cache_resource
+def get_intraday_store():
+    return pipeline.make_intraday_store()
+
+
+@st.cache_resource
+def get_resampler():
+    return pipeline.make_resampler(get_bar_store(), get_intraday_store())
+
+
+@st.cache_resource
+def get_fx_rates():
+    return pipeline.make_fx_rates()
+
+
+# Prices converted into another currency are a new float64 frame with recomputed indicators,
+# which no bar store view can stand in for: each one is built once per process and shared by
+# every session showing that ticker, time frame and currency
+@st.cache_resource
+def get_converted_frames():
+    from market_dashboard.memo import MemoCache
+
+    return MemoCache(max_entries=256, max_bytes=256 * 2**20)
+
+
+# Stored forecast models (MODEL_DIR) and the worker that trains them off the request path
+@st.cache_resource
+def get_model_store():
+    return pipeline.make_model_store()
+
+
+@st.cache_resource
+def get_trainer():
+    return pipeline.make_trainer(get_bar_cache(), get_model_store())
+
+
+# Refreshes popular and recently viewed tickers in the background, on a cadence that
+# follows market hours for stocks and runs around the clock for crypto
+@st.cache_resource
+def get_prefetcher():
+    return pipeline.make_prefetcher(get_bar_cache(), get_fx_rates(), currencies=[DEFAULT_CURRENCY])
+
+
+def parse_mode(argv=None):
+    # --mode on the command line (after `--` with streamlit run), else DASHBOARD_MODE
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--mode', choices=MODES, default=os.environ.get('DASHBOARD_MODE', 'combined'))
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args.mode
+
+
+def get_memo():
+    # Per-session memo of the fetch -> convert -> stats -> figure stages. Streamlit reruns the
+    # whole script on every widget change; each stage is keyed only on the inputs it depends on
+    from market_dashboard.memo import MemoCache
+
+    if 'memo' not in st.session_state:
+        st.session_state.memo = MemoCache(max_entries=32, max_bytes=128 * 2**20)
+    return st.session_state.memo
+
+
+def render_stats(stats, currency):
+    from market_dashboard.stats import STAT_KEYS, STAT_LABELS
+
+    st.markdown("<div class='stats-box'>", unsafe_allow_html=True)
+    for key in STAT_KEYS:
+        value = f"{stats[key]:.2f}%" if key == 'pct_change' else f"{currency}{stats[key]:.2f}"
+        st.markdown(f"<div class='stat'><h3>{STAT_LABELS[key]}</h3><p>{value}</p></div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+def render_debug(panel, run_stats):
+    panel.json(run_stats.finish())
+    if run_stats.profile_text:
+        panel.code(run_stats.profile_text)
+
+
+def render_watchlist(start_date, end_date, run_stats):
+    # Fetch every symbol in bulk (in parallel, only missing bars) and compare them
+    from market_dashboard.stats import summary_table
+
+    tickers = pipeline.parse_tickers(st.sidebar.text_area('Watchlist (comma separated)', DEFAULT_WATCHLIST))
+    for ticker in tickers:
+        get_prefetcher().touch(ticker)
+    with run_stats.stage('fetch'):
+        closes, missing = pipeline.watchlist_closes(get_bar_cache(), tickers, start_date, end_date)
+    run_stats.count_frame(closes)
+
+    st.markdown("<div class='title-wrapper'><h1>Watchlist Trend Analysis</h1></div>", unsafe_allow_html=True)
+    if missing:
+        st.warning(f"No data for: {', '.join(missing)}")
+    if closes.empty:
+        return
+
+    # Key statistics per ticker (one sort over the whole close matrix), in each symbol's own currency
+    st.markdown("<div class='data-section'><h2>Key Statistics</h2></div>", unsafe_allow_html=True)
+    with run_stats.stage('stats'):
+        stats_table = summary_table(closes)
+    st.dataframe(stats_table.round(2))
+
+    st.markdown("<div class='plot-section'><h2>Relative Performance</h2></div>", unsafe_allow_html=True)
+    with run_stats.stage('chart'):
+        fig = pipeline.relative_chart(closes)
+    with run_stats.stage('render'):
+        st.plotly_chart(fig)
+    if closes.shape[1] > 1:
+        render_correlations(closes, start_date, run_stats)
+
+
+def render_correlations(closes, start_date, run_stats):
+    # Rolling pairwise moments are kept in the session memo and only fed the bars added since
+    # the last rerun (see cross_asset.py); the heatmap is the latest window
+    from market_dashboard.cross_asset import CALENDARS
+
+    window = st.sidebar.selectbox('Correlation Window (bars)', CORRELATION_WINDOWS, index=1)
+    calendar = st.sidebar.selectbox('Return Calendar', CALENDARS,
+                                    help="'trading': days any stock traded; '24/7': every day")
+    benchmark = st.sidebar.selectbox('Benchmark', list(closes.columns))
+
+    st.markdown("<div class='plot-section'><h2>Correlation</h2></div>", unsafe_allow_html=True)
+    if len(closes) <= window // 2:
+        st.info(f"Pick a longer time frame: a {window}-bar window needs at least {window // 2 + 1} bars.")
+        return
+    with run_stats.stage('correlation'):
+        moments = get_memo().get_or_compute(
+            ('correlation', tuple(closes.columns), window, calendar, start_date),
+            lambda: pipeline.make_correlations(closes, window, calendar))
+        betas, heatmap, rolling = pipeline.correlation_charts(moments, closes, benchmark, calendar)
+    st.plotly_chart(heatmap)
+    st.dataframe(betas.to_frame(f'Beta vs {benchmark}').round(2))
+    st.plotly_chart(rolling)
+
+
+def render_backtest(ticker, df, memo_key, run_stats):
+    # Long while MA50 is above MA200, evaluated on the displayed history (see backtest.py)
+    st.markdown("<div class='plot-section'><h2>MA50/MA200 Crossover Backtest</h2></div>", unsafe_allow_html=True)
+    with run_stats.stage('backtest'):
+        metrics, fig = get_memo().get_or_compute(('backtest',) + memo_key,
+                                                 lambda: pipeline.crossover_backtest(df, ticker))
+    cards = [
+        ('Strategy Return', f"{metrics['total_return'] * 100:.2f}%"),
+        ('Buy & Hold Return', f"{metrics['buy_and_hold'] * 100:.2f}%"),
+        ('Sharpe Ratio', f"{metrics['sharpe']:.2f}"),
+        ('Max Drawdown', f"{metrics['max_drawdown'] * 100:.2f}%"),
+        ('Trades', f"{metrics['trades']}"),
+    ]
+    st.markdown("<div class='stats-box'>", unsafe_allow_html=True)
+    for label, value in cards:
+        st.markdown(f"<div class='stat'><h3>{label}</h3><p>{value}</p></div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.plotly_chart(fig)
+
+
+def render_forecast(ticker, raw_df, df, currency, memo_key, run_stats):
+    # Served from the newest stored model; a missing or stale model is (re)trained in the
+    # background and picked up on a later rerun, never fitted inside the script
+    from market_dashboard.forecast import FORECAST_HORIZON, is_stale
+
+    model = get_model_store().load(ticker)
+    if is_stale(model, raw_df.index[-1]):
+        get_trainer().submit(ticker, pipeline.MAX_START, pipeline.frame_range('max')[1])
+    st.markdown(f"<div class='plot-section'><h2>{FORECAST_HORIZON}-Bar Price Forecast</h2></div>",
+                unsafe_allow_html=True)
+    if model is None:
+        st.info(f"No forecast model for {ticker} yet. It is being trained in the background and will "
+                "show up on a later rerun (or train it offline: python -m market_dashboard.forecast).")
+        return
+    # Prices shown in another currency: hold the latest exchange rate over the horizon
+    scale = df['Close'].iloc[-1] / raw_df['Close'].iloc[-1]
+    close = raw_df['Close']
+    if len(close) <= model.lags:
+        # Short time frames lack the lags the model starts from; forecast from the last 3 months
+        close = get_bar_store().history(ticker, pipeline.frame_start('3mo'), pipeline.frame_range('max')[1])['Close']
+    with run_stats.stage('forecast'):
+        fig = get_memo().get_or_compute(
+            ('forecast', model.trained_at) + memo_key,
+            lambda: pipeline.forecast_chart(model, ticker, close, f'{ticker} Forecast', currency, scale))
+    st.plotly_chart(fig)
+    st.caption(f"Ridge AR({model.lags}) on daily log returns, trained through {model.trained_through[:10]} "
+               f"on {model.n_obs} returns.")
+
+
+def render_bars(title, ticker, interval, display_currency, start_date, end_date, run_stats):
+    # Weekly/monthly and intraday bars, shown one page (a few thousand bars) at a time so a month
+    # of minute bars is never loaded at once. Whatever can be derived from cached finer bars is
+    # resampled instead of downloaded (see resample.py)
+    from datetime import date, timedelta
+
+    from market_dashboard.fx import CURRENCY_SYMBOLS, MissingRatesError
+    from market_dashboard.intraday import page_ranges
+    from market_dashboard.stats import summary_stats
+
+    pages = page_ranges(start_date, end_date, interval)
+    number = len(pages) - 1
+    if len(pages) > 1:
+        number = st.select_slider('Page', options=range(len(pages)), value=number, format_func=lambda i: (
+            f'{pages[i][0]} to {date.fromisoformat(pages[i][1]) - timedelta(days=1)}'))
+    page = pages[number]
+
+    def load(quote):
+        return get_memo().get_or_compute(
+            ('bars', ticker, interval, page, quote),
+            lambda: pipeline.bar_page(get_resampler(), get_fx_rates(), ticker, *page, interval, quote),
+            ttl=FETCH_TTL)
+
+    fx_error = None
+    with run_stats.stage('fetch'):
+        try:
+            df = load(display_currency)
+        except MissingRatesError as exc:
+            fx_error, display_currency = exc, 'USD'
+            df = load('USD')
+    run_stats.count_frame(df)
+
+    st.markdown(f"<div class='title-wrapper'><h1>{title}</h1></div>", unsafe_allow_html=True)
+    if fx_error is not None:
+        st.warning(f"{fx_error}; showing prices in USD")
+    if df.empty:
+        st.warning(f"No {interval} data for {ticker} in this range")
+        return
+    st.markdown("<div class='data-section'><h2>Historical Data</h2></div>", unsafe_allow_html=True)
+    st.dataframe(df.head())
+    with run_stats.stage('stats'):
+        stats = summary_stats(df['Close'])
+    currency = CURRENCY_SYMBOLS[display_currency]
+    render_stats(stats, currency)
+
+    st.markdown("<div class='plot-section'><h2>Price, Moving Averages and Volume Chart</h2></div>",
+                unsafe_allow_html=True)
+    with run_stats.stage('chart'):
+        fig = pipeline.price_chart(df, f'{ticker} {interval} Price, Moving Averages and Volume vs Time', currency)
+    with run_stats.stage('render'):
+        st.plotly_chart(fig)
+    st.caption(f"{interval} bars, page {number + 1} of {len(pages)}. Moving averages are in bars; "
+               "backtests and forecasts use daily bars.")
+
+
+def render_ticker(title, ticker, time_frame, display_currency, start_date, end_date, run_stats):
+    from market_dashboard.fx import CURRENCY_SYMBOLS, MissingRatesError
+    from market_dashboard.stats import summary_stats
+
+    memo = get_memo()
+    get_prefetcher().touch(ticker)
+    # Fetch data (served from the local bar cache, only missing bars hit the data source) as a
+    # read-only view of the shared bar store, checking for new bars at most every FETCH_TTL seconds.
+    # The first fetch fills the whole 'max' range, so switching time frames never downloads again
+    with run_stats.stage('fetch'):
+        raw_df = memo.get_or_compute(('fetch', ticker, start_date, end_date),
+                                     lambda: get_bar_store().history(ticker, start_date, end_date,
+                                                                     fetch_start=pipeline.MAX_START),
+                                     ttl=FETCH_TTL)
+    run_stats.count_frame(raw_df)
+
+    st.markdown(f"<div class='title-wrapper'><h1>{title}</h1></div>", unsafe_allow_html=True)
+    if raw_df.empty:
+        st.warning(f"No data for {ticker}")
+        return
+    # Later stages are keyed on the data version, so a refetch that brings new or revised bars
+    # invalidates them
+    data_version = pipeline.data_version(raw_df)
+
+    # Stock prices are quoted in USD; convert with the historical daily rates
+    df = raw_df
+    if display_currency != 'USD':
+        try:
+            with run_stats.stage('convert'):
+                df = get_converted_frames().get_or_compute(
+                    ('convert', ticker, time_frame, display_currency, data_version),
+                    lambda: pipeline.convert_currency(get_bar_store(), get_fx_rates(), ticker, start_date, end_date,
+                                                      display_currency))
+        except MissingRatesError as exc:
+            # Show the USD prices as such rather than under another currency's symbol
+            st.warning(f"{exc}; showing prices in USD")
+            display_currency = 'USD'
+
+    st.markdown("<div class='data-section'><h2>Historical Data</h2></div>", unsafe_allow_html=True)
+    st.dataframe(df.head())
+
+    # All eight key statistics in one vectorized pass (see stats.py)
+    with run_stats.stage('stats'):
+        stats = memo.get_or_compute(('stats', ticker, time_frame, display_currency, data_version),
+                                    lambda: summary_stats(df['Close']))
+    currency = CURRENCY_SYMBOLS[display_currency]
+    render_stats(stats, currency)
+
+    # Zoom window for the charts; the selected range is re-downsampled at full detail
+    chart_df, zoom = df, None
+    if len(df) > 1 and df.index[0].date() < df.index[-1].date():
+        first_day, last_day = df.index[0].date(), df.index[-1].date()
+        zoom = st.slider('Zoom', min_value=first_day, max_value=last_day, value=(first_day, last_day))
+        chart_df = pipeline.zoom_frame(df, *zoom)
+
+    # Close with its moving averages and volume in one figure: shared x-axis, WebGL traces,
+    # each series downsampled to the chart width (see charts.py)
+    st.markdown("<div class='plot-section'><h2>Price, Moving Averages and Volume Chart</h2></div>",
+                unsafe_allow_html=True)
+    with run_stats.stage('chart'):
+        fig = memo.get_or_compute(
+            ('figure', ticker, time_frame, display_currency, zoom, data_version),
+            lambda: pipeline.price_chart(chart_df, f'{ticker} Price, Moving Averages and Volume vs Time', currency))
+    with run_stats.stage('render'):
+        st.plotly_chart(fig)
+
+    memo_key = (ticker, time_frame, display_currency, data_version)
+    if len(df) > 2:
+        render_backtest(ticker, df, memo_key, run_stats)
+    render_forecast(ticker, raw_df, df, currency, memo_key, run_stats)
+
+    # Hit/miss counters of the session memo, per stage
+    with st.sidebar.expander('Session cache'):
+        st.json(memo.stats())
+
+
+def main(mode=None):
+    """Render one run of the dashboard in ``mode`` ('stock', 'crypto' or 'combined')."""
+    from market_dashboard.fx import CURRENCY_SYMBOLS
+
+    mode = mode or parse_mode()
+    configure_logging()
+    st.markdown(CSS, unsafe_allow_html=True)
+
+    # Only the combined dashboard lets the user pick the asset type and the watchlist view
+    if mode == 'combined':
+        st.sidebar.title("Select Asset Type")
+        asset_type = st.sidebar.radio("Choose Asset Type", ["Stock", "Crypto"])
+        view_mode = st.sidebar.radio("View", ["Single Ticker", "Watchlist"])
+    else:
+        asset_type = 'Stock' if mode == 'stock' else 'Crypto'
+        view_mode = "Single Ticker"
+
+    ticker = st.sidebar.text_input('Enter Ticker', DEFAULT_TICKERS[asset_type])
+    # Stock prices are shown in the chosen currency; crypto stays in USD
+    if asset_type == "Stock":
+        currencies = list(CURRENCY_SYMBOLS)
+        display_currency = st.sidebar.selectbox('Display Currency', currencies,
+                                                index=currencies.index(DEFAULT_CURRENCY))
+    else:
+        display_currency = 'USD'
+    # Other intervals are offered for a single ticker; intraday ones only reach back so far
+    interval = st.sidebar.selectbox('Interval', pipeline.INTERVALS) if view_mode == "Single Ticker" else '1d'
+    time_frames = pipeline.interval_frames(interval)
+    time_frame = st.sidebar.selectbox('Select Time Frame', time_frames, index=len(time_frames) - 1)
+    start_date, end_date = pipeline.interval_range(time_frame, interval)
+
+    # Per-rerun stage timings and counters, shown in the Debug sidebar panel and logged as JSON lines
+    debug_panel = st.sidebar.expander('Debug')
+    run_stats = RunStats(mode, profile=debug_panel.checkbox('Profile this run (cProfile)'))
+    run_stats.watch(get_bar_cache().counters, 'cache')
+    if display_currency != 'USD':
+        run_stats.watch(get_fx_rates().cache.counters, 'fx_cache')
+
+    if view_mode == "Watchlist":
+        render_watchlist(start_date, end_date, run_stats)
+    elif interval != '1d':
+        run_stats.watch(get_intraday_store().counters, 'intraday')
+        run_stats.watch(get_resampler().counters, 'resample')
+        title = TITLES.get(mode, f"Trend Analysis for {asset_type}")
+        render_bars(title, ticker, interval, display_currency, start_date, end_date, run_stats)
+    else:
+        title = TITLES.get(mode, f"Trend Analysis for {asset_type}")
+        render_ticker(title, ticker, time_frame, display_currency, start_date, end_date, run_stats)
+    render_debug(debug_panel, run_stats)
+
+
+if __name__ == '__main__':
+    main()
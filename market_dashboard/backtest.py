@@ -0,0 +1,180 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data_sources import is_crypto
+
+# Bars per year used to annualize Sharpe ratios
+TRADING_DAYS = 252
+CRYPTO_DAYS = 365
+
+
+def periods_per_year(ticker):
+    return CRYPTO_DAYS if is_crypto(ticker) else TRADING_DAYS
+
+
+def rolling_means(close, windows):
+    """``close.rolling(w).mean()`` for every ``w`` in ``windows``, as rows of one matrix.
+
+    Each row is a difference of one shared cumulative sum, so a whole grid of windows costs
+    one ``cumsum`` plus one subtraction per window.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    csum = np.concatenate(([0.0], np.cumsum(close)))
+    out = np.full((len(windows), n), np.nan)
+    for i, w in enumerate(windows):
+        if w <= n:
+            out[i, w - 1:] = (csum[w:] - csum[:-w]) / w
+    return out
+
+
+def _bar_returns(close):
+    close = np.asarray(close, dtype=np.float64)
+    returns = np.zeros(len(close))
+    returns[1:] = close[1:] / close[:-1] - 1
+    return returns
+
+
+def _positions(fast, slow):
+    # Long while fast > slow (NaN warm-up counts as flat). The signal at a bar's close is
+    # traded on the next bar, so positions are lagged by one bar: no look-ahead
+    signal = (fast > slow).astype(np.float64)
+    positions = np.zeros_like(signal)
+    positions[..., 1:] = signal[..., :-1]
+    return positions
+
+
+def _evaluate(positions, returns, cost, periods, curves=False):
+    # Metrics for every row of `positions` (strategies x bars), all rows at once
+    turnover = np.abs(np.diff(positions, axis=-1, prepend=0.0))
+    strategy = positions * returns - cost * turnover
+    equity = np.exp(np.cumsum(np.log1p(strategy), axis=-1))
+    # Peak includes the starting equity of 1
+    peak = np.maximum(np.maximum.accumulate(equity, axis=-1), 1.0)
+    drawdown = equity / peak - 1
+    mean = strategy.mean(axis=-1)
+    std = strategy.std(axis=-1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods), np.nan)
+    metrics = {
+        'total_return': equity[..., -1] - 1,
+        'sharpe': sharpe,
+        'max_drawdown': drawdown.min(axis=-1),
+        'trades': (turnover > 0).sum(axis=-1),
+        'exposure': positions.mean(axis=-1),
+    }
+    if curves:
+        metrics.update(returns=strategy, equity=equity, drawdown=drawdown)
+    return metrics
+
+
+def backtest(close, fast_ma, slow_ma, cost_bps=0.0, periods=TRADING_DAYS):
+    """Long/flat MA-crossover backtest of one series, with no per-bar Python loop.
+
+    Returns the metrics (total return, annualized Sharpe, max drawdown, number of trades,
+    exposure) plus the per-bar ``returns``, ``equity`` and ``drawdown`` curves.
+    ``cost_bps`` is charged per unit of position change.
+    """
+    positions = _positions(np.asarray(fast_ma, dtype=np.float64), np.asarray(slow_ma, dtype=np.float64))
+    result = _evaluate(positions, _bar_returns(close), cost_bps / 1e4, periods, curves=True)
+    return {k: v if isinstance(v, np.ndarray) and v.ndim else v.item() for k, v in result.items()}
+
+
+def backtest_frame(df, fast='MA50', slow='MA200', cost_bps=0.0, periods=TRADING_DAYS):
+    # Backtest on the moving-average columns the bar cache already keeps
+    result = backtest(df['Close'], df[fast], df[slow], cost_bps, periods)
+    result['equity'] = pd.Series(result['equity'], index=df.index, name='Strategy')
+    result['buy_and_hold'] = (df['Close'] / df['Close'].iloc[0]).rename('Buy & Hold')
+    return result
+
+
+def window_pairs(fast_windows, slow_windows):
+    return [(f, s) for f in fast_windows for s in slow_windows if f < s]
+
+
+def sweep(close, fast_windows, slow_windows, cost_bps=0.0, periods=TRADING_DAYS, chunk=512):
+    """Metrics of every (fast, slow) crossover with fast < slow, as a DataFrame.
+
+    All moving averages come from one cumulative sum; pairs are evaluated ``chunk`` at a
+    time as (pairs x bars) matrices to bound memory.
+    """
+    pairs = window_pairs(fast_windows, slow_windows)
+    windows = sorted({w for pair in pairs for w in pair})
+    row = {w: i for i, w in enumerate(windows)}
+    means = rolling_means(close, windows)
+    returns = _bar_returns(close)
+    parts = []
+    for lo in range(0, len(pairs), chunk):
+        block = pairs[lo:lo + chunk]
+        fast = means[[row[f] for f, _ in block]]
+        slow = means[[row[s] for _, s in block]]
+        parts.append(_evaluate(_positions(fast, slow), returns, cost_bps / 1e4, periods))
+    result = pd.DataFrame({k: np.concatenate([p[k] for p in parts]) for k in parts[0]}) if parts else pd.DataFrame()
+    result.insert(0, 'fast', [f for f, _ in pairs])
+    result.insert(1, 'slow', [s for _, s in pairs])
+    return result
+
+
+def _sweep_job(ticker, close, fast_windows, slow_windows, cost_bps):
+    return sweep(close, fast_windows, slow_windows, cost_bps, periods_per_year(ticker)).assign(ticker=ticker)
+
+
+def sweep_many(closes, fast_windows, slow_windows, cost_bps=0.0, max_workers=None):
+    """``sweep`` for every ticker of ``closes`` (dict of ticker -> closes) on a process pool.
+
+    Each ticker's grid is independent, so tickers are spread over worker processes;
+    ``max_workers=1`` runs them in this process.
+    """
+    jobs = [(t, np.asarray(c, dtype=np.float64), list(fast_windows), list(slow_windows), cost_bps)
+            for t, c in closes.items()]
+    if max_workers == 1:
+        results = [_sweep_job(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_sweep_job, *zip(*jobs))) if jobs else []
+    if not results:
+        return pd.DataFrame()
+    return pd.concat(results, ignore_index=True)[['ticker'] + list(results[0].columns[:-1])]
+
+
+def walk_forward(close, fast_windows, slow_windows, train_bars=756, test_bars=126, cost_bps=0.0,
+                 periods=TRADING_DAYS, metric='sharpe'):
+    """Out-of-sample crossover returns with parameters re-picked on a rolling window.
+
+    Each fold picks the (fast, slow) pair with the best ``metric`` over the previous
+    ``train_bars`` bars and trades it for the next ``test_bars``. Moving averages only
+    look back, so computing them once over the whole series leaks nothing. A fold whose
+    training window scores NaN for every pair is skipped. Returns the chosen pairs per
+    fold and the metrics and equity of the stitched test periods, with ``bars`` holding
+    each stitched bar's position in ``close``.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    pairs = window_pairs(fast_windows, slow_windows)
+    windows = sorted({w for pair in pairs for w in pair})
+    row = {w: i for i, w in enumerate(windows)}
+    means = rolling_means(close, windows)
+    positions = _positions(means[[row[f] for f, _ in pairs]], means[[row[s] for _, s in pairs]])
+    returns = _bar_returns(close)
+    cost = cost_bps / 1e4
+
+    folds, oos, tests = [], [], []
+    for start in range(train_bars, len(close), test_bars):
+        train = slice(start - train_bars, start)
+        scores = _evaluate(positions[:, train], returns[train], cost, periods)[metric]
+        if np.isnan(scores).all():
+            continue
+        best = int(np.nanargmax(scores))
+        test = slice(start, min(start + test_bars, len(close)))
+        folds.append({'start': start, 'fast': pairs[best][0], 'slow': pairs[best][1], metric: float(scores[best])})
+        oos.append(positions[best, test])
+        tests.append(test)
+    if not oos:
+        return {'folds': pd.DataFrame(folds), 'equity': np.ones(0), 'bars': np.zeros(0, dtype=np.int64)}
+    # Skipped folds leave gaps, so each fold's positions are paired with its own test bars
+    result = _evaluate(np.concatenate(oos), np.concatenate([returns[t] for t in tests]), cost, periods, curves=True)
+    result = {k: v if isinstance(v, np.ndarray) and v.ndim else v.item() for k, v in result.items()}
+    result['folds'] = pd.DataFrame(folds)
+    result['bars'] = np.concatenate([np.arange(t.start, t.stop) for t in tests])
+    return result
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .data_sources import bar_bounds
+
+# Cached columns the dashboards never read; they are not kept in the store
+DROPPED_COLUMNS = ('Dividends', 'Stock Splits')
+
+
+def _column(values, dtype):
+    # Typed, read-only copy of one column (missing volumes count as 0)
+    if np.issubdtype(dtype, np.integer):
+        values = np.nan_to_num(values.to_numpy(dtype=np.float64))
+    array = np.asarray(values, dtype=dtype).copy()
+    array.flags.writeable = False
+    return array
+
+
+class BarSeries:
+    """One ticker's bars as compact read-only column arrays: float32 prices and
+    indicators, int64 volume, and the datetime index (int64 nanoseconds) of the cache."""
+
+    def __init__(self, df, mtime=None):
+        self.index = df.index
+        self.arrays = {c: _column(df[c], np.int64 if c == 'Volume' else np.float32)
+                       for c in df.columns if c not in DROPPED_COLUMNS}
+        # mtime of the cache entry these arrays were built from; a rewrite of the entry changes it
+        self.mtime = mtime
+
+    def built_from(self, meta):
+        return self.mtime == meta['mtime']
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays.values()) + self.index.nbytes
+
+    def view(self, start, end):
+        # Rows in [start, end) as a DataFrame over slices of the shared arrays: nothing is copied
+        lo, hi = bar_bounds(self.index, start, end)
+        return pd.DataFrame({c: a[lo:hi] for c, a in self.arrays.items()}, index=self.index[lo:hi], copy=False)
+
+
+class BarStore:
+    """Process-wide store of bars in compact typed arrays, in front of an ``OHLCVCache``.
+
+    ``history`` has the cache's signature, but instead of a private float64 copy for every
+    caller it returns a read-only view into one shared ``BarSeries`` per ticker, so any
+    number of sessions showing the same ticker cost one copy of its bars. Writing into a
+    view raises; derive a new frame instead (see ``fx.convert_ohlc``). The cache releases
+    its own float64 frame of every entry held here, so a ticker is in memory only once.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.indicators = cache.indicators
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def series(self, ticker, start, end, interval='1d'):
+        """The ``BarSeries`` of ``ticker``, rebuilt when its cache entry was rewritten."""
+        df, meta = self.cache.entry(ticker, start, end, interval, frame=False)
+        if meta is None or not meta['rows']:
+            return None
+        key = (ticker.upper(), interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None or not series.built_from(meta):
+                if df is None:
+                    df, meta = self.cache.entry(ticker, start, end, interval)
+                series = self._series[key] = BarSeries(df, meta['mtime'])
+        self.cache.release(ticker, interval)
+        return series
+
+    def history(self, ticker, start, end, interval='1d', fetch_start=None):
+        # With an earlier `fetch_start`, the cache is filled from there at once, so a later,
+        # longer time frame is a view of the same arrays instead of another download
+        series = self.series(ticker, min(start, fetch_start or start), end, interval)
+        return pd.DataFrame() if series is None else series.view(start, end)
+
+    def nbytes(self):
+        with self._lock:
+            return sum(s.nbytes for s in self._series.values())
@@ -0,0 +1,94 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from .data_sources import INTRADAY_STEPS, OHLCV_COLUMNS
+
+
+def with_retry(fn, retries=3, backoff=0.5):
+    # Call fn(), retrying failures with exponential backoff plus jitter
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def fetch_bars(source, tickers, start, end, interval='1d', max_workers=8, chunk_size=None,
+               retries=3, backoff=0.5, keep_empty=False):
+    """Fetch many tickers with bounded concurrency.
+
+    Tickers are split into chunks of ``chunk_size`` (the source's ``bulk_size`` by
+    default, i.e. one request per ticker unless the source supports bulk downloads)
+    and at most ``max_workers`` chunks are in flight at once. Returns
+    ``(frames, failed)``: a dict of ticker -> DataFrame and a dict of ticker -> error.
+    A ticker with no bars in the range is failed with ``'no data'``, unless ``keep_empty``
+    is set: then it gets an empty frame, which says the range was fetched and is empty.
+    A ticker a bulk request leaves out is fetched again on its own, with retries, so
+    its error (or its confirmation that there are no bars) comes from the source.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    chunk_size = chunk_size or getattr(source, 'bulk_size', 1)
+
+    def fetch_chunk(chunk):
+        if len(chunk) == 1:
+            return {chunk[0]: source.history(chunk[0], start, end, interval)}
+        return source.history_many(chunk, start, end, interval)
+
+    frames, failed = {}, {}
+
+    def run(pool, chunks):
+        futures = {pool.submit(with_retry, lambda c=chunk: fetch_chunk(c), retries, backoff): chunk
+                   for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                frames.update(future.result())
+            except Exception as exc:
+                failed.update({t: repr(exc) for t in futures[future]})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        run(pool, _chunks(tickers, chunk_size))
+        run(pool, [[t] for t in tickers if t not in frames and t not in failed])
+    # Empty results are how Yahoo reports unknown symbols
+    for ticker in tickers:
+        if ticker not in failed and frames[ticker].empty:
+            if keep_empty:
+                frames[ticker] = pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([]))
+            else:
+                frames.pop(ticker, None)
+                failed[ticker] = 'no data'
+    return {t: frames[t] for t in tickers if t in frames}, failed
+
+
+def to_wide(frames, interval='1d'):
+    """Combine per-ticker frames into one frame with (ticker, field) MultiIndex columns."""
+    if not frames:
+        return pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=['Ticker', 'Field']))
+    aligned = {}
+    for ticker, df in frames.items():
+        df = df.copy(deep=False)
+        if interval in INTRADAY_STEPS:
+            df.index = df.index.tz_convert('UTC')
+        else:
+            # Stocks are stamped at New York midnight and crypto at UTC midnight;
+            # compare them by calendar day
+            df.index = df.index.tz_localize(None).normalize()
+        aligned[ticker] = df
+    wide = pd.concat(aligned, axis=1, names=['Ticker', 'Field'])
+    return wide.sort_index()
+
+
+def fetch_many(source, tickers, start, end, interval='1d', **kwargs):
+    # One wide frame for a whole watchlist; tickers that could not be fetched are in .attrs['failed']
+    frames, failed = fetch_bars(source, tickers, start, end, interval, **kwargs)
+    wide = to_wide(frames, interval)
+    wide.attrs['failed'] = failed
+    return wide
@@ -0,0 +1,81 @@
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from .downsample import DEFAULT_WIDTH_PX, downsample_frame
+
+# Dark theme shared by every dashboard figure
+DARK_LAYOUT = dict(
+    template='plotly_dark',
+    paper_bgcolor='#161b22',
+    plot_bgcolor='#161b22',
+    font=dict(color='#c9d1d9'),
+)
+
+# (column, legend name, colour) of the price-panel traces
+PRICE_TRACES = [
+    ('Close', 'Close', 'cyan'),
+    ('MA50', '50-Day MA', 'magenta'),
+    ('MA200', '200-Day MA', 'yellow'),
+]
+
+
+def price_volume_figure(df, title, currency='', width_px=DEFAULT_WIDTH_PX):
+    """One figure with close + moving averages on top and volume below.
+
+    Both panels share the x-axis (zooming one zooms the other), Close is sent once,
+    traces use WebGL (``Scattergl``) and every series is downsampled to ``width_px``.
+    """
+    columns = [c for c, _, _ in PRICE_TRACES if c in df.columns] + ['Volume']
+    plot_df = downsample_frame(df, columns, width_px)
+    x = plot_df.index
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.04)
+    for column, name, color in PRICE_TRACES:
+        if column in plot_df.columns:
+            fig.add_trace(go.Scattergl(x=x, y=plot_df[column], mode='lines', name=name, line=dict(color=color)),
+                          row=1, col=1)
+    fig.add_trace(go.Scattergl(x=x, y=plot_df['Volume'], mode='lines', name='Volume', line=dict(color='orange')),
+                  row=2, col=1)
+    fig.update_layout(title=title, height=650, hovermode='x unified', **DARK_LAYOUT)
+    fig.update_yaxes(title_text=f'Price ({currency})' if currency else 'Price', row=1, col=1)
+    fig.update_yaxes(title_text='Volume', row=2, col=1)
+    fig.update_xaxes(title_text='Time', row=2, col=1)
+    return fig
+
+
+def lines_figure(frame, title, yaxis_title, width_px=DEFAULT_WIDTH_PX):
+    # One WebGL line per column of `frame` (e.g. rebased closes of a watchlist)
+    fig = go.Figure()
+    for column in frame.columns:
+        series = downsample_frame(frame[[column]].dropna(), [column], width_px)[column]
+        fig.add_trace(go.Scattergl(x=series.index, y=series, mode='lines', name=str(column)))
+    fig.update_layout(title=title, xaxis_title='Time', yaxis_title=yaxis_title, **DARK_LAYOUT)
+    return fig
+
+
+def heatmap_figure(matrix, title, zmin=-1.0, zmax=1.0):
+    # Square matrix (e.g. correlations) as a diverging heatmap, symbols on both axes
+    labels = [str(c) for c in matrix.columns]
+    fig = go.Figure(go.Heatmap(z=matrix.to_numpy(), x=labels, y=labels, zmin=zmin, zmax=zmax,
+                               colorscale='RdBu', reversescale=True, text=matrix.round(2).to_numpy(),
+                               texttemplate='%{text}' if len(labels) <= 20 else None))
+    fig.update_layout(title=title, yaxis_autorange='reversed', height=max(450, 22 * len(labels)), **DARK_LAYOUT)
+    return fig
+
+
+def forecast_figure(close, forecast, title, currency=''):
+    """Recent closes followed by the forecast mean and its confidence band.
+
+    ``forecast`` is a frame with ``mean``/``lower``/``upper`` columns indexed by future dates.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=close.index, y=close, mode='lines', name='Close', line=dict(color='cyan')))
+    fig.add_trace(go.Scatter(x=forecast.index, y=forecast['upper'], mode='lines', line=dict(width=0),
+                             showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=forecast.index, y=forecast['lower'], mode='lines', line=dict(width=0),
+                             fill='tonexty', fillcolor='rgba(255, 165, 0, 0.2)', name='95% band'))
+    fig.add_trace(go.Scatter(x=forecast.index, y=forecast['mean'], mode='lines', name='Forecast',
+                             line=dict(color='orange', dash='dash')))
+    fig.update_layout(title=title, xaxis_title='Time', yaxis_title=f'Price ({currency})' if currency else 'Price',
+                      hovermode='x unified', **DARK_LAYOUT)
+    return fig
@@ -0,0 +1,209 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .data_sources import is_crypto
+
+# Calendars returns can be aligned on (see aligned_returns)
+CALENDARS = ['trading', '24/7']
+
+
+def aligned_returns(closes, calendar='trading'):
+    """Simple returns of a watchlist's closes on one calendar shared by all symbols.
+
+    ``closes`` has one column per symbol on a calendar-day index, NaN where a symbol has
+    no bar (as from ``pipeline.watchlist_closes``). With ``'trading'`` the rows are the
+    days any stock traded: crypto's weekend and holiday moves fold into the next trading
+    day's return, so every return spans the same interval. With ``'24/7'`` every day is
+    a row and stocks are flat (zero return) when their market is closed. A symbol is NaN
+    before its first close.
+    """
+    if calendar not in CALENDARS:
+        raise ValueError(f'Unknown calendar: {calendar!r}')
+    filled = closes.ffill()
+    stocks = [c for c in closes.columns if not is_crypto(c)]
+    if calendar == 'trading' and stocks:
+        filled = filled[closes[stocks].notna().any(axis=1)]
+    values = filled.to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = values[1:] / values[:-1] - 1
+    return pd.DataFrame(returns, index=filled.index[1:], columns=filled.columns)
+
+
+def _pairwise(n, sx, sxx, sxy, min_periods):
+    # Covariance, and each series' variance over the rows it shares with the other, from
+    # pairwise sums: sx[i, j] is the sum of x_i over the rows where both i and j are valid
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = (sxy - sx * sx.T / n) / (n - 1)
+        var = (sxx - sx * sx / n) / (n - 1)
+    low = n < max(min_periods, 2)
+    cov[low] = np.nan
+    var[low] = np.nan
+    return cov, var
+
+
+def _corr(cov, var):
+    # var.T[i, j] is j's variance over the rows shared with i
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / np.sqrt(var * var.T)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def window_sums(rows):
+    """Pairwise ``(n, sx, sxx, sxy)`` sums of a block of return rows, as four matrix products.
+
+    NaNs are left out pair by pair, as ``DataFrame.cov`` and ``DataFrame.corr`` do.
+    """
+    rows = np.asarray(rows, dtype=np.float64)
+    valid = ~np.isnan(rows)
+    mask = valid.astype(np.float64)
+    x = np.where(valid, rows, 0.0)
+    return mask.T @ mask, x.T @ mask, (x * x).T @ mask, x.T @ x
+
+
+def pairwise_moments(returns, min_periods=2):
+    """``(cov, corr)`` frames of all columns of ``returns``, pairwise complete.
+
+    Matches ``returns.cov()`` / ``returns.corr()`` but costs four BLAS matrix products
+    instead of a Python loop over the pairs.
+    """
+    n, sx, sxx, sxy = window_sums(returns.to_numpy(dtype=np.float64))
+    cov, var = _pairwise(n, sx, sxx, sxy, min_periods)
+    columns = returns.columns
+    return (pd.DataFrame(cov, index=columns, columns=columns),
+            pd.DataFrame(_corr(cov, var), index=columns, columns=columns))
+
+
+def rolling_vs_benchmark(returns, benchmark, window, min_periods=None):
+    """Rolling covariance, correlation and beta of every column against ``benchmark``.
+
+    Returns a dict of frames shaped like ``returns``. Each statistic is a difference of
+    cumulative sums over all columns at once, so it costs a few passes over the matrix
+    whatever the number of symbols. Matches ``returns.rolling(window).corr(returns[b])``.
+    """
+    min_periods = window if min_periods is None else min_periods
+    x = returns.to_numpy(dtype=np.float64)
+    y = np.broadcast_to(returns[benchmark].to_numpy(dtype=np.float64)[:, None], x.shape)
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+
+    def windowed(a):
+        csum = np.cumsum(a, axis=0)
+        csum[window:] -= csum[:-window].copy()
+        return csum
+
+    n = windowed(valid.astype(np.float64))
+    sx, sy = windowed(x), windowed(y)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = (windowed(x * y) - sx * sy / n) / (n - 1)
+        var_x = (windowed(x * x) - sx * sx / n) / (n - 1)
+        var_y = (windowed(y * y) - sy * sy / n) / (n - 1)
+        stats = {'cov': cov, 'corr': np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0), 'beta': cov / var_y}
+    low = n < max(min_periods, 2)
+    return {k: pd.DataFrame(np.where(low, np.nan, v), index=returns.index, columns=returns.columns)
+            for k, v in stats.items()}
+
+
+class RollingMoments:
+    """Covariance and correlation of many return series over the last ``window`` rows.
+
+    Keeps pairwise sums of the window, so a new row costs a few rank-one updates (O(N^2)
+    for N series) instead of recomputing the window. NaNs are left out pair by pair, as
+    ``DataFrame.cov`` does. The sums are rebuilt from the buffer (four matrix products)
+    once per window to stop float drift, and whenever a block of rows is loaded at once.
+    """
+
+    def __init__(self, columns, window, min_periods=None):
+        self.columns = list(columns)
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.rows = deque(maxlen=window)
+        self.last = None
+        self._resum()
+
+    def _resum(self):
+        if self.rows:
+            self.n, self.sx, self.sxx, self.sxy = window_sums(np.array(self.rows))
+        else:
+            size = len(self.columns)
+            self.n, self.sx, self.sxx, self.sxy = (np.zeros((size, size)) for _ in range(4))
+        self.since_resum = 0
+
+    def _add(self, row, sign):
+        valid = ~np.isnan(row)
+        mask = valid.astype(np.float64)
+        x = np.where(valid, row, 0.0)
+        self.n += sign * np.outer(mask, mask)
+        self.sx += sign * np.outer(x, mask)
+        self.sxx += sign * np.outer(x * x, mask)
+        self.sxy += sign * np.outer(x, x)
+
+    def update(self, row):
+        row = np.asarray(row, dtype=np.float64)
+        if len(self.rows) == self.window:
+            self._add(self.rows[0], -1.0)
+        self.rows.append(row)
+        self._add(row, 1.0)
+        self.since_resum += 1
+        if self.since_resum >= self.window:
+            self._resum()
+
+    def extend(self, rows):
+        rows = np.asarray(rows, dtype=np.float64)
+        if len(rows) >= self.window // 4:
+            # Cheaper to rebuild the sums of the new window in one go
+            self.rows.extend(rows[-self.window:])
+            self._resum()
+        else:
+            for row in rows:
+                self.update(row)
+
+    def replace_last(self, row):
+        # Swap the newest row's contribution for a revised one (its bar was rewritten)
+        row = np.asarray(row, dtype=np.float64)
+        self._add(self.rows[-1], -1.0)
+        self.rows[-1] = row
+        self._add(row, 1.0)
+
+    def sync(self, returns):
+        """Feed the rows of ``returns`` newer than the last one seen; returns how many changed.
+
+        The last row seen is compared too: while its market is open a bar is rewritten
+        in place, so a revised return replaces the one already in the sums. ``returns``
+        must have this object's columns. Call it whenever new bars arrive.
+        """
+        if list(returns.columns) != self.columns:
+            raise ValueError('Columns do not match this RollingMoments')
+        changed = 0
+        if self.last is not None and self.rows and self.last in returns.index:
+            row = returns.loc[self.last].to_numpy(dtype=np.float64)
+            if not np.array_equal(row, self.rows[-1], equal_nan=True):
+                self.replace_last(row)
+                changed += 1
+        new = returns if self.last is None else returns[returns.index > self.last]
+        if len(new):
+            self.extend(new.to_numpy(dtype=np.float64))
+            self.last = new.index[-1]
+        return changed + len(new)
+
+    @property
+    def nbytes(self):
+        return 4 * self.n.nbytes + sum(row.nbytes for row in self.rows)
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def cov(self):
+        cov, _ = _pairwise(self.n, self.sx, self.sxx, self.sxy, self.min_periods)
+        return self._frame(cov)
+
+    def corr(self):
+        return self._frame(_corr(*_pairwise(self.n, self.sx, self.sxx, self.sxy, self.min_periods)))
+
+    def beta(self, benchmark):
+        # Slope of each series on `benchmark`, over the rows both have
+        cov, var = _pairwise(self.n, self.sx, self.sxx, self.sxy, self.min_periods)
+        j = self.columns.index(benchmark)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.Series(cov[:, j] / var.T[:, j], index=self.columns, name=f'beta vs {benchmark}')
@@ -0,0 +1,266 @@
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+
+# Bar length of each supported intraday interval
+INTRADAY_STEPS = {
+    '1m': pd.Timedelta(minutes=1),
+    '2m': pd.Timedelta(minutes=2),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '60m': pd.Timedelta(hours=1),
+    '90m': pd.Timedelta(minutes=90),
+    '1h': pd.Timedelta(hours=1),
+}
+# Nominal bar length of every interval, including those longer than a day
+BAR_STEPS = {**INTRADAY_STEPS, '1d': pd.Timedelta(days=1), '1wk': pd.Timedelta(weeks=1), '1mo': pd.Timedelta(days=30)}
+
+
+def is_crypto(ticker):
+    # Yahoo quotes crypto pairs as BASE-QUOTE (BTC-USD, ETH-EUR); they trade 24/7
+    return '-' in ticker
+
+
+def _bound(index, value):
+    # Turn a 'YYYY-MM-DD' string into a Timestamp comparable with the (possibly tz-aware) index
+    ts = pd.Timestamp(value)
+    if getattr(index, 'tz', None) is not None and ts.tzinfo is None:
+        ts = ts.tz_localize(index.tz)
+    return ts
+
+
+def slice_range(df, start, end):
+    # Rows in [start, end), matching yfinance's exclusive end date
+    if df.empty:
+        return df
+    lo = _bound(df.index, start)
+    hi = _bound(df.index, end)
+    return df[(df.index >= lo) & (df.index < hi)]
+
+
+def bar_bounds(index, start, end):
+    # Positions [lo, hi) of the rows of a sorted index in [start, end), for slicing without a copy
+    return index.searchsorted(_bound(index, start)), index.searchsorted(_bound(index, end))
+
+
+class DataSource:
+    """Something that can return OHLCV bars for a ticker.
+
+    ``history`` returns a DataFrame indexed by bar timestamp with the same columns
+    yfinance's ``Ticker.history(auto_adjust=True)`` produces, covering [start, end).
+    It raises when the request fails: an empty frame means the range has no bars.
+    ``history_many`` leaves out any ticker it cannot vouch for.
+    """
+
+    name = 'base'
+    # How many tickers one request can carry (see batch_fetch.fetch_bars)
+    bulk_size = 1
+
+    def history(self, ticker, start, end, interval='1d'):
+        raise NotImplementedError
+
+    def history_many(self, tickers, start, end, interval='1d'):
+        # Sources with a real bulk endpoint override this; returns {ticker: frame}
+        return {ticker: self.history(ticker, start, end, interval) for ticker in tickers}
+
+
+class YFinanceSource(DataSource):
+    name = 'yfinance'
+    bulk_size = 50
+
+    def history(self, ticker, start, end, interval='1d'):
+        # Imported here so offline sources work without yfinance installed
+        import yfinance as yf
+        from yfinance.exceptions import YFPricesMissingError
+        try:
+            # By default yfinance logs errors (network ones included) and returns an empty frame
+            return yf.Ticker(ticker).history(start=start, end=end, interval=interval, auto_adjust=True,
+                                             raise_errors=True)
+        except YFPricesMissingError:
+            # Yahoo answered, with no bars in the range
+            return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([]))
+
+    def history_many(self, tickers, start, end, interval='1d'):
+        # One yf.download call for the whole chunk instead of a request per ticker.
+        # yf.download catches each ticker's error and returns an empty frame for it, so
+        # empty results are left out: batch_fetch.fetch_bars refetches them one by one
+        import yfinance as yf
+        raw = yf.download(list(tickers), start=start, end=end, interval=interval, auto_adjust=True,
+                          actions=True, group_by='ticker', threads=False, progress=False)
+        if not isinstance(raw.columns, pd.MultiIndex):
+            frames = {tickers[0]: raw}
+        else:
+            frames = {t: raw[t].dropna(how='all') for t in tickers if t in raw.columns.get_level_values(0)}
+        return {t: df for t, df in frames.items() if not df.empty}
+
+
+class ReplaySource(DataSource):
+    """Replays bars previously saved with ``save_replay`` (Parquet or CSV files).
+
+    A ticker that was never recorded has no bars: its history is an empty frame.
+    """
+
+    name = 'replay'
+
+    def __init__(self, root):
+        self.root = root
+        self._frames = {}
+
+    def _path(self, ticker, interval, ext):
+        return os.path.join(self.root, f'{ticker.upper()}__{interval}.{ext}')
+
+    def _load(self, ticker, interval):
+        key = (ticker.upper(), interval)
+        if key not in self._frames:
+            parquet_path = self._path(ticker, interval, 'parquet')
+            csv_path = self._path(ticker, interval, 'csv')
+            if os.path.exists(parquet_path):
+                df = pd.read_parquet(parquet_path)
+            elif os.path.exists(csv_path):
+                df = pd.read_csv(csv_path, index_col=0)
+                df.index = pd.to_datetime(df.index, utc=True)
+            else:
+                # Like Yahoo for an unknown symbol: no bars (not cached, in case it is recorded later)
+                return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], tz='UTC'))
+            self._frames[key] = df.sort_index()
+        return self._frames[key]
+
+    def history(self, ticker, start, end, interval='1d'):
+        return slice_range(self._load(ticker, interval), start, end)
+
+
+def save_replay(df, root, ticker, interval='1d', fmt='parquet'):
+    # Record a frame (e.g. a live yfinance download) so ReplaySource can serve it later
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, f'{ticker.upper()}__{interval}.{fmt}')
+    if fmt == 'parquet':
+        df.to_parquet(path)
+    else:
+        df.to_csv(path)
+    return path
+
+
+class SyntheticSource(DataSource):
+    """Deterministic random-walk bars for any ticker, with no network access.
+
+    Daily closes follow a seeded random walk that starts at ``origin``, so the same
+    ticker always gets the same bars no matter which range is asked for (which keeps
+    incremental cache top-ups consistent). Intraday bars are a Brownian bridge between
+    consecutive daily closes, seeded per day, so they cost O(requested bars).
+    Stocks trade weekdays 09:30-16:00 New York time, crypto tickers trade 24/7.
+    """
+
+    name = 'synthetic'
+
+    def __init__(self, seed=0, origin='2000-01-01'):
+        self.seed = seed
+        self.origin = origin
+
+    def _rng(self, ticker, *extra):
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.upper().encode()), *extra])
+
+    def _daily(self, ticker, end):
+        crypto = is_crypto(ticker)
+        tz = 'UTC' if crypto else 'America/New_York'
+        index = pd.date_range(self.origin, end, inclusive='left', tz=tz, name='Date')
+        if not crypto:
+            # Weekdays only (filtering is much faster than pd.bdate_range)
+            index = index[index.dayofweek < 5]
+        n = len(index)
+        # Row i only depends on the first i rows of draws, so any prefix is stable
+        draws = self._rng(ticker).standard_normal((n, 5))
+        vol = 0.035 if crypto else 0.015
+        base = 20.0 + zlib.crc32(ticker.upper().encode()) % 480
+        close = base * np.exp(np.cumsum(0.0003 + vol * draws[:, 0]))
+        prev_close = np.concatenate(([base], close[:-1]))
+        open_ = prev_close * np.exp(0.25 * vol * draws[:, 1])
+        high = np.maximum(open_, close) * np.exp(0.5 * vol * np.abs(draws[:, 2]))
+        low = np.minimum(open_, close) * np.exp(-0.5 * vol * np.abs(draws[:, 3]))
+        volume = (1e6 * np.exp(0.4 * draws[:, 4])).astype(np.int64)
+        return pd.DataFrame({
+            'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+            'Dividends': 0.0, 'Stock Splits': 0.0,
+        }, index=index)
+
+    def _intraday(self, ticker, daily, interval):
+        step = INTRADAY_STEPS[interval]
+        crypto = is_crypto(ticker)
+        session_open = pd.Timedelta(0) if crypto else pd.Timedelta(hours=9, minutes=30)
+        session = pd.Timedelta(days=1) if crypto else pd.Timedelta(hours=6, minutes=30)
+        per_day = int(session // step)
+        if daily.empty or per_day == 0:
+            return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], tz=daily.index.tz, name='Datetime'))
+
+        days = len(daily)
+        step_code = int(step.total_seconds())
+        noise = np.stack([
+            self._rng(ticker, step_code, int(day.strftime('%Y%m%d'))).standard_normal((per_day, 2))
+            for day in daily.index
+        ])
+        # Brownian bridge in log space from the day's open to its close
+        k = np.arange(1, per_day + 1) / per_day
+        lo, lc = np.log(daily['Open'].to_numpy()), np.log(daily['Close'].to_numpy())
+        walk = np.cumsum(noise[:, :, 0], axis=1) / np.sqrt(per_day)
+        bridge = walk - k * walk[:, -1:]
+        sigma = np.abs(lc - lo)[:, None] + 0.002
+        log_path = lo[:, None] + (lc - lo)[:, None] * k + sigma * bridge
+        close = np.exp(log_path)
+        open_ = np.exp(np.concatenate([lo[:, None], log_path[:, :-1]], axis=1))
+        wiggle = np.exp(0.2 * sigma / np.sqrt(per_day) * np.abs(noise[:, :, 1]))
+        high = np.maximum(open_, close) * wiggle
+        low = np.minimum(open_, close) / wiggle
+        volume = np.repeat(daily['Volume'].to_numpy() // per_day, per_day).reshape(days, per_day)
+
+        index = (daily.index.repeat(per_day) + session_open
+                 + pd.to_timedelta(np.tile(np.arange(per_day), days) * step_code, unit='s'))
+        return pd.DataFrame({
+            'Open': open_.ravel(), 'High': high.ravel(), 'Low': low.ravel(), 'Close': close.ravel(),
+            'Volume': volume.ravel(), 'Dividends': 0.0, 'Stock Splits': 0.0,
+        }, index=index.rename('Datetime'))
+
+    def history(self, ticker, start, end, interval='1d'):
+        if interval != '1d' and interval not in INTRADAY_STEPS:
+            raise ValueError(f'SyntheticSource does not support interval {interval!r}')
+        daily = self._daily(ticker, end)
+        if interval == '1d':
+            return slice_range(daily, start, end)
+        return slice_range(self._intraday(ticker, slice_range(daily, start, end), interval), start, end)
+
+    def generate(self, ticker, n_bars, interval='1m', end=None):
+        # n_bars evenly spaced bars ending at `end`, for load tests that need millions of rows.
+        # Unlike history() this ignores trading sessions and is not range-consistent.
+        step = INTRADAY_STEPS.get(interval, pd.Timedelta(days=1))
+        end = pd.Timestamp(end or pd.Timestamp.now(tz='UTC').floor('D'))
+        index = pd.date_range(end=end - step, periods=n_bars, freq=step, name='Datetime')
+        draws = self._rng(ticker, n_bars).standard_normal((n_bars, 2))
+        base = 20.0 + zlib.crc32(ticker.upper().encode()) % 480
+        log_close = np.log(base) + np.cumsum(0.001 * draws[:, 0])
+        close = np.exp(log_close)
+        open_ = np.exp(np.concatenate(([log_close[0]], log_close[:-1])))
+        spread = np.exp(0.0005 * np.abs(draws[:, 1]))
+        return pd.DataFrame({
+            'Open': open_, 'High': np.maximum(open_, close) * spread, 'Low': np.minimum(open_, close) / spread,
+            'Close': close, 'Volume': np.full(n_bars, 1000, dtype=np.int64),
+            'Dividends': 0.0, 'Stock Splits': 0.0,
+        }, index=index)
+
+
+def get_source(spec=None):
+    """Build a data source from a spec string, defaulting to the DATA_SOURCE env var.
+
+    ``yfinance`` (default), ``synthetic`` / ``synthetic:<seed>`` or ``replay:<directory>``.
+    """
+    spec = spec or os.environ.get('DATA_SOURCE', 'yfinance')
+    kind, _, arg = spec.partition(':')
+    if kind == 'yfinance':
+        return YFinanceSource()
+    if kind == 'synthetic':
+        return SyntheticSource(seed=int(arg or 0))
+    if kind == 'replay':
+        return ReplaySource(arg or 'replay_data')
+    raise ValueError(f'Unknown data source {spec!r}')
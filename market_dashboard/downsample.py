@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Plot width the dashboards downsample for; Streamlit's main column is at most ~1200px wide
+DEFAULT_WIDTH_PX = 1200
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps out of ``len(y)``.
+
+    Always keeps the first and last point; each bucket in between contributes the
+    point forming the largest triangle with the previous pick and the next bucket's
+    average, which preserves peaks and troughs far better than striding.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+    # Bucket boundaries for the n - 2 inner points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average of every bucket, vectorized; the "next bucket" of the last bucket is the last point
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    picks = np.empty(n_out, dtype=np.int64)
+    picks[0], picks[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        picks[i + 1] = a
+    return picks
+
+
+def minmax_indices(y, n_out):
+    """Indices of the min and max of each of ``n_out // 2`` equal buckets (plus the ends).
+
+    This is the per-pixel min/max reduction: with two points per pixel column the
+    rendered line is visually identical to the full series.
+    """
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n_out >= n or n < 2 * buckets:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    size = n // buckets
+    body = y[:size * buckets].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = offsets + np.argmin(body, axis=1)
+    highs = offsets + np.argmax(body, axis=1)
+    return np.unique(np.concatenate(([0, n - 1], lows, highs, np.arange(size * buckets, n))))
+
+
+def downsample_frame(df, columns, width_px=DEFAULT_WIDTH_PX, method='lttb'):
+    """Rows of ``df`` worth drawing for ``columns`` on a chart ``width_px`` pixels wide.
+
+    Each column is reduced on its own (NaN rows skipped) and the union of the kept
+    rows is returned, so every trace built from the result is exact at the points it
+    shows. Frames that already fit are returned unchanged.
+    """
+    n_out = width_px if method == 'lttb' else 2 * width_px
+    if len(df) <= n_out:
+        return df
+    # Integer timestamps: tz-aware indexes would otherwise become object arrays
+    x = df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else df.index.to_numpy()
+    keep = []
+    for column in columns:
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy(dtype=np.float64)
+        rows = np.flatnonzero(~np.isnan(values))
+        if method == 'lttb':
+            picked = lttb_indices(x[rows], values[rows], n_out)
+        else:
+            picked = minmax_indices(values[rows], n_out)
+        keep.append(rows[picked])
+    if not keep:
+        return df
+    return df.iloc[np.unique(np.concatenate(keep))]
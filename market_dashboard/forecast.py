@@ -0,0 +1,338 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .data_sources import is_crypto
+from .instrumentation import log_event
+
+# Bump when the model or the artifact layout changes; artifacts of other versions are ignored
+MODEL_VERSION = 1
+
+# Default location of the stored models (override with MODEL_DIR)
+DEFAULT_MODEL_DIR = os.environ.get('MODEL_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'ohlcv', 'models'))
+
+# Bars ahead the dashboard forecasts, and how old a model may get before it is retrained
+FORECAST_HORIZON = 30
+RETRAIN_AFTER = pd.Timedelta(days=7)
+# Wait before training a ticker again after a failed fit or too short a history
+TRAIN_RETRY_AFTER = pd.Timedelta(minutes=30)
+
+
+def _as_array(close):
+    # Series.to_numpy is much cheaper than np.asarray(Series)
+    if hasattr(close, 'to_numpy'):
+        return close.to_numpy(dtype=np.float64)
+    return np.asarray(close, dtype=np.float64)
+
+
+def _right_aligned(closes, length):
+    # Last `length` non-NaN values of every series, right-aligned in one matrix (NaN padded)
+    out = np.full((len(closes), length), np.nan)
+    for i, close in enumerate(closes):
+        values = _as_array(close)
+        values = values[~np.isnan(values)][-length:]
+        if len(values):
+            out[i, length - len(values):] = values
+    return out
+
+
+class ARForecaster:
+    """Ridge-regularized AR(p) model of daily log returns.
+
+    The next return is a linear function of the last ``lags`` (demeaned) returns; prices
+    are forecast by iterating the model and compounding the returns, with a +/-1.96
+    sigma band that widens with sqrt(horizon). Parameters round-trip through
+    ``to_artifact``/``from_artifact``; forecasting only needs the last ``lags + 1``
+    closes, so a stored model keeps serving new bars until it is retrained.
+    """
+
+    kind = 'ar_ridge'
+
+    def __init__(self, lags=10, ridge=1e-2, window=1000):
+        self.lags = lags
+        self.ridge = ridge
+        # Most recent returns used for training
+        self.window = window
+        self.coef = None
+        self.mu = 0.0
+        self.sigma = 0.0
+        self.n_obs = 0
+        self.trained_through = None
+        self.trained_at = None
+        self._responses = None
+
+    def _response(self, horizon):
+        # Row h maps the current state (last `lags` demeaned returns) to the forecast step h + 1.
+        # The AR recursion is linear, so the whole path is one matrix product; row h is the
+        # first row of companion**(h + 1), computed once per model
+        if self._responses is None or len(self._responses) < horizon:
+            companion = np.eye(self.lags, k=-1)
+            companion[0] = self.coef
+            rows, power = [], companion
+            for _ in range(horizon):
+                rows.append(power[0])
+                power = companion @ power
+            self._responses = np.array(rows)
+        return self._responses[:horizon]
+
+    def fit(self, close):
+        models = fit_many({'_': close}, self.lags, self.ridge, self.window)
+        if '_' not in models:
+            raise ValueError(f'Need more than {2 * self.lags + 1} closes to fit')
+        self.__dict__.update(models['_'].__dict__)
+        return self
+
+    def forecast(self, close, horizon=FORECAST_HORIZON):
+        """Price path for the ``horizon`` bars after the last of ``close``.
+
+        Returns ``{'mean', 'lower', 'upper'}`` arrays of length ``horizon``.
+        """
+        if self.coef is None:
+            raise ValueError('Model is not fitted')
+        values = _as_array(close)
+        values = values[~np.isnan(values)][-(self.lags + 1):]
+        if len(values) < self.lags + 1:
+            raise ValueError(f'Need the last {self.lags + 1} closes to forecast')
+        # Demeaned returns, most recent first
+        state = (np.diff(np.log(values)) - self.mu)[::-1]
+        steps = self._response(horizon) @ state
+        log_path = np.log(values[-1]) + np.cumsum(steps + self.mu)
+        band = 1.96 * self.sigma * np.sqrt(np.arange(1, horizon + 1))
+        return {'mean': np.exp(log_path), 'lower': np.exp(log_path - band), 'upper': np.exp(log_path + band)}
+
+    def to_artifact(self):
+        return {
+            'kind': self.kind,
+            'version': MODEL_VERSION,
+            'params': {'lags': self.lags, 'ridge': self.ridge, 'window': self.window},
+            'coef': self.coef.tolist(),
+            'mu': self.mu,
+            'sigma': self.sigma,
+            'n_obs': self.n_obs,
+            'trained_through': self.trained_through,
+            'trained_at': self.trained_at,
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact):
+        model = cls(**artifact['params'])
+        model.coef = np.asarray(artifact['coef'], dtype=np.float64)
+        model.mu = artifact['mu']
+        model.sigma = artifact['sigma']
+        model.n_obs = artifact['n_obs']
+        model.trained_through = artifact['trained_through']
+        model.trained_at = artifact['trained_at']
+        return model
+
+
+def fit_many(closes, lags=10, ridge=1e-2, window=1000):
+    """Fit one ``ARForecaster`` per series of ``closes`` (a dict of ticker -> closes) at once.
+
+    The last ``window`` returns of every ticker go into one right-aligned matrix and all
+    normal equations are built with batched matmuls and solved in one batched
+    ``np.linalg.solve``. Tickers with too little history are left out of the result.
+    """
+    tickers = list(closes)
+    if not tickers:
+        return {}
+    prices = _right_aligned([closes[t] for t in tickers], window + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = np.diff(np.log(prices), axis=1)
+    mu = np.nanmean(np.where(np.isnan(returns).all(axis=1, keepdims=True), 0.0, returns), axis=1)
+    centered = returns - mu[:, None]
+
+    # Row t of X holds returns t-1 .. t-lags (most recent first); y is return t
+    X = sliding_window_view(centered[:, :-1], lags, axis=1)[:, :, ::-1]
+    y = centered[:, lags:]
+    valid = ~(np.isnan(X).any(axis=2) | np.isnan(y))
+    X = np.where(valid[:, :, None], X, 0.0)
+    y = np.where(valid, y, 0.0)
+    n_valid = valid.sum(axis=1)
+
+    # Batched matmuls (BLAS per ticker); einsum without optimize is an order of magnitude slower
+    Xt = X.transpose(0, 2, 1)
+    xtx = Xt @ X
+    xty = (Xt @ y[:, :, None])[:, :, 0]
+    # Ridge penalty scaled to the data so `ridge` means the same for every ticker
+    lam = ridge * np.trace(xtx, axis1=1, axis2=2) / lags + 1e-12
+    coef = np.linalg.solve(xtx + lam[:, None, None] * np.eye(lags), xty[:, :, None])[:, :, 0]
+    resid = (y - (X @ coef[:, :, None])[:, :, 0]) * valid
+    dof = np.maximum(n_valid - lags, 1)
+    sigma = np.sqrt((resid ** 2).sum(axis=1) / dof)
+
+    trained_at = time.time()
+    models = {}
+    for i, ticker in enumerate(tickers):
+        if n_valid[i] <= 2 * lags:
+            continue
+        model = ARForecaster(lags, ridge, window)
+        model.coef, model.mu, model.sigma = coef[i], float(mu[i]), float(sigma[i])
+        model.n_obs = int(n_valid[i])
+        model.trained_at = trained_at
+        close = closes[ticker]
+        if isinstance(close, pd.Series) and len(close):
+            model.trained_through = close.index[-1].isoformat()
+        models[ticker] = model
+    return models
+
+
+def future_index(last, horizon, ticker):
+    # Timestamps of the next `horizon` daily bars: weekdays for stocks, every day for crypto
+    last = pd.Timestamp(last)
+    freq = 'D' if is_crypto(ticker) else 'B'
+    return pd.date_range(last + pd.Timedelta(days=1), periods=horizon, freq=freq, name='Date')
+
+
+def is_stale(model, last_bar, max_age=RETRAIN_AFTER):
+    # A model is retrained once the data has moved `max_age` past what it was trained on
+    if model is None or model.trained_through is None:
+        return True
+    return pd.Timestamp(last_bar) - pd.Timestamp(model.trained_through) > max_age
+
+
+class ModelStore:
+    """Versioned forecast artifacts per ticker, as JSON files on disk.
+
+    Every training run writes ``<root>/<TICKER>/<kind>-v<MODEL_VERSION>-<trained_at>.json``
+    atomically; ``load`` returns the newest artifact of the current ``MODEL_VERSION`` and
+    only the newest ``keep`` are kept. Loaded models are cached in memory by path.
+    """
+
+    def __init__(self, root=None, keep=5):
+        self.root = root or DEFAULT_MODEL_DIR
+        self.keep = keep
+        self._loaded = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, ticker):
+        return os.path.join(self.root, ticker.upper().replace('/', '_').replace('^', '_'))
+
+    def versions(self, ticker, kind=ARForecaster.kind):
+        # Artifact paths of the current model version, oldest first
+        try:
+            names = os.listdir(self._dir(ticker))
+        except OSError:
+            return []
+        prefix = f'{kind}-v{MODEL_VERSION}-'
+        return [os.path.join(self._dir(ticker), n) for n in sorted(names) if n.startswith(prefix) and n.endswith('.json')]
+
+    def save(self, ticker, model):
+        directory = self._dir(ticker)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{model.kind}-v{MODEL_VERSION}-{int(model.trained_at * 1000):013d}.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(dict(model.to_artifact(), ticker=ticker.upper()), f)
+        os.replace(path + '.tmp', path)
+        for old in self.versions(ticker, model.kind)[:-self.keep]:
+            os.remove(old)
+        return path
+
+    def load(self, ticker, kind=ARForecaster.kind):
+        paths = self.versions(ticker, kind)
+        if not paths:
+            return None
+        with self._lock:
+            if paths[-1] not in self._loaded:
+                with open(paths[-1]) as f:
+                    self._loaded[paths[-1]] = ARForecaster.from_artifact(json.load(f))
+            return self._loaded[paths[-1]]
+
+
+def train_many(cache, store, tickers, start, end, **params):
+    """Fetch ``tickers`` through ``cache``, fit them in one batch and store the models.
+
+    Returns the list of tickers that got a new model.
+    """
+    frames = cache.history_many(tickers, start, end)
+    models = fit_many({t: f['Close'] for t, f in frames.items()}, **params)
+    for ticker, model in models.items():
+        store.save(ticker, model)
+    return list(models)
+
+
+class BackgroundTrainer:
+    """Trains models on a worker thread so a Streamlit rerun never waits for a fit.
+
+    ``submit`` is a no-op while the same ticker is already queued or training, and for
+    ``retry_after`` after its last fit failed or found too few bars, so a ticker without a
+    model is not refitted on every rerun.
+    """
+
+    def __init__(self, cache, store, max_workers=1, retry_after=TRAIN_RETRY_AFTER, clock=time.monotonic, **params):
+        self.cache = cache
+        self.store = store
+        self.params = params
+        self.retry_after = retry_after.total_seconds()
+        self.clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='forecast-train')
+        self._pending = set()
+        self._retry_at = {}
+        self._lock = threading.Lock()
+
+    def submit(self, ticker, start, end):
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker in self._pending or self._retry_at.get(ticker, 0) > self.clock():
+                return False
+            self._pending.add(ticker)
+        self._pool.submit(self._train, ticker, start, end)
+        return True
+
+    def pending(self, ticker):
+        with self._lock:
+            return ticker.upper() in self._pending
+
+    def _train(self, ticker, start, end):
+        t0 = self.clock()
+        try:
+            trained = train_many(self.cache, self.store, [ticker], start, end, **self.params)
+        except Exception as exc:
+            # Runs on the pool: nobody reads the future, so report the failure here
+            log_event('forecast_train_error', ticker=ticker, error=repr(exc))
+            trained = None
+        else:
+            if trained:
+                log_event('forecast_train', ticker=ticker, seconds=round(self.clock() - t0, 6))
+            else:
+                log_event('forecast_train_skipped', ticker=ticker, reason='not enough data')
+        finally:
+            with self._lock:
+                self._pending.discard(ticker)
+                if trained:
+                    self._retry_at.pop(ticker, None)
+                else:
+                    self._retry_at[ticker] = self.clock() + self.retry_after
+
+
+def main(argv=None):
+    # Offline trainer: python -m market_dashboard.forecast AAPL MSFT BTC-USD
+    from .pipeline import MAX_START, make_bar_cache
+
+    parser = argparse.ArgumentParser(description='Train forecast models and store them as artifacts.')
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--start', default=MAX_START)
+    parser.add_argument('--end', default=pd.Timestamp.today().strftime('%Y-%m-%d'))
+    parser.add_argument('--lags', type=int, default=10)
+    parser.add_argument('--ridge', type=float, default=1e-2)
+    parser.add_argument('--window', type=int, default=1000)
+    parser.add_argument('--model-dir', default=None)
+    args = parser.parse_args(argv)
+
+    store = ModelStore(args.model_dir)
+    tickers = [t.upper() for t in args.tickers]
+    trained = train_many(make_bar_cache(), store, tickers, args.start, args.end,
+                         lags=args.lags, ridge=args.ridge, window=args.window)
+    for ticker in tickers:
+        print(f"{ticker}: {store.versions(ticker)[-1] if ticker in trained else 'not enough data'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+CURRENCY_SYMBOLS = {'USD': '$', 'INR': '₹', 'EUR': '€', 'GBP': '£', 'JPY': '¥'}
+
+
+class MissingRatesError(LookupError):
+    """No exchange rates to convert with: the pair is unknown or its rates could not be fetched."""
+
+
+def fx_ticker(base, quote):
+    # Yahoo's symbol for the price of one unit of `base` in `quote`, e.g. USDINR=X
+    return f'{base}{quote}=X'
+
+
+def _calendar_days(index):
+    # Wall-clock calendar day of each timestamp, as naive datetime64 values
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    return index.normalize().to_numpy(dtype='datetime64[ns]')
+
+
+class FXRates:
+    """Daily FX rate series for any currency pair, cached like price history.
+
+    Rates are fetched through ``cache`` (an ``OHLCVCache``), so they are stored on disk
+    and only the missing tail is downloaded on later calls.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def rates(self, base, quote, start, end, strict=False):
+        """Close rate of base->quote per day in [start, end), as a Series (empty if unknown).
+
+        With ``strict=True`` a pair without rates raises ``MissingRatesError`` instead.
+        """
+        if base == quote:
+            return pd.Series(dtype=np.float64)
+        df = self.cache.history(fx_ticker(base, quote), start, end)
+        if not df.empty:
+            return df['Close']
+        # Some pairs are only quoted the other way round
+        df = self.cache.history(fx_ticker(quote, base), start, end)
+        if not df.empty:
+            return 1.0 / df['Close']
+        if strict:
+            raise MissingRatesError(f'No {base}->{quote} exchange rates from {start} to {end}')
+        return pd.Series(dtype=np.float64)
+
+
+def align_rates(rates, index):
+    """The rate in force for every bar of ``index``.
+
+    Each bar gets the latest rate dated on or before its calendar day (weekends and
+    holidays reuse the previous fixing); bars before the first fixing use the first.
+    """
+    rate_days = _calendar_days(rates.index)
+    pos = np.searchsorted(rate_days, _calendar_days(index), side='right') - 1
+    return rates.to_numpy(dtype=np.float64)[np.clip(pos, 0, len(rates) - 1)]
+
+
+def convert_ohlc(df, rates, columns=OHLC_COLUMNS, inplace=False):
+    """Convert price columns with a date-aligned rate series in one vectorized multiply.
+
+    ``rates`` may also be a plain number. With ``inplace=True`` the columns of ``df``
+    are replaced, otherwise a converted copy is returned. An empty ``rates`` series
+    raises ``MissingRatesError`` rather than returning the prices unconverted.
+    """
+    out = df if inplace else df.copy(deep=False)
+    columns = [c for c in columns if c in df.columns]
+    if np.isscalar(rates):
+        rate = float(rates)
+    elif df.empty:
+        return out
+    elif len(rates) == 0:
+        raise MissingRatesError('No exchange rates to convert with')
+    else:
+        rate = align_rates(rates, df.index)[:, None]
+    out[columns] = df[columns].to_numpy(dtype=np.float64) * rate
+    return out
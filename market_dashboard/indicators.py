@@ -0,0 +1,263 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .data_sources import INTRADAY_STEPS
+
+
+class RollingWindow:
+    """Rolling mean and sample std over the last ``window`` values, O(1) per update.
+
+    Matches ``Series.rolling(window).mean()`` / ``.std()``: NaN until the window is full.
+    Running sums are rebuilt from the buffer once per window to stop float drift.
+    """
+
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self._resum()
+
+    def _resum(self):
+        self.total = math.fsum(self.values)
+        self.total_sq = math.fsum(v * v for v in self.values)
+        self.since_resum = 0
+
+    def update(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+        self.since_resum += 1
+        if self.since_resum >= self.window:
+            self._resum()
+
+    @property
+    def mean(self):
+        if len(self.values) < self.window:
+            return np.nan
+        return self.total / self.window
+
+    @property
+    def std(self):
+        n = len(self.values)
+        if n < self.window or n < 2:
+            return np.nan
+        var = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class IndicatorEngine:
+    """Streaming MA / EMA / RSI / Bollinger state for one ticker.
+
+    ``compute`` fills whole columns at once (pandas rolling/ewm) and leaves the engine
+    holding the state after the last bar; ``update`` then advances it by one bar in
+    O(1). ``state``/``from_state`` round-trip through JSON so the state can be stored
+    next to cached history. Outputs match pandas:
+
+    - ``MA<w>``: ``close.rolling(w).mean()``
+    - ``EMA<s>``: ``close.ewm(span=s, adjust=False).mean()``
+    - ``RSI<p>``: Wilder RSI, ``ewm(alpha=1/p, adjust=False, min_periods=p)`` of gains/losses
+    - ``BB_MID``/``BB_UPPER``/``BB_LOWER``: ``rolling(w).mean() +/- k * rolling(w).std()``
+    """
+
+    def __init__(self, ma_windows=(50, 200), ema_spans=(12, 26), rsi_period=14, bb_window=20, bb_k=2.0):
+        self.ma_windows = tuple(ma_windows)
+        self.ema_spans = tuple(ema_spans)
+        self.rsi_period = rsi_period
+        self.bb_window = bb_window
+        self.bb_k = bb_k
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.prev_close = np.nan
+        self.mas = {w: RollingWindow(w) for w in self.ma_windows}
+        self.bb = RollingWindow(self.bb_window)
+        self.emas = {s: np.nan for s in self.ema_spans}
+        self.avg_gain = np.nan
+        self.avg_loss = np.nan
+        self.rsi_obs = 0
+
+    def config(self):
+        return {'ma_windows': list(self.ma_windows), 'ema_spans': list(self.ema_spans),
+                'rsi_period': self.rsi_period, 'bb_window': self.bb_window, 'bb_k': self.bb_k}
+
+    def fresh(self):
+        # A new, empty engine with the same settings
+        return IndicatorEngine(**self.config())
+
+    @property
+    def columns(self):
+        return ([f'MA{w}' for w in self.ma_windows] + [f'EMA{s}' for s in self.ema_spans]
+                + [f'RSI{self.rsi_period}', 'BB_MID', 'BB_UPPER', 'BB_LOWER'])
+
+    @property
+    def price_columns(self):
+        # Columns in price units, which must be converted along with OHLC (RSI is unitless)
+        return [c for c in self.columns if not c.startswith('RSI')]
+
+    @property
+    def lookback(self):
+        # Bars needed before an output is fully warmed up
+        return max(self.ma_windows + (self.bb_window, self.rsi_period + 1))
+
+    def _rsi(self):
+        if self.rsi_obs < self.rsi_period:
+            return np.nan
+        if self.avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    def update(self, close):
+        """Advance by one bar and return this bar's indicator values."""
+        close = float(close)
+        out = {}
+        for w, win in self.mas.items():
+            win.update(close)
+            out[f'MA{w}'] = win.mean
+        for s in self.ema_spans:
+            alpha = 2.0 / (s + 1)
+            prev = self.emas[s]
+            self.emas[s] = close if np.isnan(prev) else prev + alpha * (close - prev)
+            out[f'EMA{s}'] = self.emas[s]
+        if not np.isnan(self.prev_close):
+            delta = close - self.prev_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            if self.rsi_obs == 0:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                alpha = 1.0 / self.rsi_period
+                self.avg_gain += alpha * (gain - self.avg_gain)
+                self.avg_loss += alpha * (loss - self.avg_loss)
+            self.rsi_obs += 1
+        out[f'RSI{self.rsi_period}'] = self._rsi()
+        self.bb.update(close)
+        mid, std = self.bb.mean, self.bb.std
+        out['BB_MID'] = mid
+        out['BB_UPPER'] = mid + self.bb_k * std
+        out['BB_LOWER'] = mid - self.bb_k * std
+        self.prev_close = close
+        self.count += 1
+        return out
+
+    def compute(self, closes):
+        """Vectorized indicator columns for a whole close series.
+
+        Resets the engine first and leaves it holding the state after the last bar.
+        """
+        self._reset()
+        close = pd.Series(np.asarray(closes, dtype=np.float64))
+        out = {}
+        for w in self.ma_windows:
+            out[f'MA{w}'] = close.rolling(w).mean().to_numpy()
+        for s in self.ema_spans:
+            out[f'EMA{s}'] = close.ewm(span=s, adjust=False).mean().to_numpy()
+        delta = close.diff()
+        avg_gain = delta.clip(lower=0).ewm(alpha=1 / self.rsi_period, adjust=False).mean()
+        avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / self.rsi_period, adjust=False).mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        rsi[avg_loss == 0] = 100.0
+        rsi.iloc[:self.rsi_period] = np.nan
+        out[f'RSI{self.rsi_period}'] = rsi.to_numpy()
+        mid = close.rolling(self.bb_window).mean()
+        std = close.rolling(self.bb_window).std()
+        out['BB_MID'] = mid.to_numpy()
+        out['BB_UPPER'] = (mid + self.bb_k * std).to_numpy()
+        out['BB_LOWER'] = (mid - self.bb_k * std).to_numpy()
+
+        # Carry the tail of the series over as streaming state
+        n = len(close)
+        if n:
+            values = close.to_numpy()
+            self.count = n
+            self.prev_close = float(values[-1])
+            self.mas = {w: RollingWindow(w, values[-w:].tolist()) for w in self.ma_windows}
+            self.bb = RollingWindow(self.bb_window, values[-self.bb_window:].tolist())
+            self.emas = {s: float(out[f'EMA{s}'][-1]) for s in self.ema_spans}
+            self.rsi_obs = n - 1
+            if n > 1:
+                self.avg_gain = float(avg_gain.iloc[-1])
+                self.avg_loss = float(avg_loss.iloc[-1])
+        return out
+
+    def state(self):
+        return {
+            'config': self.config(),
+            'count': self.count,
+            'prev_close': self.prev_close,
+            'mas': {str(w): list(win.values) for w, win in self.mas.items()},
+            'bb': list(self.bb.values),
+            'emas': {str(s): v for s, v in self.emas.items()},
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'rsi_obs': self.rsi_obs,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        engine = cls(**state['config'])
+        engine.count = state['count']
+        engine.prev_close = state['prev_close']
+        engine.mas = {w: RollingWindow(w, state['mas'][str(w)]) for w in engine.ma_windows}
+        engine.bb = RollingWindow(engine.bb_window, state['bb'])
+        engine.emas = {s: state['emas'][str(s)] for s in engine.ema_spans}
+        engine.avg_gain = state['avg_gain']
+        engine.avg_loss = state['avg_loss']
+        engine.rsi_obs = state['rsi_obs']
+        return engine
+
+    def warmup_start(self, start, interval='1d'):
+        # Earliest date to fetch so indicators are warmed up by `start`
+        if interval in INTRADAY_STEPS:
+            bars_per_day = pd.Timedelta(hours=6, minutes=30) / INTRADAY_STEPS[interval]
+            days = math.ceil(self.lookback / max(bars_per_day, 1)) * 2 + 4
+        elif interval in ('1wk', '1mo'):
+            # Calendar bars: a week or (at most) 31 days each
+            days = self.lookback * (7 if interval == '1wk' else 31) + 31
+        else:
+            # ~252 trading days a year, plus slack for holidays
+            days = math.ceil(self.lookback * 365 / 252) + 10
+        return (pd.Timestamp(start) - pd.Timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+def update_frame(df, state, template):
+    """Fill ``template.columns`` for every row of ``df``.
+
+    When ``state`` is a checkpoint for a prefix of ``df`` (same settings, same bar at
+    the same position), only the bars after it are streamed through the engine;
+    otherwise all columns are recomputed vectorized. Returns ``(df, checkpoint)``,
+    where the checkpoint is the state *before* the last bar, because the last bar may
+    still be incomplete and get replaced by the next top-up.
+    """
+    n = len(df)
+    if n == 0:
+        return df, None
+    close = df['Close'].to_numpy(dtype=np.float64)
+
+    start = None
+    if state and state.get('config') == template.config() and all(c in df.columns for c in template.columns):
+        pos = state['count'] - 1
+        if 0 <= pos < n and df.index[pos] == pd.Timestamp(state['ts']):
+            engine = IndicatorEngine.from_state(state)
+            start = pos + 1
+            cols = {c: df[c].to_numpy(dtype=np.float64, copy=True) for c in template.columns}
+    if start is None:
+        # Bootstrap: vectorized over everything but the last bar, which is streamed below
+        engine = template.fresh()
+        start = n - 1
+        cols = {c: np.concatenate([v, [np.nan]]) for c, v in engine.compute(close[:-1]).items()}
+
+    checkpoint = state
+    for i in range(start, n):
+        if i == n - 1:
+            checkpoint = dict(engine.state(), ts=df.index[i - 1].isoformat() if i else None)
+        for c, v in engine.update(close[i]).items():
+            cols[c][i] = v
+    df = df.assign(**cols)
+    return df, checkpoint
@@ -0,0 +1,108 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Structured timing lines go to this logger, one JSON object per line
+logger = logging.getLogger('perf')
+
+
+def configure_logging(level=None):
+    # Send perf lines to stderr once per process; PERF_LOG_LEVEL=WARNING silences them
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level or os.environ.get('PERF_LOG_LEVEL', 'INFO'))
+    return logger
+
+
+def log_event(event, **fields):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({'ts': round(time.time(), 3), 'event': event, **fields}, default=str))
+
+
+class RunStats:
+    """Stage timers and counters for one run of a dashboard script (one Streamlit rerun).
+
+    ``stage`` (context manager) and ``timed`` (decorator) accumulate wall time per stage,
+    ``count`` adds to named counters and ``watch`` folds in how much an external counter
+    dict (e.g. ``OHLCVCache.counters``) grew during the run. With ``profile=True`` the
+    whole run is captured with cProfile. Each stage and the final summary are logged as
+    JSON lines through the ``perf`` logger.
+    """
+
+    def __init__(self, app, profile=False, clock=time.perf_counter):
+        self.app = app
+        self.clock = clock
+        self.started = clock()
+        self.timings = {}
+        self.counters = {}
+        self.profile_text = None
+        self._watched = []
+        self._profiler = cProfile.Profile() if profile else None
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    @contextmanager
+    def stage(self, name):
+        t0 = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - t0
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            log_event('stage', app=self.app, stage=name, seconds=round(elapsed, 6))
+
+    def timed(self, name=None):
+        # Decorator form of stage(); the stage defaults to the function's name
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or fn.__name__):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def count_frame(self, df):
+        # Rows and in-memory bytes of a frame the run processed
+        self.count('rows', len(df))
+        self.count('frame_bytes', int(df.memory_usage(index=True).sum()))
+
+    def watch(self, counters, prefix):
+        self._watched.append((prefix, counters, dict(counters)))
+
+    def finish(self, top=25):
+        """Stop profiling, collect watched counters, log and return the summary."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(top)
+            self.profile_text = out.getvalue()
+            self._profiler = None
+        for prefix, counters, before in self._watched:
+            for key, value in counters.items():
+                delta = value - before.get(key, 0)
+                if delta:
+                    self.count(f'{prefix}.{key}', delta)
+        self._watched = []
+        summary = self.summary()
+        log_event('run', **summary)
+        return summary
+
+    def summary(self):
+        return {
+            'app': self.app,
+            'total_seconds': round(self.clock() - self.started, 6),
+            'stages': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'counters': {k: round(v, 6) if isinstance(v, float) else v for k, v in self.counters.items()},
+        }
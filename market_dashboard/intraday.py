@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from .data_sources import BAR_STEPS, is_crypto, slice_range
+from .ohlcv_cache import DEFAULT_CACHE_DIR, _parquet_available
+
+# How many days back Yahoo serves each intraday interval, and the most days one request may span
+INTRADAY_LIMITS = {
+    '1m': (30, 7),
+    '2m': (60, 60),
+    '5m': (60, 60),
+    '15m': (60, 60),
+    '30m': (60, 60),
+    '90m': (60, 60),
+    '60m': (730, 730),
+    '1h': (730, 730),
+}
+
+# Rough number of bars loaded per page when paging through a long intraday range
+PAGE_BARS = 5000
+
+
+def _day(ts):
+    return ts.strftime('%Y-%m-%d')
+
+
+def calendar_days(start, end):
+    # Every date in [start, end) as 'YYYY-MM-DD'
+    return [_day(d) for d in pd.date_range(start, end, inclusive='left')]
+
+
+def lookback_start(interval, today=None):
+    # Oldest date the upstream still serves at `interval`
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.today()
+    return _day(today.normalize() - pd.Timedelta(days=INTRADAY_LIMITS[interval][0] - 1))
+
+
+def page_ranges(start, end, interval):
+    """Split [start, end) into whole-day pages of about ``PAGE_BARS`` bars each (oldest first).
+
+    Pages are aligned to ``end``, so only the oldest page can be short.
+    """
+    page_days = max(1, int(PAGE_BARS * BAR_STEPS[interval] / pd.Timedelta(days=1)))
+    days = calendar_days(start, end)
+    first = len(days) % page_days
+    bounds = days[first::page_days] + [end]
+    if first:
+        bounds.insert(0, days[0])
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _spans(days, max_days):
+    # Group sorted dates into runs at most `max_days` long, one request per run. A run bridges
+    # gaps of up to a weekend, so a stock week split by Saturday and Sunday is still one request
+    spans = []
+    for day in days:
+        ts = pd.Timestamp(day)
+        if spans and ts - spans[-1][1] <= pd.Timedelta(days=3) and (ts - spans[-1][0]).days < max_days:
+            spans[-1][1] = ts
+        else:
+            spans.append([ts, ts])
+    return [(_day(first), _day(last + pd.Timedelta(days=1))) for first, last in spans]
+
+
+class IntradayStore:
+    """On-disk intraday bars partitioned by ticker, interval and day.
+
+    Every (ticker, interval) has one file per trading day plus an ``index.json`` that
+    records, per calendar day, how many bars it holds and whether the day was over when
+    it was fetched. A range query reads only the partitions of the days it covers and
+    fetches only the days the index does not have yet (or that were still in progress),
+    in requests that respect the upstream's lookback and span limits.
+    """
+
+    def __init__(self, source, root=None):
+        self.source = source
+        # Next to the daily bar cache's directory, not inside it (OHLCVCache.clear empties that)
+        self.root = root or os.path.join(DEFAULT_CACHE_DIR, f'{source.name}-intraday')
+        self.fmt = 'parquet' if _parquet_available() else 'pkl'
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._indexes = {}
+        self.counters = {'hits': 0, 'misses': 0, 'rows_fetched': 0, 'partitions_read': 0, 'partitions_written': 0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self.counters[key] += value
+
+    def _dir(self, ticker, interval):
+        safe = ticker.upper().replace('/', '_').replace('^', '_')
+        return os.path.join(self.root, safe, interval)
+
+    def _key_lock(self, ticker, interval):
+        with self._lock:
+            return self._locks.setdefault((ticker.upper(), interval), threading.Lock())
+
+    def index(self, ticker, interval):
+        """``{'tz': ..., 'days': {day: {'rows': n, 'complete': bool}}}`` of one ticker and interval."""
+        key = (ticker.upper(), interval)
+        path = os.path.join(self._dir(ticker, interval), 'index.json')
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return {'tz': None, 'days': {}}
+        # Reuse the parsed index unless another process has rewritten it
+        if key in self._indexes and self._indexes[key][0] == mtime:
+            return self._indexes[key][1]
+        with open(path) as f:
+            index = json.load(f)
+        self._indexes[key] = (mtime, index)
+        return index
+
+    def _write_index(self, ticker, interval, index):
+        path = os.path.join(self._dir(ticker, interval), 'index.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(index, f)
+        os.replace(path + '.tmp', path)
+        self._indexes[(ticker.upper(), interval)] = (os.stat(path).st_mtime_ns, index)
+
+    def _write_partition(self, ticker, interval, day, df):
+        path = os.path.join(self._dir(ticker, interval), f'{day}.{self.fmt}')
+        if self.fmt == 'parquet':
+            df.to_parquet(path + '.tmp')
+        else:
+            df.to_pickle(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def _read_partitions(self, ticker, interval, days):
+        paths = [os.path.join(self._dir(ticker, interval), f'{day}.{self.fmt}') for day in days]
+        if not paths:
+            return pd.DataFrame()
+        if self.fmt == 'parquet':
+            # One multi-file read is much cheaper than a read_parquet call per partition
+            import pyarrow.parquet as pq
+
+            return pq.read_table(paths).to_pandas()
+        return pd.concat([pd.read_pickle(path) for path in paths])
+
+    def missing_days(self, ticker, interval, start, end, today=None):
+        # Days of [start, end) the index lacks or holds only partially, within the upstream's lookback.
+        # Stock weekends are never asked for on their own
+        days = self.index(ticker, interval)['days']
+        oldest = lookback_start(interval, today)
+        return [d for d in calendar_days(max(start, oldest), end)
+                if not days.get(d, {}).get('complete') and (is_crypto(ticker) or pd.Timestamp(d).dayofweek < 5)]
+
+    def _fetch(self, ticker, interval, missing):
+        index = self.index(ticker, interval)
+        index = {'tz': index['tz'], 'days': dict(index['days'])}
+        fetched_at = pd.Timestamp.now(tz='UTC')
+        os.makedirs(self._dir(ticker, interval), exist_ok=True)
+        for span_start, span_end in _spans(missing, INTRADAY_LIMITS[interval][1]):
+            df = self.source.history(ticker, span_start, span_end, interval)
+            if df is None or df.empty:
+                # Nothing at all usually means a failed request: leave the days to be retried
+                continue
+            self._count(rows_fetched=len(df))
+            tz = str(df.index.tz) if df.index.tz is not None else None
+            index['tz'] = index['tz'] or tz
+            by_day = {_day(day): part for day, part in df.groupby(df.index.normalize())}
+            for day in calendar_days(span_start, span_end):
+                part = by_day.get(day)
+                if part is not None:
+                    self._write_partition(ticker, interval, day, part)
+                    self._count(partitions_written=1)
+                # A day is final once it has ended (in the exchange's time zone) before the fetch
+                day_end = pd.Timestamp(day, tz=tz or 'UTC') + pd.Timedelta(days=1)
+                index['days'][day] = {'rows': 0 if part is None else len(part), 'complete': bool(day_end <= fetched_at)}
+        self._write_index(ticker, interval, index)
+
+    def history(self, ticker, start, end, interval='1m'):
+        """Bars of ``ticker`` in [start, end), read from the partitions of just those days."""
+        if interval not in INTRADAY_LIMITS:
+            raise ValueError(f'Not an intraday interval: {interval!r}')
+        with self._key_lock(ticker, interval):
+            missing = self.missing_days(ticker, interval, start, end)
+            self._count(**{'misses' if missing else 'hits': 1})
+            if missing:
+                self._fetch(ticker, interval, missing)
+            days = self.index(ticker, interval)['days']
+            wanted = [d for d in calendar_days(start, end) if days.get(d, {}).get('rows')]
+            df = self._read_partitions(ticker, interval, wanted)
+        self._count(partitions_read=len(wanted))
+        return slice_range(df, start, end)
+
+    def pages(self, ticker, start, end, interval='1m'):
+        # Stream a long range page by page; only one page of bars is in memory at a time
+        for page_start, page_end in page_ranges(start, end, interval):
+            yield self.history(ticker, page_start, page_end, interval)
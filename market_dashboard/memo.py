@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_size(value):
+    """Rough in-memory size of a cached value in bytes (frames, figures, dicts, arrays)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, np.ndarray) or hasattr(value, 'nbytes'):
+        # Arrays, and objects that report their own size (e.g. RollingMoments)
+        return int(value.nbytes)
+    if hasattr(value, 'data') and hasattr(value, 'layout'):
+        # Plotly figure: dominated by the trace arrays
+        size = 0
+        for trace in value.data:
+            for attr in ('x', 'y'):
+                arr = getattr(trace, attr, None)
+                if arr is not None:
+                    size += np.asarray(arr).nbytes
+        return size + 4096
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class MemoCache:
+    """Bounded LRU memo with per-entry TTLs, a memory cap and hit/miss counters.
+
+    Keys are tuples whose first element names the pipeline stage ('fetch', 'stats',
+    ...); counters are kept per stage. Entries are evicted least-recently-used first
+    whenever either ``max_entries`` or ``max_bytes`` would be exceeded.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=256 * 2**20, default_ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {}
+
+    def _count(self, key, event):
+        stage = key[0] if isinstance(key, tuple) and key else 'default'
+        stage_counters = self.counters.setdefault(stage, {'hits': 0, 'misses': 0})
+        stage_counters[event] = stage_counters.get(event, 0) + 1
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > self.clock()):
+                self._entries.move_to_end(key)
+                self._count(key, 'hits')
+                return entry[0]
+            if entry is not None:
+                self._drop(key)
+                self._count(key, 'expired')
+            self._count(key, 'misses')
+            return default
+
+    def put(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                # Too big to keep at all; the caller still gets its value
+                return value
+            while self._entries and (len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._count(oldest, 'evictions')
+            expires_at = self.clock() + ttl if ttl is not None else None
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+        return value
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, compute(), ttl)
+        return value
+
+    def invalidate(self, stage=None):
+        # Drop every entry, or only the entries of one pipeline stage
+        with self._lock:
+            for key in [k for k in self._entries if stage is None or (isinstance(k, tuple) and k[0] == stage)]:
+                self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            hits = sum(c.get('hits', 0) for c in self.counters.values())
+            misses = sum(c.get('misses', 0) for c in self.counters.values())
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'stages': {stage: dict(c) for stage, c in self.counters.items()},
+            }
@@ -0,0 +1,313 @@
+import importlib.util
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from .data_sources import DataSource, YFinanceSource, slice_range
+from .indicators import update_frame
+from .instrumentation import log_event
+
+# Corporate actions after which Yahoo back-adjusts every earlier price (bars are fetched with auto_adjust)
+ACTION_COLUMNS = ('Dividends', 'Stock Splits')
+
+# Default location of the on-disk bar cache (override with OHLCV_CACHE_DIR)
+DEFAULT_CACHE_DIR = os.environ.get('OHLCV_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'ohlcv'))
+# Wait before requesting a range again after the upstream answered it with no bars
+EMPTY_RETRY_AFTER = pd.Timedelta(minutes=15)
+
+
+def _new_actions(df, frames):
+    # Whether fetched bars from the cached range on carry a split or dividend the cached bars do not
+    columns = [c for c in ACTION_COLUMNS if c in df.columns]
+    for frame in frames:
+        frame = frame[frame.index >= df.index[0]]
+        cols = [c for c in columns if c in frame.columns]
+        if not cols or frame.empty:
+            continue
+        actions = frame[cols].fillna(0)
+        known = df[cols].reindex(frame.index).fillna(0)
+        if ((actions != 0) & (actions != known)).to_numpy().any():
+            return True
+    return False
+
+
+def _parquet_available():
+    # Checked without importing pyarrow, which pandas loads on the first parquet read
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+class OHLCVCache(DataSource):
+    """Columnar on-disk cache of OHLCV bars in front of another data source.
+
+    Bars are keyed by ticker and interval. Only the part of a requested
+    [start, end) range that has never been fetched is requested from ``source``;
+    everything else is read from disk. With ``indicators`` set, the cached frames
+    also carry that engine's columns (MA50, MA200, ...), and a top-up only streams
+    the new bars through the indicator state saved alongside them.
+
+    An empty answer is not taken as proof that a range has no bars: yfinance returns
+    an empty frame for many errors. It never creates an entry or extends its range;
+    the range is only left alone for ``empty_retry_after`` and then requested again.
+    """
+
+    name = 'cache'
+
+    def __init__(self, source=None, root=None, indicators=None, empty_retry_after=EMPTY_RETRY_AFTER,
+                 clock=time.monotonic):
+        self.source = source or YFinanceSource()
+        # Optional IndicatorEngine whose columns are kept up to date inside the cached frames
+        self.indicators = indicators
+        # Keep each upstream in its own directory so synthetic bars never mix with real ones
+        self.root = root or os.path.join(DEFAULT_CACHE_DIR, self.source.name)
+        self.fmt = 'parquet' if _parquet_available() else 'pkl'
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._frames = {}
+        # (ticker, interval) -> [(start, end, retry_at)] of ranges that came back empty
+        self._empty = {}
+        self.empty_retry_after = empty_retry_after.total_seconds()
+        self.clock = clock
+        # Running totals since start-up; hits are requests served without touching the source
+        self.counters = {'hits': 0, 'misses': 0, 'rows_fetched': 0, 'bytes_fetched': 0, 'indicator_seconds': 0.0}
+        os.makedirs(self.root, exist_ok=True)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self.counters[key] += value
+
+    def _path(self, ticker, interval):
+        safe = ticker.upper().replace('/', '_').replace('^', '_')
+        return os.path.join(self.root, f'{safe}__{interval}')
+
+    def _read(self, ticker, interval, frame=True):
+        # With frame=False the metadata is enough, and the frame is None if it was released
+        key = (ticker.upper(), interval)
+        path = self._path(ticker, interval)
+        try:
+            mtime = os.stat(path + '.json').st_mtime_ns
+        except OSError:
+            return None, None
+        # Reuse the in-memory copy unless another process has rewritten the entry
+        cached = self._frames.get(key)
+        if cached is not None and cached[1].get('mtime') == mtime and (cached[0] is not None or not frame):
+            return cached
+        try:
+            with open(path + '.json') as f:
+                meta = json.load(f)
+            if meta['format'] == 'parquet':
+                df = pd.read_parquet(path + '.parquet')
+            else:
+                df = pd.read_pickle(path + '.pkl')
+        except (OSError, ValueError, KeyError):
+            return None, None
+        meta['mtime'] = mtime
+        # Entries written before the last bar's day was recorded
+        meta.setdefault('last', df.index[-1].strftime('%Y-%m-%d') if len(df) else None)
+        self._frames[key] = (df, meta)
+        return df, meta
+
+    def _write(self, ticker, interval, df, meta):
+        path = self._path(ticker, interval)
+        meta = dict(meta, format=self.fmt, rows=len(df), last=df.index[-1].strftime('%Y-%m-%d') if len(df) else None)
+        # Write to temp files and rename so readers never see a half-written cache entry
+        data_path = f'{path}.{self.fmt}'
+        if self.fmt == 'parquet':
+            df.to_parquet(data_path + '.tmp')
+        else:
+            df.to_pickle(data_path + '.tmp')
+        os.replace(data_path + '.tmp', data_path)
+        with open(path + '.json.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + '.json.tmp', path + '.json')
+        meta['mtime'] = os.stat(path + '.json').st_mtime_ns
+        self._frames[(ticker.upper(), interval)] = (df, meta)
+
+    def _merge(self, parts):
+        parts = [p for p in parts if p is not None and not p.empty]
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts) if len(parts) > 1 else parts[0]
+        df = df[~df.index.duplicated(keep='last')]
+        return df.sort_index()
+
+    def _key_lock(self, ticker, interval):
+        # One lock per cache entry, so different tickers can be fetched concurrently
+        with self._lock:
+            return self._locks.setdefault((ticker.upper(), interval), threading.Lock())
+
+    def _plan(self, ticker, interval, meta, start, end):
+        # Ranges that still have to be fetched to cover [start, end)
+        if meta is None:
+            ranges = [(start, end)]
+        else:
+            ranges = []
+            if start < meta['start']:
+                ranges.append((start, meta['start']))
+            if end > meta['end']:
+                # Top up only the missing tail; refetch the last cached day because
+                # it may have been an incomplete (intraday) bar when it was stored
+                tail_start = min(meta['end'], meta['last']) if meta['last'] else meta['end']
+                ranges.append((tail_start, end))
+        # Skip ranges inside one that recently came back empty
+        now = self.clock()
+        with self._lock:
+            empty = self._empty.get((ticker.upper(), interval), [])
+            empty[:] = [e for e in empty if e[2] > now]
+        return [(s, e) for s, e in ranges if not any(es <= s and e <= ee for es, ee, _ in empty)]
+
+    def _commit(self, ticker, interval, parts):
+        # Merge freshly fetched ((start, end), frame) parts into whatever is cached now,
+        # persist and return it. Empty parts only hold their range back for a while
+        df, meta = self._read(ticker, interval)
+        fetched = [(rng, f) for rng, f in parts if f is not None and not f.empty]
+        retry_at = self.clock() + self.empty_retry_after
+        with self._lock:
+            self._empty.setdefault((ticker.upper(), interval), []).extend(
+                (s, e, retry_at) for (s, e), f in parts if f is None or f.empty)
+        if not fetched:
+            return pd.DataFrame() if df is None else df
+        starts = [s for (s, _), _ in fetched]
+        ends = [e for (_, e), _ in fetched]
+        if df is None:
+            meta = {'start': min(starts), 'end': max(ends)}
+        frames = [f for _, f in fetched]
+        new_meta = {'start': min(starts + [meta['start']]), 'end': max(ends + [meta['end']])}
+        if df is not None and not df.empty and _new_actions(df, frames):
+            # The new bars' split or dividend has changed every earlier adjusted price:
+            # refetch the whole range and recompute the indicators from scratch
+            try:
+                full = self.source.history(ticker, new_meta['start'], new_meta['end'], interval)
+            except Exception as exc:
+                full = None
+                log_event('cache_refetch_error', ticker=ticker, interval=interval, error=repr(exc))
+            if full is None or full.empty:
+                # Keep the cached bars consistent; the tail is fetched again next time
+                return df
+            log_event('cache_refetch', ticker=ticker, interval=interval, rows=len(full))
+            frames, df, meta = [full], None, dict(meta, indicators=None)
+        self._count(rows_fetched=sum(len(f) for f in frames),
+                    bytes_fetched=sum(int(f.memory_usage(index=True).sum()) for f in frames))
+        df = self._merge([df] + frames)
+        if self.indicators is not None:
+            # Stream only the new bars through the saved indicator state when possible
+            t0 = time.perf_counter()
+            df, new_meta['indicators'] = update_frame(df, meta.get('indicators'), self.indicators)
+            self._count(indicator_seconds=time.perf_counter() - t0)
+        self._write(ticker, interval, df, new_meta)
+        return df
+
+    def _fetch_start(self, start, interval):
+        # With indicators enabled, fetch enough extra history to warm them up by `start`
+        return self.indicators.warmup_start(start, interval) if self.indicators is not None else start
+
+    def entry(self, ticker, start, end, interval='1d', frame=True):
+        """The whole cached frame of ``ticker`` and its metadata, after topping it up to cover [start, end).
+
+        The frame is shared by every caller and must not be modified. The metadata's
+        ``mtime`` changes whenever the entry is rewritten. With ``frame=False`` the frame
+        is None if it was released, and is not read back from disk.
+        """
+        fetch_start = self._fetch_start(start, interval)
+        with self._key_lock(ticker, interval):
+            df, meta = self._read(ticker, interval, frame)
+            ranges = self._plan(ticker, interval, meta, fetch_start, end)
+            self._count(**{'misses' if ranges else 'hits': 1})
+            if ranges:
+                parts = [((s, e), self.source.history(ticker, s, e, interval)) for s, e in ranges]
+                self._commit(ticker, interval, parts)
+                df, meta = self._read(ticker, interval, frame)
+        return (pd.DataFrame(), None) if meta is None else (df, meta)
+
+    def release(self, ticker, interval='1d'):
+        """Drop the in-memory frame of an entry whose bars are held elsewhere (see ``BarStore``).
+
+        Its metadata is kept, so ``entry(..., frame=False)`` still answers without touching
+        the disk; the frame is read back from disk the next time it is needed.
+        """
+        key = (ticker.upper(), interval)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] is not None:
+                self._frames[key] = (None, cached[1])
+
+    def nbytes(self):
+        # Memory of the frames kept in memory (released entries hold only their metadata)
+        with self._lock:
+            frames = [df for df, _ in self._frames.values() if df is not None]
+        return sum(int(df.memory_usage(index=True).sum()) for df in frames)
+
+    def history(self, ticker, start, end, interval='1d'):
+        df, _ = self.entry(ticker, start, end, interval)
+        return slice_range(df, start, end)
+
+    def history_many(self, tickers, start, end, interval='1d', **fetch_kwargs):
+        # Tickers that need the same missing range are fetched together, in bulk and in
+        # parallel, so a warm watchlist costs one small tail request per group
+        from .batch_fetch import fetch_bars
+
+        fetch_start = self._fetch_start(start, interval)
+        groups, stale = {}, set()
+        for ticker in tickers:
+            _, meta = self._read(ticker, interval, frame=False)
+            for rng in self._plan(ticker, interval, meta, fetch_start, end):
+                groups.setdefault(rng, []).append(ticker)
+                stale.add(ticker)
+        self._count(hits=len(tickers) - len(stale), misses=len(stale))
+        fetched, failed = {}, set()
+        for (s, e), group in groups.items():
+            # Empty frames are kept: committing them holds the range back for a while,
+            # so it is not requested on every call
+            frames, errors = fetch_bars(self.source, group, s, e, interval, keep_empty=True, **fetch_kwargs)
+            failed.update(errors)
+            for ticker, frame in frames.items():
+                fetched.setdefault(ticker, []).append(((s, e), frame))
+        # A ticker with a failed range is left as cached, to be fetched again next time;
+        # one that is not cached at all is simply missing from the result
+        result = {}
+        for ticker in tickers:
+            with self._key_lock(ticker, interval):
+                if ticker in stale and ticker.upper() not in failed:
+                    df = self._commit(ticker, interval, fetched.get(ticker.upper(), []))
+                else:
+                    df, _ = self._read(ticker, interval)
+            df = slice_range(df, start, end) if df is not None else pd.DataFrame()
+            if not df.empty:
+                result[ticker] = df
+        return result
+
+    def refresh(self, ticker, interval='1d'):
+        """Refetch the newest cached day even if the entry already covers it.
+
+        While its market is open the last bar keeps changing, but ``history`` only tops up
+        once the requested end moves past the cached one. Returns False for a ticker that
+        is not cached yet (warm it with ``history`` first).
+        """
+        with self._key_lock(ticker, interval):
+            _, meta = self._read(ticker, interval, frame=False)
+            if meta is None or not meta['last']:
+                return False
+            start = meta['last']
+            end = max(meta['end'], (pd.Timestamp.today() + pd.Timedelta(days=1)).strftime('%Y-%m-%d'))
+            self._commit(ticker, interval, [((start, end), self.source.history(ticker, start, end, interval))])
+            return True
+
+    def clear(self, ticker=None, interval='1d'):
+        with self._lock:
+            if ticker is None:
+                self._frames.clear()
+                self._empty.clear()
+                names = os.listdir(self.root)
+            else:
+                self._frames.pop((ticker.upper(), interval), None)
+                self._empty.pop((ticker.upper(), interval), None)
+                base = os.path.basename(self._path(ticker, interval))
+                names = [n for n in os.listdir(self.root) if n.startswith(base + '.')]
+            # Only the cache's own files: anything else kept under the root is left alone
+            for name in names:
+                path = os.path.join(self.root, name)
+                if os.path.isfile(path):
+                    os.remove(path)
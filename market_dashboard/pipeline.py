@@ -0,0 +1,264 @@
+from datetime import datetime, timedelta
+
+# Nothing heavy at module level: pandas, plotly and yfinance are imported inside the
+# functions that need them, so importing the dashboard stays cheap on cold start.
+
+# Time frames offered in the sidebar and how many days back each one reaches
+TIME_FRAMES = ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', 'max']
+FRAME_DAYS = {'1d': 1, '5d': 5, '1mo': 30, '3mo': 3 * 30, '6mo': 6 * 30, '1y': 365, '2y': 2 * 365, '5y': 5 * 365}
+# First date of the 'max' time frame
+MAX_START = '2010-01-01'
+# Bar intervals offered in the sidebar. Weekly and monthly bars are derived from the daily ones;
+# intraday ones only reach back as far as the upstream serves them
+INTERVALS = ['1d', '1wk', '1mo', '1h', '30m', '15m', '5m', '1m']
+
+
+def frame_start(time_frame, today=None):
+    # First date (YYYY-MM-DD) of a sidebar time frame that ends today
+    if time_frame not in FRAME_DAYS:
+        return MAX_START
+    today = today or datetime.today()
+    return (today - timedelta(days=FRAME_DAYS[time_frame])).strftime('%Y-%m-%d')
+
+
+def frame_range(time_frame, today=None):
+    today = today or datetime.today()
+    return frame_start(time_frame, today), today.strftime('%Y-%m-%d')
+
+
+def intraday_range(time_frame, today=None):
+    # Like frame_range, but through the end of today: today's session is the one intraday users watch
+    today = today or datetime.today()
+    return frame_start(time_frame, today), (today + timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def interval_range(time_frame, interval, today=None):
+    # Date range of a time frame at `interval`: intraday views include today's session
+    if interval in ('1d', '1wk', '1mo'):
+        return frame_range(time_frame, today)
+    return intraday_range(time_frame, today)
+
+
+def interval_frames(interval):
+    # Time frames that can be shown at `interval`
+    if interval == '1d':
+        return TIME_FRAMES
+    if interval in ('1wk', '1mo'):
+        # At least a handful of weekly/monthly bars
+        min_days = 4 * (7 if interval == '1wk' else 30)
+        return [tf for tf in TIME_FRAMES if FRAME_DAYS.get(tf, float('inf')) >= min_days]
+    from .intraday import INTRADAY_LIMITS
+
+    return [tf for tf in TIME_FRAMES if FRAME_DAYS.get(tf, float('inf')) <= INTRADAY_LIMITS[interval][0]]
+
+
+def parse_tickers(text):
+    # Comma/newline separated symbols, upper-cased, duplicates dropped, order kept
+    return list(dict.fromkeys(t.strip().upper() for t in text.replace('\n', ',').split(',') if t.strip()))
+
+
+def data_version(df):
+    # Changes whenever a bar is added or the newest one is rewritten (a refresh while the
+    # market is open keeps the row count and timestamp but moves the close and volume)
+    return (len(df), str(df.index[-1]), float(df['Close'].iloc[-1]), float(df['Volume'].iloc[-1]))
+
+
+def make_bar_cache(source=None):
+    """Bar cache in front of ``source`` (default: DATA_SOURCE) that keeps indicator columns."""
+    from .data_sources import get_source
+    from .indicators import IndicatorEngine
+    from .ohlcv_cache import OHLCVCache
+
+    return OHLCVCache(source or get_source(), indicators=IndicatorEngine())
+
+
+def make_bar_store(cache):
+    # One compact copy of each ticker's bars per process; sessions get read-only views of it
+    from .bar_store import BarStore
+
+    return BarStore(cache)
+
+
+def make_fx_rates(source=None):
+    # Daily FX rates, cached on disk and topped up like price history (no indicator columns)
+    from .data_sources import get_source
+    from .fx import FXRates
+    from .ohlcv_cache import OHLCVCache
+
+    return FXRates(OHLCVCache(source or get_source()))
+
+
+def convert_currency(cache, fx_rates, ticker, start, end, quote, base='USD'):
+    """History of ``ticker`` in [start, end) converted from ``base`` to ``quote``.
+
+    Each bar is converted at the rate of its own day, not today's rate. With a rate that
+    varies by date MA(close * rate) != MA(close) * rate, so the warm-up bars are converted
+    too and the indicators recomputed over the converted closes. ``cache`` may also be a
+    ``BarStore``; its read-only views are never written to. Raises ``fx.MissingRatesError``
+    when there are no rates for the pair.
+    """
+    from .data_sources import slice_range
+    from .fx import convert_ohlc
+
+    frame = cache.history(ticker, cache.indicators.warmup_start(start), end)
+    if frame.empty:
+        return frame
+    # A week of slack so the first bar has a fixing on or before its day
+    rates_start = (frame.index[0] - timedelta(days=7)).strftime('%Y-%m-%d')
+    rates = fx_rates.rates(base, quote, rates_start, end, strict=True)
+    frame = convert_ohlc(frame, rates)
+    frame = frame.assign(**cache.indicators.fresh().compute(frame['Close']))
+    return slice_range(frame, start, end)
+
+
+def make_prefetcher(cache, fx_rates=None, currencies=()):
+    # Daemon thread that keeps the hot list (PREFETCH_TICKERS plus recently viewed tickers) warm
+    from .prefetch import Prefetcher
+
+    return Prefetcher(cache, fx_rates=fx_rates, currencies=currencies).start()
+
+
+def make_intraday_store(source=None):
+    # Intraday bars on disk, one partition per ticker, interval and day
+    from .data_sources import get_source
+    from .intraday import IntradayStore
+
+    return IntradayStore(source or get_source())
+
+
+def make_resampler(bar_store, intraday_store):
+    # Derives weekly/monthly bars from the daily ones and coarse intraday bars from stored finer ones
+    from .resample import Resampler
+
+    return Resampler(bar_store, intraday_store)
+
+
+def bar_page(source, fx_rates, ticker, start, end, interval, quote='USD', base='USD'):
+    """Bars of ``ticker`` at ``interval`` in [start, end) with indicator columns, in ``quote``.
+
+    ``source`` is a ``Resampler`` (or an ``IntradayStore``). Only the bars of the page and
+    those needed to warm up the indicators are read. Each bar is converted at its own
+    day's rate, before the indicators are computed. Raises ``fx.MissingRatesError`` when
+    there are no rates for the pair.
+    """
+    from .data_sources import slice_range
+    from .fx import convert_ohlc
+    from .indicators import IndicatorEngine
+
+    engine = IndicatorEngine()
+    frame = source.history(ticker, engine.warmup_start(start, interval), end, interval)
+    if frame.empty:
+        return frame
+    if quote != base:
+        rates_start = (frame.index[0] - timedelta(days=7)).strftime('%Y-%m-%d')
+        frame = convert_ohlc(frame, fx_rates.rates(base, quote, rates_start, end, strict=True))
+    frame = frame.assign(**engine.compute(frame['Close']))
+    return slice_range(frame, start, end)
+
+
+def zoom_frame(df, first_day, last_day):
+    # Rows of `df` from first_day through last_day (dates, inclusive)
+    from .data_sources import slice_range
+
+    return slice_range(df, first_day.isoformat(), (last_day + timedelta(days=1)).isoformat())
+
+
+def price_chart(df, title, currency=''):
+    from .charts import price_volume_figure
+
+    return price_volume_figure(df, title, currency)
+
+
+def watchlist_closes(cache, tickers, start, end):
+    """Fetch a watchlist in bulk; returns ``(closes, missing)``.
+
+    ``closes`` has one column per symbol that had data, ``missing`` lists the others.
+    """
+    from .batch_fetch import to_wide
+
+    frames = cache.history_many(tickers, start, end)
+    wide = to_wide(frames)
+    missing = [t for t in tickers if t not in frames]
+    closes = wide.xs('Close', axis=1, level='Field') if not wide.empty else wide
+    return closes, missing
+
+
+def relative_chart(closes):
+    # Every close series rebased to 100, so symbols with very different prices share one chart
+    from .charts import lines_figure
+
+    rebased = closes / closes.bfill().iloc[0] * 100
+    return lines_figure(rebased, 'Close Rebased to 100', 'Rebased Close')
+
+
+def make_correlations(closes, window, calendar='trading'):
+    # Rolling pairwise moments of a watchlist, to be kept and synced as new bars arrive
+    from .cross_asset import RollingMoments, aligned_returns
+
+    moments = RollingMoments(closes.columns, window, min_periods=window // 2)
+    moments.sync(aligned_returns(closes, calendar))
+    return moments
+
+
+def correlation_charts(moments, closes, benchmark, calendar='trading'):
+    """Sync ``moments`` with ``closes``; returns ``(betas, heatmap, rolling correlation figure)``.
+
+    Only returns newer than the last synced row are added to the pairwise sums.
+    """
+    from .charts import heatmap_figure, lines_figure
+    from .cross_asset import aligned_returns, rolling_vs_benchmark
+
+    returns = aligned_returns(closes, calendar)
+    moments.sync(returns)
+    window = moments.window
+    rolling = rolling_vs_benchmark(returns, benchmark, window, min_periods=window // 2)
+    heatmap = heatmap_figure(moments.corr(), f'Correlation of Returns, Last {window} Bars')
+    lines = lines_figure(rolling['corr'].drop(columns=benchmark), f'{window}-Bar Correlation with {benchmark}',
+                         'Correlation')
+    return moments.beta(benchmark).drop(benchmark), heatmap, lines
+
+
+def make_model_store(root=None):
+    from .forecast import ModelStore
+
+    return ModelStore(root)
+
+
+def make_trainer(cache, store):
+    # Background worker that fits forecast models off the request path
+    from .forecast import BackgroundTrainer
+
+    return BackgroundTrainer(cache, store)
+
+
+def forecast_chart(model, ticker, close, title, currency='', scale=1.0, history=250):
+    """Forecast figure for the bars after ``close`` from a stored model.
+
+    ``scale`` converts the model's prices (quoted in the source currency) for display; it
+    holds the latest exchange rate constant over the forecast horizon.
+    """
+    import pandas as pd
+
+    from .charts import forecast_figure
+    from .forecast import FORECAST_HORIZON, future_index
+
+    path = model.forecast(close, FORECAST_HORIZON)
+    forecast = pd.DataFrame(path, index=future_index(close.index[-1], FORECAST_HORIZON, ticker)) * scale
+    return forecast_figure(close.iloc[-history:] * scale, forecast, title, currency)
+
+
+def crossover_backtest(df, ticker, fast='MA50', slow='MA200'):
+    """Backtest of the crossover of two cached moving averages: ``(metrics, figure)``.
+
+    The figure compares the strategy's equity with buy and hold, both starting at 1.
+    """
+    import pandas as pd
+
+    from .backtest import backtest_frame, periods_per_year
+    from .charts import lines_figure
+
+    result = backtest_frame(df, fast, slow, periods=periods_per_year(ticker))
+    metrics = {k: result[k] for k in ('total_return', 'sharpe', 'max_drawdown', 'trades', 'exposure')}
+    metrics['buy_and_hold'] = float(result['buy_and_hold'].iloc[-1] - 1)
+    curves = pd.concat([result['equity'], result['buy_and_hold']], axis=1)
+    return metrics, lines_figure(curves, f'{ticker} {fast}/{slow} Crossover vs Buy & Hold', 'Growth of 1')
@@ -0,0 +1,210 @@
+import argparse
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from .data_sources import is_crypto
+from .instrumentation import configure_logging, log_event
+from .pipeline import frame_range, parse_tickers
+
+# Tickers kept warm even before anyone asks for them (override with PREFETCH_TICKERS)
+DEFAULT_HOT_TICKERS = parse_tickers(os.environ.get('PREFETCH_TICKERS', 'AAPL, BTC-USD'))
+# Seconds between refreshes while a ticker trades (override with PREFETCH_EVERY)
+REFRESH_EVERY = timedelta(seconds=int(os.environ.get('PREFETCH_EVERY', 300)))
+# How many recently requested tickers are kept warm on top of the hot list
+RECENT_TICKERS = 20
+# Wait before retrying a ticker whose refresh failed
+RETRY_AFTER = timedelta(minutes=1)
+
+# Regular US session. Holidays are not modelled; on those days the refreshes simply
+# fetch nothing new. Stocks keep refreshing for SETTLE after the close to pick up the final bar
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+SETTLE = timedelta(minutes=15)
+
+
+def _session(day):
+    # [open, close + SETTLE) of a trading day, as aware datetimes
+    opens = datetime.combine(day, MARKET_OPEN, MARKET_TZ)
+    return opens, datetime.combine(day, MARKET_CLOSE, MARKET_TZ) + SETTLE
+
+
+def is_trading(ticker, now):
+    """Whether ``ticker``'s latest bar may still change at ``now`` (an aware datetime)."""
+    if is_crypto(ticker):
+        return True
+    local = now.astimezone(MARKET_TZ)
+    opens, settles = _session(local.date())
+    return local.weekday() < 5 and opens <= local < settles
+
+
+def next_session_open(now):
+    day = now.astimezone(MARKET_TZ).date()
+    while True:
+        opens, _ = _session(day)
+        if day.weekday() < 5 and opens > now:
+            return opens
+        day += timedelta(days=1)
+
+
+def next_refresh(ticker, now, every=REFRESH_EVERY):
+    """When ``ticker`` should be refreshed next after a refresh at ``now``.
+
+    Crypto trades around the clock and stocks during their session: both refresh every
+    ``every``. A closed stock waits for the next open, or for local midnight, when the
+    dashboards' time frames move on by a day.
+    """
+    if is_trading(ticker, now):
+        return now + every
+    local = now.astimezone()
+    midnight = datetime.combine(local.date() + timedelta(days=1), time(0), local.tzinfo)
+    return min(next_session_open(now), midnight + timedelta(minutes=1))
+
+
+class Prefetcher:
+    """Keeps a hot list of tickers fresh in the bar cache on a daemon thread.
+
+    The hot list is ``tickers`` plus the last ``recent`` tickers passed to ``touch``. Each
+    refresh requests the 'max' time frame (so every shorter frame is a cache hit), re-reads
+    the latest bar while the ticker trades and, with ``fx_rates``, warms the FX rates that
+    convert stock prices into each of ``currencies``. Sessions then read the bars from the cache
+    instead of waiting on the upstream.
+    """
+
+    def __init__(self, cache, tickers=None, fx_rates=None, currencies=(), every=REFRESH_EVERY,
+                 recent=RECENT_TICKERS):
+        self.cache = cache
+        self.tickers = [t.upper() for t in (DEFAULT_HOT_TICKERS if tickers is None else tickers)]
+        self.fx_rates = fx_rates
+        self.currencies = list(currencies)
+        self.every = every
+        self.recent = recent
+        self.counters = {'refreshes': 0, 'errors': 0, 'seconds': 0.0}
+        self._recent = OrderedDict()
+        self._due = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def hot_list(self):
+        with self._lock:
+            return list(dict.fromkeys(self.tickers + list(self._recent)))
+
+    def touch(self, ticker):
+        # Record a ticker a user just asked for; a new one is warmed on the next pass
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker in self.tickers:
+                return
+            new = ticker not in self._recent
+            self._recent[ticker] = None
+            self._recent.move_to_end(ticker)
+            while len(self._recent) > self.recent:
+                dropped, _ = self._recent.popitem(last=False)
+                self._due.pop(dropped, None)
+        if new:
+            self._wake.set()
+
+    def _warm(self, ticker, now):
+        start, end = frame_range('max')
+        self.cache.history(ticker, start, end)
+        if is_trading(ticker, now):
+            self.cache.refresh(ticker)
+        if self.fx_rates is not None and not is_crypto(ticker):
+            # Warm the rates the dashboards convert with (from the indicator warm-up, with a week
+            # of slack); the conversion itself is cheap next to fetching them
+            warmup = self.cache.indicators.warmup_start(start) if self.cache.indicators is not None else start
+            rates_start = (pd.Timestamp(warmup) - timedelta(days=7)).strftime('%Y-%m-%d')
+            for quote in self.currencies:
+                self.fx_rates.rates('USD', quote, rates_start, end)
+
+    def run_once(self, now=None):
+        """Refresh every hot ticker that is due; returns the tickers refreshed."""
+        now = now or datetime.now(timezone.utc)
+        refreshed = []
+        for ticker in self.hot_list():
+            with self._lock:
+                due = self._due.get(ticker)
+            if due is not None and due > now:
+                continue
+            t0 = datetime.now(timezone.utc)
+            try:
+                self._warm(ticker, now)
+            except Exception as exc:
+                # One bad symbol or a flaky upstream must not stop the loop
+                self.counters['errors'] += 1
+                log_event('prefetch_error', ticker=ticker, error=repr(exc))
+                due = now + RETRY_AFTER
+            else:
+                seconds = (datetime.now(timezone.utc) - t0).total_seconds()
+                self.counters['refreshes'] += 1
+                self.counters['seconds'] += seconds
+                log_event('prefetch', ticker=ticker, seconds=round(seconds, 6))
+                refreshed.append(ticker)
+                due = next_refresh(ticker, now, self.every)
+            with self._lock:
+                self._due[ticker] = due
+        return refreshed
+
+    def next_due(self):
+        # Earliest scheduled refresh; tickers never refreshed are due now
+        tickers, now = self.hot_list(), datetime.now(timezone.utc)
+        with self._lock:
+            return min((self._due.get(t, now) for t in tickers), default=None)
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.run_once()
+            due = self.next_due()
+            # Wake up at the next due refresh (at least hourly), or as soon as a new ticker is touched
+            wait = 3600 if due is None else (due - datetime.now(timezone.utc)).total_seconds()
+            self._wake.wait(min(max(wait, 0), 3600))
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='prefetch', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main(argv=None):
+    # Standalone warmer writing into the same on-disk cache as the dashboards:
+    # python -m market_dashboard.prefetch AAPL MSFT BTC-USD --currencies INR
+    from .pipeline import make_bar_cache, make_fx_rates
+
+    parser = argparse.ArgumentParser(description='Keep popular tickers warm in the local bar cache.')
+    parser.add_argument('tickers', nargs='*', default=DEFAULT_HOT_TICKERS)
+    parser.add_argument('--currencies', nargs='*', default=[], help='also warm the FX rates into these')
+    parser.add_argument('--every', type=int, default=int(REFRESH_EVERY.total_seconds()), help='seconds')
+    parser.add_argument('--once', action='store_true', help='refresh everything once and exit')
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    prefetcher = Prefetcher(make_bar_cache(), [t.upper() for t in args.tickers],
+                            fx_rates=make_fx_rates() if args.currencies else None,
+                            currencies=args.currencies, every=timedelta(seconds=args.every))
+    if args.once:
+        print(f"refreshed: {', '.join(prefetcher.run_once()) or 'nothing'}")
+        return
+    try:
+        prefetcher.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
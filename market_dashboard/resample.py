@@ -0,0 +1,167 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .data_sources import BAR_STEPS, INTRADAY_STEPS, is_crypto
+from .memo import MemoCache
+
+# Intervals derived from daily bars rather than fetched
+CALENDAR_INTERVALS = ['1wk', '1mo']
+
+# How each cached column is aggregated; fmax/fmin skip NaNs
+AGGREGATIONS = {
+    'Open': 'first',
+    'High': np.fmax,
+    'Low': np.fmin,
+    'Close': 'last',
+    'Volume': np.add,
+    'Dividends': np.add,
+    'Stock Splits': 'split',
+}
+
+
+def _run_starts(values):
+    # Positions where a sorted array changes value, 0 included
+    change = np.empty(len(values), dtype=bool)
+    change[0] = True
+    np.not_equal(values[1:], values[:-1], out=change[1:])
+    return np.flatnonzero(change)
+
+
+def _spread(values, starts, n):
+    # Each run's value repeated over the run
+    return np.repeat(values, np.diff(starts, append=n))
+
+
+def _wall_ticks(index):
+    # Local wall-clock int64 times of a sorted index in its own unit. UTC offsets change only
+    # on the hour, so one tz conversion per distinct hour is enough (tz_localize(None) of
+    # millions of minute bars costs more than all of the aggregation)
+    ticks = index.asi8
+    if index.tz is None:
+        return ticks
+    hour = int(pd.Timedelta(hours=1) / pd.Timedelta(1, index.unit))
+    starts = _run_starts(ticks // hour)
+    sample = index[starts]
+    return ticks + _spread(sample.tz_localize(None).asi8 - sample.asi8, starts, len(ticks))
+
+
+def bucket_starts(index, interval):
+    """Start of the ``interval`` bar each timestamp of a sorted index falls into.
+
+    Returned as int64 wall-clock times in the index's own unit. Days, weeks (Monday) and
+    months start at local midnight. Intraday bars are anchored at each day's first bar,
+    the session open for stocks and midnight for crypto, as Yahoo labels them (a stock's
+    1h bars start at 9:30, 10:30, ...).
+    """
+    # Work in the index's unit: converting millions of timestamps to ns costs more than the rest
+    unit = index.unit
+    ticks = _wall_ticks(index)
+    day = int(pd.Timedelta(days=1) / pd.Timedelta(1, unit))
+    days = ticks // day * day
+    if interval == '1d':
+        return days
+    if interval == '1wk':
+        # 1970-01-01 was a Thursday: (days since epoch + 3) % 7 is 0 on Mondays
+        return days - (days // day + 3) % 7 * day
+    if interval == '1mo':
+        return ticks.astype(f'M8[{unit}]').astype('M8[M]').astype(f'M8[{unit}]').astype(np.int64)
+    step = int(INTRADAY_STEPS[interval] / pd.Timedelta(1, unit))
+    starts = _run_starts(days)
+    first = _spread(ticks[starts], starts, len(ticks))
+    return first + (ticks - first) // step * step
+
+
+def resample_ohlcv(df, interval):
+    """Aggregate sorted bars into ``interval`` bars in one vectorized pass.
+
+    Open is the first open, High the highest high, Low the lowest low, Close the last
+    close and Volume (and Dividends) the sum of each bucket; split ratios multiply. Rows
+    without a close are skipped and indicator columns dropped (recompute them on the
+    coarser bars).
+    """
+    df = df[df['Close'].notna()] if df['Close'].hasnans else df
+    if df.empty:
+        return df[[c for c in df.columns if c in AGGREGATIONS]]
+    buckets = bucket_starts(df.index, interval)
+    starts = _run_starts(buckets)
+    ends = np.append(starts[1:], len(buckets)) - 1
+    out = {}
+    for column, how in AGGREGATIONS.items():
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy()
+        if how == 'first':
+            out[column] = values[starts]
+        elif how == 'last':
+            out[column] = values[ends]
+        elif how == 'split':
+            ratio = np.multiply.reduceat(np.where(values == 0, 1, values), starts)
+            out[column] = np.where(ratio == 1, 0, ratio)
+        else:
+            out[column] = how.reduceat(values, starts)
+    index = pd.DatetimeIndex(buckets[starts].astype(f'M8[{df.index.unit}]'), name=df.index.name)
+    if df.index.tz is not None:
+        index = index.tz_localize(df.index.tz)
+    return pd.DataFrame(out, index=index)
+
+
+def finer_intervals(interval):
+    # Intraday intervals whose bars tile `interval`'s bars, coarsest first
+    step = BAR_STEPS[interval]
+    return sorted((i for i, s in INTRADAY_STEPS.items() if s < step and step % s == pd.Timedelta(0) and i != '60m'),
+                  key=INTRADAY_STEPS.get, reverse=True)
+
+
+class Resampler:
+    """Serves any interval from the bars that are already cached, when it can.
+
+    Weekly and monthly bars are always derived from the daily bar store. An intraday
+    interval is derived from a finer one whose day partitions already cover the range
+    (5m from stored 1m, 1h from stored 5m, ...) and fetched only when none does.
+    Derived frames are memoized per (ticker, interval, range) and source data version.
+    """
+
+    def __init__(self, daily, intraday, max_entries=64, max_bytes=64 * 2**20):
+        self.daily = daily
+        self.intraday = intraday
+        self.memo = MemoCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.counters = {'derived': 0, 'direct': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def source_interval(self, ticker, start, end, interval):
+        """The interval ``history`` would read to serve ``interval`` over [start, end)."""
+        if interval in CALENDAR_INTERVALS:
+            return '1d'
+        if interval == '1d':
+            return interval
+        # Every trading day of the range must have been stored at the finer interval
+        wanted = [d.strftime('%Y-%m-%d') for d in pd.date_range(start, end, inclusive='left')
+                  if is_crypto(ticker) or d.dayofweek < 5]
+        for finer in finer_intervals(interval):
+            days = self.intraday.index(ticker, finer)['days']
+            if wanted and all(d in days for d in wanted):
+                return finer
+        return interval
+
+    def history(self, ticker, start, end, interval):
+        source = self.source_interval(ticker, start, end, interval)
+        if source == '1d':
+            bars = self.daily.history(ticker, start, end)
+        else:
+            bars = self.intraday.history(ticker, start, end, source)
+        if source == interval:
+            self._count('direct')
+            return bars
+        self._count('derived')
+        if bars.empty:
+            return bars
+        # Any new or changed bar changes the version, so a derived frame is never stale
+        version = (len(bars), bars.index[-1], float(bars['Close'].iloc[-1]), float(bars['Volume'].iloc[-1]))
+        return self.memo.get_or_compute(('resample', ticker.upper(), interval, source, start, end, version),
+                                        lambda: resample_ohlcv(bars, interval))
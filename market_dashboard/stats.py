@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+# Keys of the summary-statistics dict, in the order the dashboards display them
+STAT_KEYS = ['max', 'min', 'mean', 'median', 'p25', 'p75', 'std', 'pct_change']
+
+STAT_LABELS = {
+    'max': 'Highest Closing Price',
+    'min': 'Lowest Closing Price',
+    'mean': 'Average Closing Price',
+    'median': 'Median Closing Price',
+    'p25': '25th Percentile',
+    'p75': '75th Percentile',
+    'std': 'Standard Deviation',
+    'pct_change': 'Average Percentage Change',
+}
+
+_QUANTILES = {'p25': 0.25, 'median': 0.5, 'p75': 0.75}
+
+
+def _positions(n, q):
+    # Linear interpolation between order statistics, same as pandas' default quantile
+    pos = q * (n - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, np.maximum(n - 1, 0))
+    return lo, hi, pos - lo
+
+
+def _ffill_index(valid):
+    # Row index of the last valid value at or before each row (0 before the first one)
+    idx = np.where(valid, np.arange(valid.shape[0]).reshape(-1, *([1] * (valid.ndim - 1))), 0)
+    return np.maximum.accumulate(idx, axis=0)
+
+
+def _mean_pct_change(values, valid):
+    # Mean % change between consecutive valid values; gaps are skipped, like
+    # close.dropna().pct_change().mean() * 100
+    if values.shape[0] < 2:
+        return np.full(values.shape[1:], np.nan)
+    if values.ndim == 1 and valid.all():
+        # No gaps: plain consecutive ratios, without the forward-fill gather
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.mean(values[1:] / values[:-1]) - 1) * 100
+    prev_idx = _ffill_index(valid)[:-1]
+    if values.ndim == 1:
+        prev = values[prev_idx]
+    else:
+        prev = np.take_along_axis(values, prev_idx, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = values[1:] / prev - 1
+        ok = valid[1:] & ~np.isnan(change)
+        return np.where(ok, change, 0.0).sum(axis=0) / ok.sum(axis=0) * 100
+
+
+def summary_stats(close):
+    """The eight dashboard statistics of one close series, from a single partition.
+
+    Returns a dict keyed by ``STAT_KEYS``. NaNs are ignored, as pandas does.
+    """
+    values = np.asarray(close, dtype=np.float64)
+    valid = ~np.isnan(values)
+    data = values if valid.all() else values[valid]
+    n = data.size
+    if n == 0:
+        return {key: np.nan for key in STAT_KEYS}
+
+    # One partition places min, max and every order statistic the quantiles need
+    bounds = {key: _positions(n, q) for key, q in _QUANTILES.items()}
+    kth = sorted({0, n - 1} | {int(i) for lo, hi, _ in bounds.values() for i in (lo, hi)})
+    part = np.partition(data, kth)
+
+    stats = {'max': part[n - 1], 'min': part[0], 'mean': data.mean(),
+             'std': data.std(ddof=1) if n > 1 else np.nan}
+    for key, (lo, hi, frac) in bounds.items():
+        stats[key] = part[lo] + (part[hi] - part[lo]) * frac
+    stats['pct_change'] = _mean_pct_change(values, valid)
+    return {key: float(stats[key]) for key in STAT_KEYS}
+
+
+def summary_stats_matrix(closes):
+    """Column-wise summary statistics of a (bars x tickers) close matrix, from one sort.
+
+    Columns may contain NaN gaps (e.g. stocks on days only crypto trades). Returns a
+    dict keyed by ``STAT_KEYS`` of arrays with one value per column.
+    """
+    values = np.asarray(closes, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=0)
+    cols = values.shape[1]
+    # NaNs sort to the end, so the first n[c] rows of each column are its sorted values
+    ordered = np.sort(values, axis=0)
+    has_data = n > 0
+    last = np.maximum(n - 1, 0)
+
+    stats = {}
+    rows = np.arange(cols)
+    stats['max'] = np.where(has_data, ordered[last, rows], np.nan)
+    stats['min'] = np.where(has_data, ordered[0, rows], np.nan)
+    for key, q in _QUANTILES.items():
+        lo, hi, frac = _positions(np.maximum(n, 1), q)
+        value = ordered[lo, rows] + (ordered[hi, rows] - ordered[lo, rows]) * frac
+        stats[key] = np.where(has_data, value, np.nan)
+
+    filled = np.where(valid, values, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = filled.sum(axis=0) / n
+        centered = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((centered * centered).sum(axis=0) / (n - 1))
+    stats['mean'] = np.where(has_data, mean, np.nan)
+    stats['std'] = np.where(n > 1, std, np.nan)
+    stats['pct_change'] = _mean_pct_change(values, valid)
+    return {key: stats[key] for key in STAT_KEYS}
+
+
+def summary_table(closes):
+    # Watchlist stats table: one row per ticker column of `closes`, labelled for display
+    stats = summary_stats_matrix(closes.to_numpy(dtype=np.float64))
+    return pd.DataFrame({STAT_LABELS[key]: stats[key] for key in STAT_KEYS}, index=closes.columns)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from market_dashboard.backtest import walk_forward
+
+
+def test_walk_forward_pairs_folds_with_their_own_bars_after_a_skipped_fold():
+    rng = np.random.default_rng(0)
+    walk = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+    # Prices held flat in the middle: every pair scores NaN on a flat training window
+    close = np.concatenate([walk, np.full(300, walk[-1]), walk[-1] / walk[0] * walk])
+    result = walk_forward(close, [5, 10], [20, 40], train_bars=200, test_bars=50)
+
+    starts = result['folds']['start'].tolist()
+    assert any(b - a > 50 for a, b in zip(starts, starts[1:]))
+
+    returns = pd.Series(close).pct_change().fillna(0).to_numpy()
+    expected, bars = [], []
+    for fold in result['folds'].itertuples():
+        fast = pd.Series(close).rolling(fold.fast).mean()
+        slow = pd.Series(close).rolling(fold.slow).mean()
+        positions = (fast > slow).astype(float).shift(1).fillna(0).to_numpy()
+        test = slice(fold.start, min(fold.start + 50, len(close)))
+        expected.append(positions[test] * returns[test])
+        bars.append(np.arange(test.start, test.stop))
+    np.testing.assert_allclose(result['returns'], np.concatenate(expected), atol=1e-12)
+    np.testing.assert_array_equal(result['bars'], np.concatenate(bars))
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from market_dashboard.batch_fetch import fetch_bars
+from market_dashboard.data_sources import SyntheticSource
+from market_dashboard.ohlcv_cache import OHLCVCache
+
+
+class DroppingBulkSource(SyntheticSource):
+    """A bulk source that leaves ``dropped`` out of every bulk answer, as yf.download does
+    for a ticker whose request failed. Fetched on its own, that ticker raises ``failures``
+    times and then returns its bars."""
+
+    name = 'dropping'
+    bulk_size = 50
+
+    def __init__(self, dropped, failures=0):
+        super().__init__()
+        self.dropped = dropped
+        self.failures = failures
+        self.single_calls = 0
+
+    def history(self, ticker, start, end, interval='1d'):
+        if ticker == self.dropped:
+            self.single_calls += 1
+            if self.single_calls <= self.failures:
+                raise ConnectionError('rate limited')
+        return super().history(ticker, start, end, interval)
+
+    def history_many(self, tickers, start, end, interval='1d'):
+        return {t: SyntheticSource.history(self, t, start, end, interval) for t in tickers if t != self.dropped}
+
+
+def test_ticker_left_out_of_bulk_answer_is_fetched_alone():
+    source = DroppingBulkSource('MSFT', failures=1)
+    frames, failed = fetch_bars(source, ['AAPL', 'MSFT', 'NVDA'], '2023-01-01', '2024-01-01', backoff=0)
+    assert not failed
+    assert sorted(frames) == ['AAPL', 'MSFT', 'NVDA']
+    assert not frames['MSFT'].empty
+    assert source.single_calls == 2
+
+
+def test_failed_bulk_ticker_is_not_cached_as_empty(tmp_path):
+    source = DroppingBulkSource('MSFT', failures=100)
+    cache = OHLCVCache(source, str(tmp_path))
+    frames = cache.history_many(['AAPL', 'MSFT'], '2023-01-01', '2024-01-01', retries=0)
+    assert sorted(frames) == ['AAPL']
+    # The failure is requested again on the next call, and cached once it succeeds
+    source.failures = 0
+    frames = cache.history_many(['AAPL', 'MSFT'], '2023-01-01', '2024-01-01', retries=0)
+    assert sorted(frames) == ['AAPL', 'MSFT']
+    assert len(frames['MSFT']) == len(frames['AAPL'])
@@ -0,0 +1,51 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from market_dashboard import api, pipeline
+from market_dashboard.data_sources import SyntheticSource
+from market_dashboard.fx import FXRates, MissingRatesError
+from market_dashboard.indicators import IndicatorEngine
+from market_dashboard.ohlcv_cache import OHLCVCache
+
+
+class NoFXSource(SyntheticSource):
+    """Synthetic bars for everything but FX pairs, which have none."""
+
+    name = 'no_fx'
+
+    def history(self, ticker, start, end, interval='1d'):
+        if ticker.endswith('=X'):
+            return pd.DataFrame()
+        return super().history(ticker, start, end, interval)
+
+
+def test_convert_currency_raises_without_rates(tmp_path):
+    cache = OHLCVCache(NoFXSource(), str(tmp_path / 'bars'), IndicatorEngine())
+    fx_rates = FXRates(OHLCVCache(NoFXSource(), str(tmp_path / 'fx')))
+    with pytest.raises(MissingRatesError):
+        pipeline.convert_currency(cache, fx_rates, 'AAPL', '2023-01-01', '2024-01-01', 'INR')
+
+
+def test_convert_currency_converts_with_rates(tmp_path):
+    cache = OHLCVCache(SyntheticSource(), str(tmp_path / 'bars'), IndicatorEngine())
+    fx_rates = FXRates(OHLCVCache(SyntheticSource(), str(tmp_path / 'fx')))
+    usd = cache.history('AAPL', '2023-01-01', '2024-01-01')
+    inr = pipeline.convert_currency(cache, fx_rates, 'AAPL', '2023-01-01', '2024-01-01', 'INR')
+    assert len(inr) == len(usd)
+    assert (inr['Close'] != usd['Close']).all()
+
+
+def test_api_answers_an_error_without_rates(tmp_path, monkeypatch):
+    monkeypatch.setattr('market_dashboard.ohlcv_cache.DEFAULT_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr('market_dashboard.intraday.DEFAULT_CACHE_DIR', str(tmp_path))
+
+    async def request():
+        async with TestClient(TestServer(api.make_app(api.Api(NoFXSource())))) as client:
+            converted = await client.get('/v1/stats/AAPL?frame=1y&currency=INR')
+            usd = await client.get('/v1/stats/AAPL?frame=1y')
+            return converted.status, usd.status
+
+    assert asyncio.run(request()) == (502, 200)
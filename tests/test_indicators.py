@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_dashboard.data_sources import SyntheticSource
+from market_dashboard.indicators import IndicatorEngine
+from market_dashboard.ohlcv_cache import OHLCVCache
+
+
+def expected_indicators(close, engine):
+    # The pandas definitions the streamed columns must match (see IndicatorEngine)
+    close = close.reset_index(drop=True)
+    out = {f'MA{w}': close.rolling(w).mean() for w in engine.ma_windows}
+    out.update({f'EMA{s}': close.ewm(span=s, adjust=False).mean() for s in engine.ema_spans})
+    delta = close.diff()
+    p = engine.rsi_period
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / p, adjust=False, min_periods=p).mean()
+    avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / p, adjust=False, min_periods=p).mean()
+    out[f'RSI{p}'] = (100.0 - 100.0 / (1.0 + avg_gain / avg_loss)).where(avg_loss != 0, 100.0).where(avg_gain.notna())
+    mid = close.rolling(engine.bb_window).mean()
+    std = close.rolling(engine.bb_window).std()
+    out.update({'BB_MID': mid, 'BB_UPPER': mid + engine.bb_k * std, 'BB_LOWER': mid - engine.bb_k * std})
+    return out
+
+
+@pytest.mark.parametrize('ticker', ['AAPL', 'BTC-USD'])
+def test_streamed_top_ups_match_pandas(tmp_path, ticker):
+    cache = OHLCVCache(SyntheticSource(), str(tmp_path), IndicatorEngine())
+    start = '2021-01-01'
+    # A first fill, then daily top-ups and a few multi-week jumps, as a session over time would
+    ends = list(pd.date_range('2022-01-03', periods=30).strftime('%Y-%m-%d')) + ['2022-03-01', '2022-06-15']
+    for end in ends:
+        cache.history(ticker, start, end)
+    # A fresh cache over the same directory resumes from the checkpoint saved on disk
+    cache = OHLCVCache(SyntheticSource(), str(tmp_path), IndicatorEngine())
+    cache.history(ticker, start, '2022-07-01')
+    df, meta = cache.entry(ticker, start, '2022-07-01')
+
+    assert meta['indicators'] is not None
+    for column, values in expected_indicators(df['Close'], cache.indicators).items():
+        np.testing.assert_allclose(df[column].to_numpy(), values.to_numpy(), rtol=1e-9, atol=1e-9,
+                                   err_msg=column)
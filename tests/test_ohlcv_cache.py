@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from market_dashboard.data_sources import SyntheticSource
+from market_dashboard.indicators import IndicatorEngine
+from market_dashboard.ohlcv_cache import OHLCVCache
+
+
+class FlakySource(SyntheticSource):
+    """Synthetic bars, except that the first ``empty_calls`` requests come back empty,
+    as yfinance answers many errors."""
+
+    name = 'flaky'
+
+    def __init__(self, empty_calls=1):
+        super().__init__()
+        self.empty_calls = empty_calls
+        self.calls = []
+
+    def history(self, ticker, start, end, interval='1d'):
+        self.calls.append((ticker, start, end))
+        if len(self.calls) <= self.empty_calls:
+            return pd.DataFrame()
+        return super().history(ticker, start, end, interval)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_empty_answer_is_retried_not_cached(tmp_path):
+    source, clock = FlakySource(), Clock()
+    cache = OHLCVCache(source, str(tmp_path), empty_retry_after=pd.Timedelta(minutes=15), clock=clock)
+    assert cache.history('AAPL', '2015-01-01', '2024-01-01').empty
+    assert cache.entry('AAPL', '2015-01-01', '2024-01-01')[1] is None
+
+    # Inside the retry window the range is not requested again
+    assert cache.history('AAPL', '2015-01-01', '2024-01-01').empty
+    assert len(source.calls) == 1
+
+    # A later end is a different range: the whole of it is fetched, not just the tail
+    df = cache.history('AAPL', '2015-01-01', '2024-02-01')
+    assert source.calls[-1][1:] == ('2015-01-01', '2024-02-01')
+    assert df.index[0] < pd.Timestamp('2015-01-10', tz=df.index.tz)
+
+    # Once the window has passed, the original range is fetched again
+    cache.clear()
+    source.empty_calls = len(source.calls) + 1
+    assert cache.history('AAPL', '2015-01-01', '2024-01-01').empty
+    clock.now += 16 * 60
+    assert len(cache.history('AAPL', '2015-01-01', '2024-01-01')) > 2000
+
+
+def test_empty_head_does_not_extend_the_entry(tmp_path):
+    source = FlakySource(empty_calls=0)
+    cache = OHLCVCache(source, str(tmp_path))
+    cache.history('AAPL', '2020-01-01', '2021-01-01')
+    source.empty_calls = len(source.calls) + 1
+    cache.history('AAPL', '2015-01-01', '2021-01-01')
+    _, meta = cache.entry('AAPL', '2020-01-01', '2021-01-01')
+    assert meta['start'] == '2020-01-01'
+
+
+class SplittingSource(SyntheticSource):
+    """Synthetic bars with a 2-for-1 split on ``split_on`` once it is set, back-adjusted
+    the way Yahoo serves auto-adjusted prices."""
+
+    name = 'splitting'
+    split_on = None
+
+    def history(self, ticker, start, end, interval='1d'):
+        df = super().history(ticker, start, end, interval)
+        if self.split_on is None:
+            return df
+        split = pd.Timestamp(self.split_on, tz=df.index.tz)
+        df = df.copy()
+        before = df.index < split
+        df.loc[before, ['Open', 'High', 'Low', 'Close']] /= 2
+        df.loc[df.index == split, 'Stock Splits'] = 2.0
+        return df
+
+
+def test_split_in_top_up_refetches_the_whole_entry(tmp_path):
+    source = SplittingSource()
+    cache = OHLCVCache(source, str(tmp_path), IndicatorEngine())
+    cache.history('AAPL', '2022-01-01', '2023-06-01')
+    source.split_on = '2023-06-15'
+    cache.history('AAPL', '2022-01-01', '2023-07-01')
+    df, meta = cache.entry('AAPL', '2022-01-01', '2023-07-01')
+
+    expected = source.history('AAPL', meta['start'], meta['end'])
+    np.testing.assert_allclose(df['Close'].to_numpy(), expected['Close'].to_numpy())
+    np.testing.assert_allclose(df['MA50'].to_numpy(), expected['Close'].rolling(50).mean().to_numpy())
+
+
+def test_clear_leaves_the_intraday_store_alone(tmp_path, monkeypatch):
+    from market_dashboard.intraday import IntradayStore
+
+    monkeypatch.setattr('market_dashboard.ohlcv_cache.DEFAULT_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr('market_dashboard.intraday.DEFAULT_CACHE_DIR', str(tmp_path))
+    source = SyntheticSource()
+    cache, intraday = OHLCVCache(source), IntradayStore(source)
+    assert not intraday.root.startswith(cache.root + os.sep)
+    cache.history('AAPL', '2024-01-01', '2024-02-01')
+    start = (pd.Timestamp.today() - pd.Timedelta(days=5)).strftime('%Y-%m-%d')
+    intraday.history('AAPL', start, pd.Timestamp.today().strftime('%Y-%m-%d'), '5m')
+    # Something else kept under the cache root, as the intraday store's directory once was
+    os.makedirs(os.path.join(cache.root, 'intraday', 'AAPL'))
+
+    cache.clear()
+    assert os.listdir(cache.root) == ['intraday']
+    assert os.listdir(intraday.root)